@@ -0,0 +1,51 @@
+import gc
+import sys
+import tracemalloc
+
+from monkey.environment import Environment
+from monkey.evaluator import monkey_eval
+from monkey.lexer import Lexer
+from monkey.parser import Parser
+
+PROGRAM = """
+let build = fn(n, acc) {
+    if (n == 0) { acc } else { build(n - 1, push(acc, "item")) }
+};
+let work = fn(n) {
+    let data = build(n, []);
+    let size = len(data);
+    fn() { size };
+};
+let collect = fn(i, acc) {
+    if (i == 0) { acc } else { collect(i - 1, push(acc, work(%(size)d))) }
+};
+let callbacks = collect(%(count)d, []);
+"""
+
+
+def retained_bytes(count: int, size: int) -> int:
+    program = Parser(Lexer(PROGRAM % {"count": count, "size": size})).parse_program()
+    env = Environment()
+    gc.collect()
+    tracemalloc.start()
+    monkey_eval(program, env)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained
+
+
+def main() -> None:
+    sys.setrecursionlimit(100_000)
+    count = 100
+    retained_bytes(count, 10)
+    for size in (10, 100, 200):
+        retained = retained_bytes(count, size)
+        print(
+            f"{count} closures over {size:>3}-element scopes: "
+            f"{retained / 1024:8.1f} KiB retained, {retained // count:6d} B/closure"
+        )
+
+
+if __name__ == "__main__":
+    main()
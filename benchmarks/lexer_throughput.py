@@ -0,0 +1,94 @@
+import gc
+import time
+import tracemalloc
+from typing import Callable, Union
+
+from monkey.lexer import CharLexer, Lexer, TokenStream, tokenize
+from monkey.parser import Parser
+from monkey.token import TokenType
+
+Scanner = Callable[[str], Union[CharLexer, Lexer, TokenStream]]
+Frontend = Callable[[str], Union[Lexer, TokenStream]]
+
+CHUNK = """
+let fib_%(i)d = fn(n) {
+    if (n < 2) { return n; } else { fib_%(i)d(n - 1) + fib_%(i)d(n - 2) }
+};
+let data = {"name": "item", "values": [1, 2, 3, 40000], "ok": !false};
+puts(len(data["values"]) * 10 / 2 != 15 == true);
+"""
+
+
+def generate(size: int) -> str:
+    chunks = []
+    total = 0
+    i = 0
+    while total < size:
+        chunk = CHUNK.replace("%(i)d", "x" * (i % 7 + 1))
+        chunks.append(chunk)
+        total += len(chunk)
+        i += 1
+    return "".join(chunks)
+
+
+def count_tokens(scanner: Scanner, source: str) -> int:
+    lexer = scanner(source)
+    count = 0
+    while lexer.next_token().type is not TokenType.EOF:
+        count += 1
+    return count
+
+
+def tokens_per_second(scanner: Scanner, source: str) -> float:
+    start = time.perf_counter()
+    count = count_tokens(scanner, source)
+    return count / (time.perf_counter() - start)
+
+
+def parse_seconds(frontend: Frontend, source: str) -> float:
+    start = time.perf_counter()
+    Parser(frontend(source)).parse_program()
+    return time.perf_counter() - start
+
+
+def peak_bytes(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main() -> None:
+    source = generate(5_000_000)
+    count = count_tokens(Lexer, source)
+    assert count_tokens(CharLexer, source) == count_tokens(tokenize, source) == count
+    print(f"source: {len(source) / 1e6:.1f} MB, {count} tokens")
+    for name, scanner in (
+        ("CharLexer", CharLexer),
+        ("Lexer", Lexer),
+        ("tokenize", tokenize),
+    ):
+        rate = tokens_per_second(scanner, source)
+        print(f"{name:>9}: {rate / 1e6:6.2f}M tokens/s")
+
+    # Scripts are parsed from a Lexer; a TokenStream costs more per token
+    # and is only worth it where token offsets are needed.
+    sample = generate(500_000)
+    frontends: tuple[tuple[str, Frontend], ...] = (
+        ("Lexer", Lexer),
+        ("tokenize", tokenize),
+    )
+    for name, frontend in frontends:
+        print(f"{name:>9}: {parse_seconds(frontend, sample):6.3f}s to parse 0.5 MB")
+
+    tuples = peak_bytes(lambda: list(Lexer(source)))
+    stream = peak_bytes(lambda: tokenize(source))
+    print(f"Token list:  {tuples / count:6.1f} peak bytes/token")
+    print(f"TokenStream: {stream / count:6.1f} peak bytes/token")
+
+
+if __name__ == "__main__":
+    main()
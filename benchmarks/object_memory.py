@@ -0,0 +1,86 @@
+import gc
+import sys
+import tracemalloc
+from typing import Callable
+
+from monkey import ast
+from monkey.environment import Environment
+from monkey.evaluator import monkey_eval
+from monkey.lexer import Lexer
+from monkey.mobj import Array, Error, HashPair, Integer, String
+from monkey.parser import Parser
+
+FUNCTION = """
+let f = fn(a, b) {
+    let c = [a, b, "item", {"key": a * 2}];
+    if (a < b) { return c[0] + %(i)d; } else { len(c) - b }
+};
+"""
+
+PROGRAM_FUNCTIONS = 5_000
+ARRAY_SIZE = 1_000_000
+
+
+def peak_bytes(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def object_sizes() -> dict[str, int]:
+    program = Parser(Lexer("let f = fn(a) { a + 1 }; f(2);")).parse_program()
+    let, call = program.statements
+    assert isinstance(let, ast.LetStatement)
+    assert isinstance(call, ast.ExpressionStatement)
+    function = let.value
+    assert isinstance(function, ast.FunctionLiteral)
+    body = function.body.statements[0]
+    assert isinstance(body, ast.ExpressionStatement)
+    infix = body.expression
+    assert isinstance(infix, ast.InfixExpression)
+    env = Environment()
+    monkey_eval(program, env)
+
+    objects: dict[str, object] = {
+        "Integer": Integer(1000),
+        "String": String("monkey"),
+        "Array": Array([]),
+        "HashPair": HashPair(Integer(1000), Integer(1000)),
+        "Error": Error("message"),
+        "Function": env.get("f"),
+        "ast.LetStatement": let,
+        "ast.Identifier": let.name,
+        "ast.FunctionLiteral": function,
+        "ast.CallExpression": call.expression,
+        "ast.InfixExpression": infix,
+        "ast.IntegerLiteral": infix.right,
+    }
+    sizes = {}
+    for name, obj in objects.items():
+        size = sys.getsizeof(obj)
+        if hasattr(obj, "__dict__"):
+            size += sys.getsizeof(obj.__dict__)
+        sizes[name] = size
+    return sizes
+
+
+def main() -> None:
+    for name, size in object_sizes().items():
+        print(f"{name:<22} {size:5d} B")
+
+    source = "".join(FUNCTION % {"i": i} for i in range(PROGRAM_FUNCTIONS))
+    parse = peak_bytes(lambda: Parser(Lexer(source)).parse_program())
+    print(
+        f"parse {len(source) / 1024:.0f} KiB program:" f" {parse / 2**20:8.1f} MiB peak"
+    )
+
+    array = peak_bytes(lambda: Array([Integer(i) for i in range(ARRAY_SIZE)]))
+    print(f"build {ARRAY_SIZE}-element array: {array / 2**20:8.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
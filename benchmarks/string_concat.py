@@ -0,0 +1,38 @@
+import time
+
+from monkey.environment import Environment
+from monkey.evaluator import monkey_eval
+from monkey.lexer import Lexer
+from monkey.mobj import String
+from monkey.parser import Parser
+
+PROGRAM = """
+let build = fn(n, acc) {
+    if (n == 0) { acc } else { build(n - 1, acc + "0123456789") }
+};
+build(%(pieces)d, "");
+"""
+
+PIECE_SIZE = 10
+
+
+def build_seconds(size: int) -> float:
+    program = Parser(Lexer(PROGRAM % {"pieces": size // PIECE_SIZE})).parse_program()
+    start = time.perf_counter()
+    result = monkey_eval(program, Environment())
+    assert isinstance(result, String) and len(result.value) == size
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    build_seconds(10_000)
+    for size in (125_000, 250_000, 500_000, 1_000_000):
+        seconds = build_seconds(size)
+        print(
+            f"{size / 1000:6.0f} KB string from {PIECE_SIZE}-character pieces:"
+            f" {seconds:6.3f}s, {seconds / size * 1e9:6.1f} ns/char"
+        )
+
+
+if __name__ == "__main__":
+    main()
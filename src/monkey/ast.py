@@ -1,9 +1,13 @@
-from typing import Optional
+from typing import Any, Callable, Optional
 
+from monkey.mobj import Integer, String, integer, intern_string
+from monkey.symbol_table import Symbol, SymbolScope
 from monkey.token import Token
 
 
 class Node:
+    __slots__ = ("token",)
+
     def __init__(self, token: Token):
         self.token = token
 
@@ -12,14 +16,16 @@ class Node:
 
 
 class Statement(Node):
-    pass
+    __slots__ = ()
 
 
 class Expression(Node):
-    pass
+    __slots__ = ()
 
 
 class Program(Node):
+    __slots__ = ("statements",)
+
     def __init__(self, statements: list[Statement]):
         self.statements = statements
 
@@ -28,24 +34,37 @@ class Program(Node):
 
 
 class Identifier(Expression):
+    __slots__ = ("value", "scope", "index", "cache", "fallback")
+
     def __init__(self, token: Token, value: str):
         super().__init__(token)
         self.value: str = value
+        self.scope: SymbolScope = SymbolScope.GLOBAL
+        self.index: int = 0
+        self.cache: Optional[tuple[int, Any]] = None
+        self.fallback: Optional[Identifier] = None
 
 
 class Boolean(Expression):
+    __slots__ = ("value",)
+
     def __init__(self, token: Token, value: bool):
         super().__init__(token)
         self.value: bool = value
 
 
 class IntegerLiteral(Expression):
+    __slots__ = ("value", "obj")
+
     def __init__(self, token: Token, value: int):
         super().__init__(token)
         self.value: int = value
+        self.obj: Integer = integer(value)
 
 
 class PrefixExpression(Expression):
+    __slots__ = ("operator", "right")
+
     def __init__(self, token: Token, operator: str, right: Expression):
         super().__init__(token)
         self.operator: str = operator
@@ -56,6 +75,8 @@ class PrefixExpression(Expression):
 
 
 class InfixExpression(Expression):
+    __slots__ = ("left", "operator", "right", "feedback", "polymorphic")
+
     def __init__(
         self, token: Token, left: Expression, operator: str, right: Expression
     ):
@@ -63,12 +84,16 @@ class InfixExpression(Expression):
         self.left: Expression = left
         self.operator: str = operator
         self.right: Expression = right
+        self.feedback: Optional[tuple[type, type, Callable[[Any, Any], Any]]] = None
+        self.polymorphic: bool = False
 
     def __str__(self) -> str:
         return f"({self.left} {self.operator} {self.right})"
 
 
 class IfExpression(Expression):
+    __slots__ = ("condition", "consequence", "alternative")
+
     def __init__(
         self,
         token: Token,
@@ -89,34 +114,48 @@ class IfExpression(Expression):
 
 
 class FunctionLiteral(Expression):
+    __slots__ = ("parameters", "body", "num_locals", "cells", "free", "compiled")
+
     def __init__(
         self, token: Token, parameters: list[Identifier], body: "BlockStatement"
     ):
         super().__init__(token)
         self.parameters: list[Identifier] = parameters
         self.body: "BlockStatement" = body
+        self.num_locals: int = len(parameters)
+        self.cells: list[int] = []
+        self.free: list[Symbol] = []
+        self.compiled: Optional[Callable[[Any], Any]] = None
 
     def __str__(self) -> str:
         return f"{self.token.literal}({', '.join(str(param) for param in self.parameters)}){self.body}"
 
 
 class CallExpression(Expression):
+    __slots__ = ("function", "arguments", "tail")
+
     def __init__(self, token: Token, function: Expression, arguments: list[Expression]):
         super().__init__(token)
         self.function: Expression = function
         self.arguments: list[Expression] = arguments
+        self.tail: bool = False
 
     def __str__(self) -> str:
         return f"{self.function}({', '.join(str(arg) for arg in self.arguments)})"
 
 
 class StringLiteral(Expression):
+    __slots__ = ("value", "obj")
+
     def __init__(self, token: Token, value: str):
         super().__init__(token)
         self.value = value
+        self.obj: String = intern_string(value)
 
 
 class ArrayLiteral(Expression):
+    __slots__ = ("elements",)
+
     def __init__(self, token: Token, elements: list[Expression]):
         super().__init__(token)
         self.elements: list[Expression] = elements
@@ -126,6 +165,8 @@ class ArrayLiteral(Expression):
 
 
 class IndexExpression(Expression):
+    __slots__ = ("left", "index")
+
     def __init__(self, token: Token, left: Expression, index: Expression):
         super().__init__(token)
         self.left: Expression = left
@@ -136,9 +177,14 @@ class IndexExpression(Expression):
 
 
 class HashLiteral(Expression):
+    __slots__ = ("pairs",)
+
     def __init__(self, token: Token, pairs: dict[Expression, Expression]):
         super().__init__(token)
         self.pairs: dict[Expression, Expression] = pairs
+        for key in pairs:
+            if isinstance(key, (IntegerLiteral, StringLiteral)):
+                key.obj.hash_key()
 
     def __str__(self) -> str:
         pairs = []
@@ -149,6 +195,8 @@ class HashLiteral(Expression):
 
 
 class LetStatement(Statement):
+    __slots__ = ("name", "value")
+
     def __init__(self, token: Token, name: Identifier, value: Expression):
         super().__init__(token)
         self.name: Identifier = name
@@ -159,6 +207,8 @@ class LetStatement(Statement):
 
 
 class ReturnStatement(Statement):
+    __slots__ = ("value",)
+
     def __init__(self, token: Token, value: Expression):
         super().__init__(token)
         self.value: Expression = value
@@ -171,6 +221,8 @@ class ReturnStatement(Statement):
 
 
 class ExpressionStatement(Statement):
+    __slots__ = ("expression",)
+
     def __init__(self, token: Token, expression: Expression):
         super().__init__(token)
         self.expression: Expression = expression
@@ -180,6 +232,8 @@ class ExpressionStatement(Statement):
 
 
 class BlockStatement(Statement):
+    __slots__ = ("statements",)
+
     def __init__(self, token: Token, statements: list[Statement]):
         super().__init__(token)
         self.statements: list[Statement] = statements
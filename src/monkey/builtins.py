@@ -1,14 +1,14 @@
-from monkey.mobj import (NULL, Array, Builtin, Error, Integer, MonkeyObject,
-                         String)
+from monkey.mobj import (NULL, Array, Builtin, Error, Hash, Hashable, HashPair,
+                         Integer, MonkeyObject, String, integer, substring)
 
 
 def _len(*args: MonkeyObject) -> MonkeyObject:
     if len(args) != 1:
         return Error(f"wrong number of arguments. got={len(args)}, want=1")
     if isinstance(args[0], Array):
-        return Integer(len(args[0].elements))
+        return integer(len(args[0].elements))
     if isinstance(args[0], String):
-        return Integer(len(args[0].value))
+        return integer(args[0].length)
     return Error(f"argument to `len` not supported, got {args[0].monkey_type}")
 
 
@@ -38,7 +38,7 @@ def _rest(*args: MonkeyObject) -> MonkeyObject:
     if not isinstance(args[0], Array):
         return Error(f"argument to `rest` must be ARRAY, got {args[0].monkey_type}")
     if len(args[0].elements) > 0:
-        return Array(args[0].elements[1:])
+        return Array(args[0].elements.rest())
     return NULL
 
 
@@ -47,9 +47,7 @@ def _push(*args: MonkeyObject) -> MonkeyObject:
         return Error(f"wrong number of arguments. got={len(args)}, want=2")
     if not isinstance(args[0], Array):
         return Error(f"argument to `push` must be ARRAY, got {args[0].monkey_type}")
-    new_elements = args[0].elements.copy()
-    new_elements.append(args[1])
-    return Array(new_elements)
+    return Array(args[0].elements.append(args[1]))
 
 
 def _puts(*args: MonkeyObject) -> MonkeyObject:
@@ -58,6 +56,163 @@ def _puts(*args: MonkeyObject) -> MonkeyObject:
     return NULL
 
 
+def _set(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 3:
+        return Error(f"wrong number of arguments. got={len(args)}, want=3")
+    hash, key, value = args
+    if not isinstance(hash, Hash):
+        return Error(f"argument to `set` must be HASH, got {hash.monkey_type}")
+    if not isinstance(key, Hashable):
+        return Error(f"unusable as hash key: {key.monkey_type}")
+    return Hash(hash.pairs.set(key.hash_key(), HashPair(key, value)))
+
+
+def _delete(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+    hash, key = args
+    if not isinstance(hash, Hash):
+        return Error(f"argument to `delete` must be HASH, got {hash.monkey_type}")
+    if not isinstance(key, Hashable):
+        return Error(f"unusable as hash key: {key.monkey_type}")
+    pairs = hash.pairs.delete(key.hash_key())
+    return hash if pairs is hash.pairs else Hash(pairs)
+
+
+def _keys(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+    if not isinstance(args[0], Hash):
+        return Error(f"argument to `keys` must be HASH, got {args[0].monkey_type}")
+    return Array([pair.key for pair in args[0].pairs.values()])
+
+
+def _values(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+    if not isinstance(args[0], Hash):
+        return Error(f"argument to `values` must be HASH, got {args[0].monkey_type}")
+    return Array([pair.value for pair in args[0].pairs.values()])
+
+
+def _merge(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+    left, right = args
+    if not isinstance(left, Hash):
+        return Error(f"argument to `merge` must be HASH, got {left.monkey_type}")
+    if not isinstance(right, Hash):
+        return Error(f"argument to `merge` must be HASH, got {right.monkey_type}")
+    if len(left.pairs) < len(right.pairs):
+        pairs = right.pairs
+        for key, pair in left.pairs.items():
+            if key not in pairs:
+                pairs = pairs.set(key, pair)
+    else:
+        pairs = left.pairs
+        for key, pair in right.pairs.items():
+            pairs = pairs.set(key, pair)
+    return Hash(pairs)
+
+
+def _split(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+    string, separator = args
+    if not isinstance(string, String):
+        return Error(f"argument to `split` must be STRING, got {string.monkey_type}")
+    if not isinstance(separator, String):
+        return Error(f"argument to `split` must be STRING, got {separator.monkey_type}")
+
+    if separator.length == 0:
+        return Array([substring(string, i, i + 1) for i in range(string.length)])
+    buffer, offset = string.buffer()
+    end = offset + string.length
+    sep = separator.value
+    parts: list[MonkeyObject] = []
+    start = offset
+    while (found := buffer.find(sep, start, end)) != -1:
+        parts.append(substring(string, start - offset, found - offset))
+        start = found + len(sep)
+    parts.append(substring(string, start - offset, string.length))
+    return Array(parts)
+
+
+def _join(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+    array, separator = args
+    if not isinstance(array, Array):
+        return Error(f"argument to `join` must be ARRAY, got {array.monkey_type}")
+    if not isinstance(separator, String):
+        return Error(f"argument to `join` must be STRING, got {separator.monkey_type}")
+    parts = []
+    for element in array.elements:
+        if not isinstance(element, String):
+            return Error(
+                f"elements of `join` must be STRING, got {element.monkey_type}"
+            )
+        parts.append(element.value)
+    return String(separator.value.join(parts))
+
+
+def _substr(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) not in (2, 3):
+        return Error(f"wrong number of arguments. got={len(args)}, want=2 or 3")
+    string, start, *rest = args
+    if not isinstance(string, String):
+        return Error(f"argument to `substr` must be STRING, got {string.monkey_type}")
+    for arg in (start, *rest):
+        if not isinstance(arg, Integer):
+            return Error(f"argument to `substr` must be INTEGER, got {arg.monkey_type}")
+    begin = min(max(start.value, 0), string.length)
+    end = string.length
+    if rest:
+        end = min(begin + max(rest[0].value, 0), end)
+    return substring(string, begin, end)
+
+
+def _index_of(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+    string, needle = args
+    if not isinstance(string, String):
+        return Error(f"argument to `index_of` must be STRING, got {string.monkey_type}")
+    if not isinstance(needle, String):
+        return Error(f"argument to `index_of` must be STRING, got {needle.monkey_type}")
+    buffer, offset = string.buffer()
+    found = buffer.find(needle.value, offset, offset + string.length)
+    return integer(found - offset if found != -1 else -1)
+
+
+def _replace(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) != 3:
+        return Error(f"wrong number of arguments. got={len(args)}, want=3")
+    for arg in args:
+        if not isinstance(arg, String):
+            return Error(f"argument to `replace` must be STRING, got {arg.monkey_type}")
+    string, old, new = args
+    return String(string.value.replace(old.value, new.value))
+
+
+def _format(*args: MonkeyObject) -> MonkeyObject:
+    if len(args) < 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want>=1")
+    template, *values = args
+    if not isinstance(template, String):
+        return Error(f"argument to `format` must be STRING, got {template.monkey_type}")
+    pieces = template.value.split("{}")
+    if len(pieces) - 1 != len(values):
+        return Error(
+            f"wrong number of arguments to `format`. got={len(values)}, want={len(pieces) - 1}"
+        )
+    parts = [pieces[0]]
+    for value, piece in zip(values, pieces[1:]):
+        parts.append(str(value))
+        parts.append(piece)
+    return String("".join(parts))
+
+
 BUILTINS: dict[str, Builtin] = {
     "len": Builtin(_len),
     "first": Builtin(_first),
@@ -65,4 +220,15 @@ BUILTINS: dict[str, Builtin] = {
     "rest": Builtin(_rest),
     "push": Builtin(_push),
     "puts": Builtin(_puts),
+    "set": Builtin(_set),
+    "delete": Builtin(_delete),
+    "keys": Builtin(_keys),
+    "values": Builtin(_values),
+    "merge": Builtin(_merge),
+    "split": Builtin(_split),
+    "join": Builtin(_join),
+    "substr": Builtin(_substr),
+    "index_of": Builtin(_index_of),
+    "replace": Builtin(_replace),
+    "format": Builtin(_format),
 }
@@ -1,9 +1,49 @@
+import argparse
 import getpass
+import sys
+from typing import Optional
 
 from monkey import repl
+from monkey.environment import Environment
+from monkey.evaluator import monkey_eval
+from monkey.lexer import Lexer
+from monkey.mobj import Error
+from monkey.optimizer import optimize
+from monkey.parser import Parser
 
 
-def cli() -> None:
+def run_file(path: str, optimized: bool = True) -> int:
+    with open(path) as f:
+        source = f.read()
+
+    try:
+        program = Parser(Lexer(source)).parse_program()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if optimized:
+        program = optimize(program)
+    evaluated = monkey_eval(program, Environment())
+    if isinstance(evaluated, Error):
+        print(evaluated, file=sys.stderr)
+        return 1
+    return 0
+
+
+def cli(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="monkey")
+    parser.add_argument("script", nargs="?", help="run a Monkey source file")
+    parser.add_argument(
+        "--no-optimize",
+        action="store_true",
+        help="skip constant folding and dead code removal",
+    )
+    args = parser.parse_args(argv)
+
+    if args.script is not None:
+        sys.exit(run_file(args.script, optimized=not args.no_optimize))
+
     user = getpass.getuser()
     print(f"Hello {user}! This is the Monkey programming language!")
     print(f"Feel free to type in commands")
@@ -0,0 +1,425 @@
+from typing import Callable
+
+from monkey import ast
+from monkey.environment import Environment
+from monkey.evaluator import (INTEGER_ARITHMETIC, INTEGER_COMPARISONS,
+                              eval_bang_operator_expression,
+                              eval_index_expression, eval_infix_expression,
+                              eval_minus_prefix_operator_expression,
+                              extend_function_env, lookup_global,
+                              make_function)
+from monkey.mobj import (FALSE, NULL, TRUE, Array, Builtin, Error, Function,
+                         Hash, Hashable, HashKey, HashPair, Integer,
+                         MonkeyObject, ReturnValue, TailCall, integer)
+from monkey.resolver import resolve
+from monkey.symbol_table import SymbolScope
+
+Compiled = Callable[[Environment], MonkeyObject]
+
+
+def closure_eval(node: ast.Node, env: Environment) -> MonkeyObject:
+    return compile_node(node)(env)
+
+
+def compile_node(node: ast.Node) -> Compiled:
+    if isinstance(node, ast.Program):
+        return _compile_program(node)
+    elif isinstance(node, ast.ExpressionStatement):
+        return compile_node(node.expression)
+    elif isinstance(node, ast.BlockStatement):
+        return _compile_block_statement(node)
+    elif isinstance(node, ast.LetStatement):
+        return _compile_let_statement(node)
+    elif isinstance(node, ast.ReturnStatement):
+        return _compile_return_statement(node)
+    elif isinstance(node, ast.IfExpression):
+        return _compile_if_expression(node)
+    elif isinstance(node, ast.Identifier):
+        return _compile_identifier(node)
+    elif isinstance(node, ast.IntegerLiteral):
+        return _constant(node.obj)
+    elif isinstance(node, ast.StringLiteral):
+        return _constant(node.obj)
+    elif isinstance(node, ast.Boolean):
+        return _constant(TRUE if node.value else FALSE)
+    elif isinstance(node, ast.ArrayLiteral):
+        return _compile_array_literal(node)
+    elif isinstance(node, ast.HashLiteral):
+        return _compile_hash_literal(node)
+    elif isinstance(node, ast.IndexExpression):
+        return _compile_index_expression(node)
+    elif isinstance(node, ast.PrefixExpression):
+        return _compile_prefix_expression(node)
+    elif isinstance(node, ast.InfixExpression):
+        return _compile_infix_expression(node)
+    elif isinstance(node, ast.FunctionLiteral):
+        return _compile_function_literal(node)
+    elif isinstance(node, ast.CallExpression):
+        return _compile_call_expression(node)
+    return _constant(NULL)
+
+
+def _constant(obj: MonkeyObject) -> Compiled:
+    def constant(env: Environment) -> MonkeyObject:
+        return obj
+
+    return constant
+
+
+def _compile_program(program: ast.Program) -> Compiled:
+    resolve(program)
+    statements = [compile_node(stmt) for stmt in program.statements]
+
+    def run_program(env: Environment) -> MonkeyObject:
+        result: MonkeyObject = NULL
+        for stmt in statements:
+            result = stmt(env)
+            if type(result) is ReturnValue:
+                return result.value
+            if type(result) is Error:
+                return result
+        return result
+
+    return run_program
+
+
+def _compile_block_statement(block: ast.BlockStatement) -> Compiled:
+    statements = [compile_node(stmt) for stmt in block.statements]
+    if len(statements) == 1:
+        return statements[0]
+
+    def run_block(env: Environment) -> MonkeyObject:
+        result: MonkeyObject = NULL
+        for stmt in statements:
+            result = stmt(env)
+            if type(result) is ReturnValue or type(result) is Error:
+                return result
+        return result
+
+    return run_block
+
+
+def _compile_let_statement(node: ast.LetStatement) -> Compiled:
+    name = node.name.value
+    index = node.name.index
+    value_fn = compile_node(node.value)
+
+    if node.name.scope is SymbolScope.LOCAL:
+
+        def local_let(env: Environment) -> MonkeyObject:
+            value = value_fn(env)
+            if type(value) is Error:
+                return value
+            env.slots[index] = value
+            return value
+
+        return local_let
+
+    if node.name.scope is SymbolScope.CELL:
+
+        def cell_let(env: Environment) -> MonkeyObject:
+            value = value_fn(env)
+            if type(value) is Error:
+                return value
+            env.slots[index].value = value
+            return value
+
+        return cell_let
+
+    def let(env: Environment) -> MonkeyObject:
+        value = value_fn(env)
+        if type(value) is Error:
+            return value
+        env.put(name, value)
+        return value
+
+    return let
+
+
+def _compile_return_statement(node: ast.ReturnStatement) -> Compiled:
+    value_fn = compile_node(node.value)
+
+    def return_(env: Environment) -> MonkeyObject:
+        value = value_fn(env)
+        if type(value) is Error:
+            return value
+        return ReturnValue(value)
+
+    return return_
+
+
+def _compile_if_expression(node: ast.IfExpression) -> Compiled:
+    condition_fn = compile_node(node.condition)
+    consequence = compile_node(node.consequence)
+    alternative = (
+        _constant(NULL) if node.alternative is None else compile_node(node.alternative)
+    )
+
+    def if_(env: Environment) -> MonkeyObject:
+        condition = condition_fn(env)
+        if condition is TRUE:
+            return consequence(env)
+        if condition is FALSE or condition is NULL:
+            return alternative(env)
+        if type(condition) is Error:
+            return condition
+        return consequence(env)
+
+    return if_
+
+
+def _compile_identifier(node: ast.Identifier) -> Compiled:
+    name = node.value
+    index = node.index
+
+    def unbound(env: Environment) -> MonkeyObject:
+        return Error(f"identifier not found: {name}")
+
+    fallback = unbound if node.fallback is None else _compile_identifier(node.fallback)
+
+    if node.scope is SymbolScope.LOCAL:
+
+        def local(env: Environment) -> MonkeyObject:
+            value = env.slots[index]
+            if value is not None:
+                return value
+            return fallback(env)
+
+        return local
+
+    if node.scope is SymbolScope.CELL:
+
+        def cell(env: Environment) -> MonkeyObject:
+            value = env.slots[index].value
+            if value is not None:
+                return value
+            return fallback(env)
+
+        return cell
+
+    if node.scope is SymbolScope.FREE:
+
+        def free(env: Environment) -> MonkeyObject:
+            value = env.free[index].value
+            if value is not None:
+                return value
+            return fallback(env)
+
+        return free
+
+    def global_(env: Environment) -> MonkeyObject:
+        globals_ = env.globals
+        cache = node.cache
+        if cache is not None and cache[0] == globals_.version:
+            return cache[1]
+        return lookup_global(node, globals_)
+
+    return global_
+
+
+def _compile_array_literal(node: ast.ArrayLiteral) -> Compiled:
+    element_fns = [compile_node(element) for element in node.elements]
+
+    def array(env: Environment) -> MonkeyObject:
+        elements = []
+        for element_fn in element_fns:
+            element = element_fn(env)
+            if type(element) is Error:
+                return element
+            elements.append(element)
+        return Array(elements)
+
+    return array
+
+
+def _compile_hash_literal(node: ast.HashLiteral) -> Compiled:
+    pair_fns = [
+        (compile_node(key), compile_node(value)) for key, value in node.pairs.items()
+    ]
+
+    def hash_(env: Environment) -> MonkeyObject:
+        pairs: dict[HashKey, HashPair] = {}
+        for key_fn, value_fn in pair_fns:
+            key = key_fn(env)
+            if type(key) is Error:
+                return key
+            if not isinstance(key, Hashable):
+                return Error(f"unusable as hash key: {key.monkey_type}")
+            value = value_fn(env)
+            if type(value) is Error:
+                return value
+            pairs[key.hash_key()] = HashPair(key, value)
+        return Hash(pairs)
+
+    return hash_
+
+
+def _compile_index_expression(node: ast.IndexExpression) -> Compiled:
+    left_fn = compile_node(node.left)
+    index_fn = compile_node(node.index)
+
+    def index_(env: Environment) -> MonkeyObject:
+        left = left_fn(env)
+        if type(left) is Error:
+            return left
+        index = index_fn(env)
+        if type(index) is Error:
+            return index
+        return eval_index_expression(left, index)
+
+    return index_
+
+
+def _compile_prefix_expression(node: ast.PrefixExpression) -> Compiled:
+    right_fn = compile_node(node.right)
+    operator = node.operator
+
+    if operator == "!":
+
+        def bang(env: Environment) -> MonkeyObject:
+            right = right_fn(env)
+            if type(right) is Error:
+                return right
+            return eval_bang_operator_expression(right)
+
+        return bang
+
+    if operator == "-":
+
+        def minus(env: Environment) -> MonkeyObject:
+            right = right_fn(env)
+            if type(right) is Integer:
+                return integer(-right.value)
+            if type(right) is Error:
+                return right
+            return eval_minus_prefix_operator_expression(right)
+
+        return minus
+
+    def unknown(env: Environment) -> MonkeyObject:
+        right = right_fn(env)
+        if type(right) is Error:
+            return right
+        return Error(f"unknown operator: {operator}{right.monkey_type}")
+
+    return unknown
+
+
+def _compile_infix_expression(node: ast.InfixExpression) -> Compiled:
+    left_fn = compile_node(node.left)
+    right_fn = compile_node(node.right)
+    operator = node.operator
+
+    arithmetic = INTEGER_ARITHMETIC.get(operator)
+    if arithmetic is not None:
+
+        def integer_arithmetic(env: Environment) -> MonkeyObject:
+            left = left_fn(env)
+            if type(left) is Error:
+                return left
+            right = right_fn(env)
+            if type(left) is Integer and type(right) is Integer:
+                return integer(arithmetic(left.value, right.value))
+            if type(right) is Error:
+                return right
+            return eval_infix_expression(operator, left, right)
+
+        return integer_arithmetic
+
+    comparison = INTEGER_COMPARISONS.get(operator)
+    if comparison is not None:
+
+        def integer_comparison(env: Environment) -> MonkeyObject:
+            left = left_fn(env)
+            if type(left) is Error:
+                return left
+            right = right_fn(env)
+            if type(left) is Integer and type(right) is Integer:
+                return TRUE if comparison(left.value, right.value) else FALSE
+            if type(right) is Error:
+                return right
+            return eval_infix_expression(operator, left, right)
+
+        return integer_comparison
+
+    def infix(env: Environment) -> MonkeyObject:
+        left = left_fn(env)
+        if type(left) is Error:
+            return left
+        right = right_fn(env)
+        if type(right) is Error:
+            return right
+        return eval_infix_expression(operator, left, right)
+
+    return infix
+
+
+def _compile_function_literal(node: ast.FunctionLiteral) -> Compiled:
+    if node.compiled is None:
+        node.compiled = compile_node(node.body)
+
+    def function(env: Environment) -> MonkeyObject:
+        return make_function(node, env)
+
+    return function
+
+
+def _compile_call_expression(node: ast.CallExpression) -> Compiled:
+    function_fn = compile_node(node.function)
+    argument_fns = [compile_node(arg) for arg in node.arguments]
+
+    def call(env: Environment) -> MonkeyObject:
+        function = function_fn(env)
+        if type(function) is Error:
+            return function
+        args = []
+        for argument_fn in argument_fns:
+            arg = argument_fn(env)
+            if type(arg) is Error:
+                return arg
+            args.append(arg)
+        return apply_function(function, args)
+
+    if node.tail:
+
+        def tail_call(env: Environment) -> MonkeyObject:
+            function = function_fn(env)
+            if type(function) is Error:
+                return function
+            args = []
+            for argument_fn in argument_fns:
+                arg = argument_fn(env)
+                if type(arg) is Error:
+                    return arg
+                args.append(arg)
+            return TailCall(function, args)
+
+        return tail_call
+
+    return call
+
+
+def compile_function(fn: Function) -> Compiled:
+    literal = fn.literal
+    if literal is None:
+        return compile_node(fn.body)
+    if literal.compiled is None:
+        literal.compiled = compile_node(literal.body)
+    return literal.compiled
+
+
+def apply_function(fn: MonkeyObject, args: list[MonkeyObject]) -> MonkeyObject:
+    while type(fn) is Function:
+        literal = fn.literal
+        body = literal.compiled if literal is not None else None
+        if body is None:
+            body = compile_function(fn)
+        result = body(extend_function_env(fn, args))
+        if type(result) is ReturnValue:
+            result = result.value
+        if type(result) is not TailCall:
+            return result
+        fn, args = result.fn, result.args
+    if type(fn) is Builtin:
+        return fn.fn(*args)
+    return Error(f"not a function: {fn.monkey_type}")
@@ -0,0 +1,108 @@
+from typing import NamedTuple
+
+Instructions = list[int]
+
+OP_CONSTANT = 0
+OP_POP = 1
+OP_ADD = 2
+OP_SUB = 3
+OP_MUL = 4
+OP_DIV = 5
+OP_TRUE = 6
+OP_FALSE = 7
+OP_NULL = 8
+OP_EQUAL = 9
+OP_NOT_EQUAL = 10
+OP_GREATER_THAN = 11
+OP_LESS_THAN = 12
+OP_MINUS = 13
+OP_BANG = 14
+OP_JUMP = 15
+OP_JUMP_NOT_TRUTHY = 16
+OP_GET_GLOBAL = 17
+OP_SET_GLOBAL = 18
+OP_GET_LOCAL = 19
+OP_SET_LOCAL = 20
+OP_GET_BUILTIN = 21
+OP_GET_FREE = 22
+OP_ARRAY = 23
+OP_HASH = 24
+OP_INDEX = 25
+OP_CALL = 26
+OP_RETURN_VALUE = 27
+OP_CLOSURE = 28
+OP_GET_CELL = 29
+OP_SET_CELL = 30
+OP_GET_FREE_CELL = 31
+
+
+class Definition(NamedTuple):
+    name: str
+    operand_count: int
+
+
+DEFINITIONS: dict[int, Definition] = {
+    OP_CONSTANT: Definition("OpConstant", 1),
+    OP_POP: Definition("OpPop", 0),
+    OP_ADD: Definition("OpAdd", 0),
+    OP_SUB: Definition("OpSub", 0),
+    OP_MUL: Definition("OpMul", 0),
+    OP_DIV: Definition("OpDiv", 0),
+    OP_TRUE: Definition("OpTrue", 0),
+    OP_FALSE: Definition("OpFalse", 0),
+    OP_NULL: Definition("OpNull", 0),
+    OP_EQUAL: Definition("OpEqual", 0),
+    OP_NOT_EQUAL: Definition("OpNotEqual", 0),
+    OP_GREATER_THAN: Definition("OpGreaterThan", 0),
+    OP_LESS_THAN: Definition("OpLessThan", 0),
+    OP_MINUS: Definition("OpMinus", 0),
+    OP_BANG: Definition("OpBang", 0),
+    OP_JUMP: Definition("OpJump", 1),
+    OP_JUMP_NOT_TRUTHY: Definition("OpJumpNotTruthy", 1),
+    OP_GET_GLOBAL: Definition("OpGetGlobal", 1),
+    OP_SET_GLOBAL: Definition("OpSetGlobal", 1),
+    OP_GET_LOCAL: Definition("OpGetLocal", 1),
+    OP_SET_LOCAL: Definition("OpSetLocal", 1),
+    OP_GET_BUILTIN: Definition("OpGetBuiltin", 1),
+    OP_GET_FREE: Definition("OpGetFree", 1),
+    OP_ARRAY: Definition("OpArray", 1),
+    OP_HASH: Definition("OpHash", 1),
+    OP_INDEX: Definition("OpIndex", 0),
+    OP_CALL: Definition("OpCall", 1),
+    OP_RETURN_VALUE: Definition("OpReturnValue", 0),
+    OP_CLOSURE: Definition("OpClosure", 2),
+    OP_GET_CELL: Definition("OpGetCell", 1),
+    OP_SET_CELL: Definition("OpSetCell", 1),
+    OP_GET_FREE_CELL: Definition("OpGetFreeCell", 1),
+}
+
+
+def lookup(op: int) -> Definition:
+    definition = DEFINITIONS.get(op)
+    if definition is None:
+        raise ValueError(f"opcode {op} undefined")
+    return definition
+
+
+def make(op: int, *operands: int) -> Instructions:
+    definition = lookup(op)
+    if len(operands) != definition.operand_count:
+        raise ValueError(
+            f"{definition.name} expects {definition.operand_count} operands, "
+            f"got {len(operands)}"
+        )
+    return [op, *operands]
+
+
+def instructions_to_string(ins: Instructions) -> str:
+    lines = []
+    i = 0
+    while i < len(ins):
+        definition = lookup(ins[i])
+        operands = ins[i + 1 : i + 1 + definition.operand_count]
+        line = f"{i:04d} {definition.name}"
+        if operands:
+            line += " " + " ".join(str(operand) for operand in operands)
+        lines.append(line)
+        i += 1 + definition.operand_count
+    return "\n".join(lines) + "\n" if lines else ""
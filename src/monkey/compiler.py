@@ -0,0 +1,267 @@
+from typing import NamedTuple, Optional
+
+from monkey import ast
+from monkey.builtins import BUILTINS
+from monkey.code import (OP_ADD, OP_ARRAY, OP_BANG, OP_CALL, OP_CLOSURE,
+                         OP_CONSTANT, OP_DIV, OP_EQUAL, OP_FALSE,
+                         OP_GET_BUILTIN, OP_GET_CELL, OP_GET_FREE,
+                         OP_GET_FREE_CELL, OP_GET_GLOBAL, OP_GET_LOCAL,
+                         OP_GREATER_THAN, OP_HASH, OP_INDEX, OP_JUMP,
+                         OP_JUMP_NOT_TRUTHY, OP_LESS_THAN, OP_MINUS, OP_MUL,
+                         OP_NOT_EQUAL, OP_NULL, OP_POP, OP_RETURN_VALUE,
+                         OP_SET_CELL, OP_SET_GLOBAL, OP_SET_LOCAL, OP_SUB,
+                         OP_TRUE, Instructions, make)
+from monkey.mobj import CompiledFunction, MonkeyObject
+from monkey.resolver import collect_let_names, resolve
+from monkey.symbol_table import Symbol, SymbolScope, SymbolTable
+
+INFIX_OPCODES: dict[str, int] = {
+    "+": OP_ADD,
+    "-": OP_SUB,
+    "*": OP_MUL,
+    "/": OP_DIV,
+    "==": OP_EQUAL,
+    "!=": OP_NOT_EQUAL,
+    ">": OP_GREATER_THAN,
+    "<": OP_LESS_THAN,
+}
+
+PREFIX_OPCODES: dict[str, int] = {
+    "-": OP_MINUS,
+    "!": OP_BANG,
+}
+
+GET_OPCODES: dict[SymbolScope, int] = {
+    SymbolScope.GLOBAL: OP_GET_GLOBAL,
+    SymbolScope.LOCAL: OP_GET_LOCAL,
+    SymbolScope.CELL: OP_GET_CELL,
+    SymbolScope.BUILTIN: OP_GET_BUILTIN,
+    SymbolScope.FREE: OP_GET_FREE,
+}
+
+SET_OPCODES: dict[SymbolScope, int] = {
+    SymbolScope.GLOBAL: OP_SET_GLOBAL,
+    SymbolScope.LOCAL: OP_SET_LOCAL,
+    SymbolScope.CELL: OP_SET_CELL,
+}
+
+BUILTIN_INDEX: dict[str, int] = {name: i for i, name in enumerate(BUILTINS)}
+
+
+class CompilationError(Exception):
+    pass
+
+
+class Bytecode(NamedTuple):
+    instructions: Instructions
+    constants: list[MonkeyObject]
+    global_names: list[str]
+
+
+def new_symbol_table() -> SymbolTable:
+    symbol_table = SymbolTable()
+    for i, name in enumerate(BUILTINS):
+        symbol_table.define_builtin(i, name)
+    return symbol_table
+
+
+class Compiler:
+    def __init__(
+        self,
+        symbol_table: Optional[SymbolTable] = None,
+        constants: Optional[list[MonkeyObject]] = None,
+    ):
+        self.constants: list[MonkeyObject] = constants if constants is not None else []
+        self.symbol_table: SymbolTable = symbol_table or new_symbol_table()
+        self.scopes: list[Instructions] = [[]]
+        self.fallbacks: list[list[tuple[int, ast.Identifier]]] = [[]]
+
+    @property
+    def instructions(self) -> Instructions:
+        return self.scopes[-1]
+
+    def bytecode(self) -> Bytecode:
+        return Bytecode(
+            instructions=self.instructions,
+            constants=self.constants,
+            global_names=self.symbol_table.names(),
+        )
+
+    def compile(self, node: ast.Node) -> None:
+        if isinstance(node, ast.Program):
+            resolve(node)
+            for stmt in node.statements:
+                self.compile(stmt)
+        elif isinstance(node, ast.ExpressionStatement):
+            self._compile_expression(node.expression)
+            self.emit(OP_POP)
+        elif isinstance(node, ast.LetStatement):
+            self._compile_let_statement(node)
+        elif isinstance(node, ast.ReturnStatement):
+            self._compile_expression(node.value)
+            self.emit(OP_RETURN_VALUE)
+        elif isinstance(node, ast.BlockStatement):
+            self._compile_block(node)
+        elif isinstance(node, ast.Expression):
+            self._compile_expression(node)
+        else:
+            raise CompilationError(f"unsupported node {type(node).__name__}")
+
+    def emit(self, op: int, *operands: int) -> int:
+        position = len(self.instructions)
+        self.instructions.extend(make(op, *operands))
+        return position
+
+    def add_constant(self, obj: MonkeyObject) -> int:
+        self.constants.append(obj)
+        return len(self.constants) - 1
+
+    def _compile_expression(self, node: ast.Expression) -> None:
+        if isinstance(node, ast.IntegerLiteral):
+            self.emit(OP_CONSTANT, self.add_constant(node.obj))
+        elif isinstance(node, ast.StringLiteral):
+            self.emit(OP_CONSTANT, self.add_constant(node.obj))
+        elif isinstance(node, ast.Boolean):
+            self.emit(OP_TRUE if node.value else OP_FALSE)
+        elif isinstance(node, ast.Identifier):
+            self._load(node)
+        elif isinstance(node, ast.PrefixExpression):
+            self._compile_expression(node.right)
+            op = PREFIX_OPCODES.get(node.operator)
+            if op is None:
+                raise CompilationError(f"unknown operator {node.operator}")
+            self.emit(op)
+        elif isinstance(node, ast.InfixExpression):
+            self._compile_expression(node.left)
+            self._compile_expression(node.right)
+            op = INFIX_OPCODES.get(node.operator)
+            if op is None:
+                raise CompilationError(f"unknown operator {node.operator}")
+            self.emit(op)
+        elif isinstance(node, ast.IfExpression):
+            self._compile_if_expression(node)
+        elif isinstance(node, ast.ArrayLiteral):
+            for element in node.elements:
+                self._compile_expression(element)
+            self.emit(OP_ARRAY, len(node.elements))
+        elif isinstance(node, ast.HashLiteral):
+            for key, value in node.pairs.items():
+                self._compile_expression(key)
+                self._compile_expression(value)
+            self.emit(OP_HASH, len(node.pairs) * 2)
+        elif isinstance(node, ast.IndexExpression):
+            self._compile_expression(node.left)
+            self._compile_expression(node.index)
+            self.emit(OP_INDEX)
+        elif isinstance(node, ast.FunctionLiteral):
+            self._compile_function_literal(node)
+        elif isinstance(node, ast.CallExpression):
+            self._compile_expression(node.function)
+            for arg in node.arguments:
+                self._compile_expression(arg)
+            self.emit(OP_CALL, len(node.arguments))
+        else:
+            raise CompilationError(f"unsupported node {type(node).__name__}")
+
+    def _compile_let_statement(self, node: ast.LetStatement) -> None:
+        self._compile_expression(node.value)
+        name = node.name
+        if name.scope == SymbolScope.GLOBAL:
+            index = self.symbol_table.define(name.value).index
+        else:
+            index = name.index
+        self.emit(SET_OPCODES[name.scope], index)
+
+    def _compile_block(self, block: ast.BlockStatement) -> None:
+        if not block.statements:
+            self.emit(OP_NULL)
+            return
+
+        *init, last = block.statements
+        for stmt in init:
+            self.compile(stmt)
+
+        if isinstance(last, ast.ExpressionStatement):
+            self._compile_expression(last.expression)
+        elif isinstance(last, ast.LetStatement):
+            self._compile_let_statement(last)
+            self._load(last.name)
+        else:
+            self.compile(last)
+
+    def _compile_if_expression(self, node: ast.IfExpression) -> None:
+        self._compile_expression(node.condition)
+        jump_not_truthy = self.emit(OP_JUMP_NOT_TRUTHY, -1)
+
+        self._compile_block(node.consequence)
+        jump = self.emit(OP_JUMP, -1)
+
+        self.instructions[jump_not_truthy + 1] = len(self.instructions)
+        if node.alternative is None:
+            self.emit(OP_NULL)
+        else:
+            self._compile_block(node.alternative)
+
+        self.instructions[jump + 1] = len(self.instructions)
+
+    def _compile_function_literal(self, node: ast.FunctionLiteral) -> None:
+        self.scopes.append([])
+        self.fallbacks.append([])
+        self._compile_block(node.body)
+        self.emit(OP_RETURN_VALUE)
+
+        # Reads of a slot that may still be unbound jump to code placed after
+        # the body that loads the enclosing binding instead, then jump back.
+        fallbacks: dict[int, int] = {}
+        pending = self.fallbacks.pop()
+        for position, fallback in pending:
+            fallbacks[position] = len(self.instructions)
+            self._load(fallback, pending)
+            self.emit(OP_JUMP, position + 2)
+        instructions = self.scopes.pop()
+
+        # Captured variables are shared through cells: an enclosing slot that
+        # is captured already holds one, and free variables are passed on as
+        # the cell itself, so later ``let`` statements are seen by the closure.
+        for symbol in node.free:
+            if symbol.scope == SymbolScope.LOCAL:
+                self.emit(OP_GET_LOCAL, symbol.index)
+            else:
+                self.emit(OP_GET_FREE_CELL, symbol.index)
+
+        params = [param.value for param in node.parameters]
+        lets = sorted(collect_let_names(node.body.statements))
+        compiled = CompiledFunction(
+            instructions,
+            num_locals=node.num_locals,
+            num_parameters=len(node.parameters),
+            local_names=list(dict.fromkeys(params + lets)),
+            free_names=[symbol.name for symbol in node.free],
+            cells=node.cells,
+            fallbacks=fallbacks,
+        )
+        self.emit(OP_CLOSURE, self.add_constant(compiled), len(node.free))
+
+    def _load(
+        self,
+        node: ast.Identifier,
+        pending: Optional[list[tuple[int, ast.Identifier]]] = None,
+    ) -> None:
+        if node.scope == SymbolScope.GLOBAL:
+            self.emit(OP_GET_GLOBAL, self._resolve_global(node.value).index)
+        elif node.scope == SymbolScope.BUILTIN:
+            self.emit(OP_GET_BUILTIN, BUILTIN_INDEX[node.value])
+        else:
+            position = self.emit(GET_OPCODES[node.scope], node.index)
+            if node.fallback is not None:
+                if pending is None:
+                    pending = self.fallbacks[-1]
+                pending.append((position, node.fallback))
+
+    def _resolve_global(self, name: str) -> Symbol:
+        symbol = self.symbol_table.store.get(name)
+        if symbol is None or symbol.scope != SymbolScope.GLOBAL:
+            # Unknown names become globals that are checked when loaded, so
+            # forward references behave like they do in the tree walker.
+            symbol = self.symbol_table.define(name)
+        return symbol
@@ -1,13 +1,34 @@
-from typing import TYPE_CHECKING, Optional
+from itertools import count
+from typing import TYPE_CHECKING, Any, Optional
+
+from monkey.symbol_table import Symbol, SymbolScope
 
 if TYPE_CHECKING:
     from monkey.mobj import MonkeyObject
 
+_versions = count(1)
+
+
+class Cell:
+    def __init__(self, value: Optional["MonkeyObject"] = None):
+        self.value = value
+
 
 class Environment:
-    def __init__(self, outer: Optional["Environment"] = None):
+    def __init__(
+        self,
+        outer: Optional["Environment"] = None,
+        slots: Optional[list[Any]] = None,
+        free: Optional[list[Cell]] = None,
+    ):
         self.store: dict[str, "MonkeyObject"] = {}
         self.outer = outer
+        self.slots: list[Any] = slots if slots is not None else []
+        self.free: list[Cell] = free if free is not None else []
+        self.globals: Environment = (
+            outer.globals if outer is not None and slots is not None else self
+        )
+        self.version = next(_versions) if self.globals is self else 0
 
     def get(self, str) -> Optional["MonkeyObject"]:
         if obj := self.store.get(str, None):
@@ -18,3 +39,9 @@ class Environment:
 
     def put(self, name: str, obj: "MonkeyObject") -> None:
         self.store[name] = obj
+        self.version = next(_versions)
+
+    def capture(self, symbol: Symbol) -> Cell:
+        if symbol.scope is SymbolScope.FREE:
+            return self.free[symbol.index]
+        return self.slots[symbol.index]
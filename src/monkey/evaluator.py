@@ -1,81 +1,146 @@
+from operator import add, eq, floordiv, gt, lt, mul, ne, sub
+from typing import Any, Callable, Optional
+
 from monkey import ast
 from monkey.builtins import BUILTINS
-from monkey.environment import Environment
+from monkey.environment import Cell, Environment
 from monkey.mobj import (FALSE, NULL, TRUE, Array, Builtin, Error, Function,
                          Hash, Hashable, HashKey, HashPair, Integer,
-                         MonkeyObject, ReturnValue, String)
+                         MonkeyObject, ReturnValue, String, TailCall, concat,
+                         equals, integer)
+from monkey.resolver import resolve
+from monkey.symbol_table import SymbolScope
+
+TIER_UP_THRESHOLD: Optional[int] = 100
+
+InfixHandler = Callable[[MonkeyObject, MonkeyObject], MonkeyObject]
+PrefixHandler = Callable[[MonkeyObject], MonkeyObject]
+
+INTEGER_ARITHMETIC: dict[str, Callable[[int, int], int]] = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": floordiv,
+}
+
+INTEGER_COMPARISONS: dict[str, Callable[[int, int], bool]] = {
+    "<": lt,
+    ">": gt,
+    "==": eq,
+    "!=": ne,
+}
 
 
 def monkey_eval(node: ast.Node, env: Environment) -> MonkeyObject:
-    if isinstance(node, ast.Program):
-        return _eval_program(node, env)
-    elif isinstance(node, ast.ExpressionStatement):
-        return monkey_eval(node.expression, env)
-    elif isinstance(node, ast.BlockStatement):
-        return _eval_block_statement(node, env)
-    elif isinstance(node, ast.LetStatement):
-        value = monkey_eval(node.value, env)
-        if isinstance(value, Error):
-            return value
+    evaluate = NODE_EVALUATORS.get(type(node))
+    if evaluate is None:
+        return NULL
+    return evaluate(node, env)
+
+
+def _eval_expression_statement(
+    node: ast.ExpressionStatement, env: Environment
+) -> MonkeyObject:
+    return monkey_eval(node.expression, env)
+
+
+def _eval_let_statement(node: ast.LetStatement, env: Environment) -> MonkeyObject:
+    value = monkey_eval(node.value, env)
+    if isinstance(value, Error):
+        return value
+    if node.name.scope is SymbolScope.LOCAL:
+        env.slots[node.name.index] = value
+    elif node.name.scope is SymbolScope.CELL:
+        env.slots[node.name.index].value = value
+    else:
         env.put(node.name.value, value)
+    return value
+
+
+def _eval_return_statement(node: ast.ReturnStatement, env: Environment) -> MonkeyObject:
+    value = monkey_eval(node.value, env)
+    if isinstance(value, Error):
         return value
-    elif isinstance(node, ast.ReturnStatement):
-        value = monkey_eval(node.value, env)
-        if isinstance(value, Error):
-            return value
-        return ReturnValue(value)
-    elif isinstance(node, ast.IfExpression):
-        return _eval_if_expression(node, env)
-    elif isinstance(node, ast.Identifier):
-        return _eval_identifier(node, env)
-    elif isinstance(node, ast.IntegerLiteral):
-        return Integer(node.value)
-    elif isinstance(node, ast.StringLiteral):
-        return String(node.value)
-    elif isinstance(node, ast.ArrayLiteral):
-        elements = _eval_expressions(node.elements, env)
-        if len(elements) == 1 and isinstance(elements[0], Error):
-            return elements[0]
-        return Array(elements)
-    elif isinstance(node, ast.HashLiteral):
-        return _eval_hash_literal(node, env)
-    elif isinstance(node, ast.IndexExpression):
-        left = monkey_eval(node.left, env)
-        if isinstance(left, Error):
-            return left
-        index = monkey_eval(node.index, env)
-        if isinstance(index, Error):
-            return index
-        return _eval_index_expression(left, index)
-    elif isinstance(node, ast.Boolean):
-        return TRUE if node.value else FALSE
-    elif isinstance(node, ast.PrefixExpression):
-        right = monkey_eval(node.right, env)
-        if isinstance(right, Error):
-            return right
-        return _eval_prefix_expression(node.operator, right)
-    elif isinstance(node, ast.InfixExpression):
-        left = monkey_eval(node.left, env)
-        if isinstance(left, Error):
-            return left
-        right = monkey_eval(node.right, env)
-        if isinstance(right, Error):
-            return right
-        return _eval_infix_expression(node.operator, left, right)
-    elif isinstance(node, ast.FunctionLiteral):
-        return Function(node.parameters, node.body, env)
-    elif isinstance(node, ast.CallExpression):
-        function = monkey_eval(node.function, env)
-        if isinstance(function, Error):
-            return function
-        args = _eval_expressions(node.arguments, env)
-        if len(args) == 1 and isinstance(args[0], Error):
-            return args[0]
-        return _apply_function(function, args)
-    return NULL
+    return ReturnValue(value)
+
+
+def _eval_integer_literal(node: ast.IntegerLiteral, env: Environment) -> MonkeyObject:
+    return node.obj
+
+
+def _eval_string_literal(node: ast.StringLiteral, env: Environment) -> MonkeyObject:
+    return node.obj
+
+
+def _eval_boolean(node: ast.Boolean, env: Environment) -> MonkeyObject:
+    return TRUE if node.value else FALSE
+
+
+def _eval_array_literal(node: ast.ArrayLiteral, env: Environment) -> MonkeyObject:
+    elements = _eval_expressions(node.elements, env)
+    if len(elements) == 1 and isinstance(elements[0], Error):
+        return elements[0]
+    return Array(elements)
+
+
+def _eval_index(node: ast.IndexExpression, env: Environment) -> MonkeyObject:
+    left = monkey_eval(node.left, env)
+    if isinstance(left, Error):
+        return left
+    index = monkey_eval(node.index, env)
+    if isinstance(index, Error):
+        return index
+    return eval_index_expression(left, index)
+
+
+def _eval_prefix(node: ast.PrefixExpression, env: Environment) -> MonkeyObject:
+    right = monkey_eval(node.right, env)
+    if isinstance(right, Error):
+        return right
+    return eval_prefix_expression(node.operator, right)
+
+
+def _eval_infix(node: ast.InfixExpression, env: Environment) -> MonkeyObject:
+    left = monkey_eval(node.left, env)
+    if isinstance(left, Error):
+        return left
+    right = monkey_eval(node.right, env)
+    if isinstance(right, Error):
+        return right
+
+    feedback = node.feedback
+    if feedback is not None:
+        left_type, right_type, handler = feedback
+        if type(left) is left_type and type(right) is right_type:
+            return handler(left, right)
+        node.feedback = None
+        node.polymorphic = True
+    elif not node.polymorphic:
+        specialized = INFIX_OPERATORS.get((node.operator, type(left), type(right)))
+        if specialized is not None:
+            node.feedback = (type(left), type(right), specialized)
+            return specialized(left, right)
+    return eval_infix_expression(node.operator, left, right)
+
+
+def _eval_function_literal(node: ast.FunctionLiteral, env: Environment) -> MonkeyObject:
+    return make_function(node, env)
+
+
+def _eval_call_expression(node: ast.CallExpression, env: Environment) -> MonkeyObject:
+    function = monkey_eval(node.function, env)
+    if isinstance(function, Error):
+        return function
+    args = _eval_expressions(node.arguments, env)
+    if len(args) == 1 and isinstance(args[0], Error):
+        return args[0]
+    if node.tail:
+        return TailCall(function, args)
+    return _apply_function(function, args)
 
 
 def _eval_program(program: ast.Program, env: Environment) -> MonkeyObject:
+    resolve(program)
     result = None
     for stmt in program.statements:
         result = monkey_eval(stmt, env)
@@ -98,15 +163,16 @@ def _eval_block_statement(block: ast.BlockStatement, env: Environment) -> Monkey
     return result
 
 
-def _eval_prefix_expression(operator: str, right: MonkeyObject) -> MonkeyObject:
+def eval_prefix_expression(operator: str, right: MonkeyObject) -> MonkeyObject:
+    handler = PREFIX_OPERATORS.get((operator, type(right)))
+    if handler is not None:
+        return handler(right)
     if operator == "!":
-        return _eval_bang_operator_expression(right)
-    if operator == "-":
-        return _eval_minus_prefix_operator_expression(right)
+        return eval_bang_operator_expression(right)
     return Error(f"unknown operator: {operator}{right.monkey_type}")
 
 
-def _eval_bang_operator_expression(right: MonkeyObject) -> MonkeyObject:
+def eval_bang_operator_expression(right: MonkeyObject) -> MonkeyObject:
     if right is TRUE:
         return FALSE
     if right is FALSE:
@@ -116,19 +182,20 @@ def _eval_bang_operator_expression(right: MonkeyObject) -> MonkeyObject:
     return FALSE
 
 
-def _eval_minus_prefix_operator_expression(right: MonkeyObject) -> MonkeyObject:
+def eval_minus_prefix_operator_expression(right: MonkeyObject) -> MonkeyObject:
     if not isinstance(right, Integer):
         return Error(f"unknown operator: -{right.monkey_type}")
-    return Integer(-right.value)
+    return integer(-right.value)
 
 
-def _eval_infix_expression(
+def eval_infix_expression(
     operator: str, left: MonkeyObject, right: MonkeyObject
 ) -> MonkeyObject:
-    if isinstance(left, Integer) and isinstance(right, Integer):
-        return _eval_integer_infix_expression(operator, left, right)
-    if isinstance(left, String) and isinstance(right, String):
-        return _eval_string_infix_expression(operator, left, right)
+    handler = INFIX_OPERATORS.get((operator, type(left), type(right)))
+    if handler is not None:
+        return handler(left, right)
+    if isinstance(left, (Integer, String)) and type(left) is type(right):
+        return _unknown_operator(operator, left, right)
     if operator == "==":
         return TRUE if left is right else FALSE
     if operator == "!=":
@@ -137,39 +204,60 @@ def _eval_infix_expression(
         return Error(
             f"type mismatch: {left.monkey_type} {operator} {right.monkey_type}"
         )
-    return Error(f"unknown operator: {left.monkey_type} {operator} {right.monkey_type}")
+    return _unknown_operator(operator, left, right)
 
 
-def _eval_integer_infix_expression(
-    operator: str, left: Integer, right: Integer
+def _unknown_operator(
+    operator: str, left: MonkeyObject, right: MonkeyObject
 ) -> MonkeyObject:
-    if operator == "+":
-        return Integer(left.value + right.value)
-    if operator == "-":
-        return Integer(left.value - right.value)
-    if operator == "*":
-        return Integer(left.value * right.value)
-    if operator == "/":
-        return Integer(left.value // right.value)
-    if operator == "<":
-        return TRUE if left.value < right.value else FALSE
-    if operator == ">":
-        return TRUE if left.value > right.value else FALSE
-    if operator == "==":
-        return TRUE if left.value == right.value else FALSE
-    if operator == "!=":
-        return TRUE if left.value != right.value else FALSE
     return Error(f"unknown operator: {left.monkey_type} {operator} {right.monkey_type}")
 
 
-def _eval_string_infix_expression(
-    operator: str, left: String, right: String
-) -> MonkeyObject:
-    if operator != "+":
-        return Error(
-            f"unknown operator: {left.monkey_type} {operator} {right.monkey_type}"
-        )
-    return String(left.value + right.value)
+def _integer_arithmetic(fn: Callable[[int, int], int]) -> InfixHandler:
+    def handler(left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+        return integer(fn(left.value, right.value))
+
+    return handler
+
+
+def _integer_comparison(fn: Callable[[int, int], bool]) -> InfixHandler:
+    def handler(left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+        return TRUE if fn(left.value, right.value) else FALSE
+
+    return handler
+
+
+def _string_concatenation(left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+    assert isinstance(left, String) and isinstance(right, String)
+    return concat(left, right)
+
+
+def _string_equality(left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+    return TRUE if left is right or left.value == right.value else FALSE
+
+
+def _string_inequality(left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+    return FALSE if left is right or left.value == right.value else TRUE
+
+
+def _structural_equality(left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+    return TRUE if equals(left, right) else FALSE
+
+
+def _structural_inequality(left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+    return FALSE if equals(left, right) else TRUE
+
+
+def register_infix_operator(
+    operator: str, left_type: type, right_type: type, handler: InfixHandler
+) -> None:
+    INFIX_OPERATORS[(operator, left_type, right_type)] = handler
+
+
+def register_prefix_operator(
+    operator: str, right_type: type, handler: PrefixHandler
+) -> None:
+    PREFIX_OPERATORS[(operator, right_type)] = handler
 
 
 def _eval_if_expression(ie: ast.IfExpression, env: Environment) -> MonkeyObject:
@@ -184,18 +272,39 @@ def _eval_if_expression(ie: ast.IfExpression, env: Environment) -> MonkeyObject:
     return NULL
 
 
-def _eval_identifier(node: ast.Identifier, env: Environment) -> MonkeyObject:
-    value = env.get(node.value)
-    if value is not None:
-        return value
-
-    value = BUILTINS.get(node.value)
+def eval_identifier(node: ast.Identifier, env: Environment) -> MonkeyObject:
+    value: Optional[MonkeyObject]
+    if node.scope is SymbolScope.LOCAL:
+        value = env.slots[node.index]
+    elif node.scope is SymbolScope.CELL:
+        value = env.slots[node.index].value
+    elif node.scope is SymbolScope.FREE:
+        value = env.free[node.index].value
+    else:
+        return lookup_global(node, env.globals)
     if value is not None:
         return value
+    if node.fallback is not None:
+        return eval_identifier(node.fallback, env)
 
     return Error(f"identifier not found: {node.value}")
 
 
+def lookup_global(node: ast.Identifier, env: Environment) -> MonkeyObject:
+    cache = node.cache
+    if cache is not None and cache[0] == env.version:
+        return cache[1]
+
+    value = env.get(node.value)
+    if value is None:
+        value = BUILTINS.get(node.value)
+    if value is None:
+        return Error(f"identifier not found: {node.value}")
+    if env.outer is None:
+        node.cache = (env.version, value)
+    return value
+
+
 def _eval_expressions(
     expressions: list[ast.Expression], env: Environment
 ) -> list[MonkeyObject]:
@@ -208,7 +317,7 @@ def _eval_expressions(
     return result
 
 
-def _eval_index_expression(left: MonkeyObject, index: MonkeyObject) -> MonkeyObject:
+def eval_index_expression(left: MonkeyObject, index: MonkeyObject) -> MonkeyObject:
     if isinstance(left, Array) and isinstance(index, Integer):
         return _eval_array_index_expression(left, index)
     if isinstance(left, Hash):
@@ -250,21 +359,56 @@ def _eval_hash_literal(node: ast.HashLiteral, env: Environment) -> MonkeyObject:
 
 
 def _apply_function(fn: MonkeyObject, args: list[MonkeyObject]) -> MonkeyObject:
-    if isinstance(fn, Function):
-        extended_env = _extend_function_env(fn, args)
-        evaluated = monkey_eval(fn.body, extended_env)
-        return _unwrap_return_value(evaluated)
-    elif isinstance(fn, Builtin):
+    while isinstance(fn, Function):
+        result = _call_function(fn, args)
+        if not isinstance(result, TailCall):
+            return result
+        fn, args = result.fn, result.args
+
+    if isinstance(fn, Builtin):
         return fn(*args)
-    else:
-        return Error(f"not a function: {fn.monkey_type}")
+    return Error(f"not a function: {fn.monkey_type}")
+
 
+def _call_function(fn: Function, args: list[MonkeyObject]) -> MonkeyObject:
+    fn.calls += 1
+    extended_env = extend_function_env(fn, args)
+    literal = fn.literal
+    if literal is not None:
+        if literal.compiled is None and _is_hot(fn):
+            _tier_up(literal)
+        if literal.compiled is not None:
+            return _unwrap_return_value(literal.compiled(extended_env))
+    evaluated = monkey_eval(fn.body, extended_env)
+    return _unwrap_return_value(evaluated)
 
-def _extend_function_env(fn: Function, args: list[MonkeyObject]) -> Environment:
-    env = Environment(outer=fn.env)
-    for param, arg in zip(fn.parameters, args):
-        env.put(param.value, arg)
-    return env
+
+def _is_hot(fn: Function) -> bool:
+    return TIER_UP_THRESHOLD is not None and fn.calls >= TIER_UP_THRESHOLD
+
+
+def _tier_up(literal: ast.FunctionLiteral) -> None:
+    # Imported here because the closure compiler builds on this module.
+    from monkey.closure_compiler import compile_node
+
+    literal.compiled = compile_node(literal.body)
+
+
+def make_function(node: ast.FunctionLiteral, env: Environment) -> Function:
+    free = [env.capture(symbol) for symbol in node.free]
+    return Function(node.parameters, node.body, env.globals, node, free)
+
+
+def extend_function_env(fn: Function, args: list[MonkeyObject]) -> Environment:
+    num_parameters = len(fn.parameters)
+    slots: list[Any] = list(args[:num_parameters])
+    if fn.literal is not None:
+        slots.extend([None] * (fn.literal.num_locals - len(slots)))
+        for index in fn.literal.cells:
+            slots[index] = Cell(slots[index])
+    else:
+        slots.extend([None] * (num_parameters - len(slots)))
+    return Environment(outer=fn.env, slots=slots, free=fn.free)
 
 
 def _unwrap_return_value(obj: MonkeyObject) -> MonkeyObject:
@@ -275,3 +419,46 @@ def _unwrap_return_value(obj: MonkeyObject) -> MonkeyObject:
 
 def is_truthy(obj: MonkeyObject) -> bool:
     return obj is not FALSE and obj is not NULL
+
+
+NODE_EVALUATORS: dict[type, Callable[[Any, Environment], MonkeyObject]] = {
+    ast.Program: _eval_program,
+    ast.ExpressionStatement: _eval_expression_statement,
+    ast.BlockStatement: _eval_block_statement,
+    ast.LetStatement: _eval_let_statement,
+    ast.ReturnStatement: _eval_return_statement,
+    ast.IfExpression: _eval_if_expression,
+    ast.Identifier: eval_identifier,
+    ast.IntegerLiteral: _eval_integer_literal,
+    ast.StringLiteral: _eval_string_literal,
+    ast.Boolean: _eval_boolean,
+    ast.ArrayLiteral: _eval_array_literal,
+    ast.HashLiteral: _eval_hash_literal,
+    ast.IndexExpression: _eval_index,
+    ast.PrefixExpression: _eval_prefix,
+    ast.InfixExpression: _eval_infix,
+    ast.FunctionLiteral: _eval_function_literal,
+    ast.CallExpression: _eval_call_expression,
+}
+
+INFIX_OPERATORS: dict[tuple[str, type, type], InfixHandler] = {
+    (operator, Integer, Integer): _integer_arithmetic(fn)
+    for operator, fn in INTEGER_ARITHMETIC.items()
+}
+INFIX_OPERATORS.update(
+    {
+        (operator, Integer, Integer): _integer_comparison(fn)
+        for operator, fn in INTEGER_COMPARISONS.items()
+    }
+)
+INFIX_OPERATORS[("+", String, String)] = _string_concatenation
+INFIX_OPERATORS[("==", String, String)] = _string_equality
+INFIX_OPERATORS[("!=", String, String)] = _string_inequality
+INFIX_OPERATORS[("==", Array, Array)] = _structural_equality
+INFIX_OPERATORS[("!=", Array, Array)] = _structural_inequality
+INFIX_OPERATORS[("==", Hash, Hash)] = _structural_equality
+INFIX_OPERATORS[("!=", Hash, Hash)] = _structural_inequality
+
+PREFIX_OPERATORS: dict[tuple[str, type], PrefixHandler] = {
+    ("-", Integer): eval_minus_prefix_operator_expression,
+}
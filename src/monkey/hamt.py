@@ -0,0 +1,208 @@
+from typing import Any, Hashable, Iterator, Mapping
+
+BITS = 5
+MASK = (1 << BITS) - 1
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+Leaf = tuple[int, Hashable, Any]
+
+
+class _BitmapNode:
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: list[Any]):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _CollisionNode:
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, hash: int, entries: list[Leaf]):
+        self.hash = hash
+        self.entries = entries
+
+
+EMPTY_NODE = _BitmapNode(0, [])
+
+
+class Map:
+    __slots__ = ("root", "count")
+
+    def __init__(self, root: Any = EMPTY_NODE, count: int = 0):
+        self.root = root
+        self.count = count
+
+    @classmethod
+    def from_dict(cls, items: Mapping[Any, Any]) -> "Map":
+        result = cls()
+        for key, value in items.items():
+            result = result.set(key, value)
+        return result
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, key: Hashable) -> bool:
+        return _get(self.root, hash(key) & HASH_MASK, key, 0, _MISSING) is not _MISSING
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = _get(self.root, hash(key) & HASH_MASK, key, 0, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key for _, key, _ in _leaves(self.root))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return _get(self.root, hash(key) & HASH_MASK, key, 0, default)
+
+    def set(self, key: Hashable, value: Any) -> "Map":
+        root, added = _set(self.root, (hash(key) & HASH_MASK, key, value), 0)
+        if root is self.root:
+            return self
+        return Map(root, self.count + 1 if added else self.count)
+
+    def delete(self, key: Hashable) -> "Map":
+        root = _delete(self.root, hash(key) & HASH_MASK, key, 0)
+        if root is self.root:
+            return self
+        return Map(EMPTY_NODE if root is None else root, self.count - 1)
+
+    def keys(self) -> Iterator[Hashable]:
+        return (key for _, key, _ in _leaves(self.root))
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, _, value in _leaves(self.root))
+
+    def items(self) -> Iterator[tuple[Hashable, Any]]:
+        return ((key, value) for _, key, value in _leaves(self.root))
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+def _index(bitmap: int, bit: int) -> int:
+    return bin(bitmap & (bit - 1)).count("1")
+
+
+def _get(node: Any, hash: int, key: Hashable, shift: int, default: Any) -> Any:
+    while True:
+        if type(node) is _CollisionNode:
+            for _, other, value in node.entries:
+                if other == key:
+                    return value
+            return default
+
+        bit = 1 << ((hash >> shift) & MASK)
+        if not node.bitmap & bit:
+            return default
+        entry = node.entries[_index(node.bitmap, bit)]
+        if type(entry) is tuple:
+            return entry[2] if entry[1] == key else default
+        node = entry
+        shift += BITS
+
+
+def _set(node: Any, leaf: Leaf, shift: int) -> tuple[Any, bool]:
+    hash, key, value = leaf
+    if type(node) is _CollisionNode:
+        if hash != node.hash:
+            wrapped = _BitmapNode(1 << ((node.hash >> shift) & MASK), [node])
+            return _set(wrapped, leaf, shift)
+        for i, (_, other, old) in enumerate(node.entries):
+            if other == key:
+                if old is value:
+                    return node, False
+                entries = list(node.entries)
+                entries[i] = leaf
+                return _CollisionNode(hash, entries), False
+        return _CollisionNode(hash, [*node.entries, leaf]), True
+
+    bit = 1 << ((hash >> shift) & MASK)
+    index = _index(node.bitmap, bit)
+    if not node.bitmap & bit:
+        entries = list(node.entries)
+        entries.insert(index, leaf)
+        return _BitmapNode(node.bitmap | bit, entries), True
+
+    entry = node.entries[index]
+    added = False
+    if type(entry) is not tuple:
+        child, added = _set(entry, leaf, shift + BITS)
+        if child is entry:
+            return node, False
+    elif entry[1] == key:
+        if entry[2] is value:
+            return node, False
+        child = leaf
+    else:
+        child = _merge(entry, leaf, shift + BITS)
+        added = True
+    entries = list(node.entries)
+    entries[index] = child
+    return _BitmapNode(node.bitmap, entries), added
+
+
+def _merge(first: Leaf, second: Leaf, shift: int) -> Any:
+    if shift >= HASH_BITS or first[0] == second[0]:
+        return _CollisionNode(first[0], [first, second])
+    first_bit = 1 << ((first[0] >> shift) & MASK)
+    second_bit = 1 << ((second[0] >> shift) & MASK)
+    if first_bit == second_bit:
+        return _BitmapNode(first_bit, [_merge(first, second, shift + BITS)])
+    if first_bit < second_bit:
+        return _BitmapNode(first_bit | second_bit, [first, second])
+    return _BitmapNode(first_bit | second_bit, [second, first])
+
+
+def _delete(node: Any, hash: int, key: Hashable, shift: int) -> Any:
+    if type(node) is _CollisionNode:
+        entries = [entry for entry in node.entries if entry[1] != key]
+        if len(entries) == len(node.entries):
+            return node
+        if len(entries) == 1:
+            return entries[0]
+        return _CollisionNode(node.hash, entries)
+
+    bit = 1 << ((hash >> shift) & MASK)
+    if not node.bitmap & bit:
+        return node
+    index = _index(node.bitmap, bit)
+    entry = node.entries[index]
+    if type(entry) is tuple:
+        if entry[1] != key:
+            return node
+        child = None
+    else:
+        child = _delete(entry, hash, key, shift + BITS)
+        if child is entry:
+            return node
+
+    entries = list(node.entries)
+    if child is None:
+        del entries[index]
+        bitmap = node.bitmap & ~bit
+        if not entries:
+            return None
+        if len(entries) == 1 and type(entries[0]) is tuple and shift > 0:
+            return entries[0]
+        return _BitmapNode(bitmap, entries)
+    if type(child) is tuple and len(entries) == 1 and shift > 0:
+        return child
+    entries[index] = child
+    return _BitmapNode(node.bitmap, entries)
+
+
+def _leaves(node: Any) -> Iterator[Leaf]:
+    for entry in node.entries:
+        if type(entry) is tuple:
+            yield entry
+        else:
+            yield from _leaves(entry)
@@ -1,4 +1,35 @@
-from monkey.token import KEYWORDS, STATIC_TOKENS, Token, TokenType
+import re
+from array import array
+from itertools import accumulate, repeat
+from operator import sub
+from typing import Iterator, Optional
+
+from monkey.token import EOF, KEYWORDS, STATIC_TOKENS, Token, TokenType
+
+_PIECE_PATTERN = re.compile(
+    r"[ \t\n\r]*(?:[A-Za-z_]+|[=!]=|[-=+!*/<>,;:(){}\[\]\x00]|[0-9]+"
+    r'|"[^"\x00]*["\x00]?|[^ \t\n\r])'
+)
+_TOKEN_PATTERN = re.compile(
+    r"[ \t\n\r]*([A-Za-z_]+|[=!]=|[-=+!*/<>,;:(){}\[\]\x00]|[0-9]+"
+    r'|"[^"\x00]*["\x00]?|.|\Z)',
+    re.DOTALL,
+)
+
+
+TOKEN_TYPES: list[TokenType] = list(TokenType)
+TOKEN_CODES: dict[TokenType, int] = {
+    token_type: code for code, token_type in enumerate(TOKEN_TYPES)
+}
+CHUNK_SIZE = 1 << 16
+
+_TOKENS_BY_TEXT: dict[str, Token] = {**STATIC_TOKENS, **KEYWORDS}
+_TOKENS_BY_TYPE: dict[TokenType, Token] = {
+    token.type: token for token in _TOKENS_BY_TEXT.values()
+}
+_FIXED_TOKENS: list[Optional[Token]] = [
+    _TOKENS_BY_TYPE.get(token_type) for token_type in TOKEN_TYPES
+]
 
 
 def is_letter(ch: str) -> bool:
@@ -9,7 +40,7 @@ def is_number(ch: str) -> bool:
     return ch.isdigit()
 
 
-class Lexer:
+class CharLexer:
     def __init__(self, input: str):
         self.input: str = input
         self.position: int = 0
@@ -84,3 +115,152 @@ class Lexer:
     def __iter__(self):
         while self.ch != "\x00":
             yield self.next_token()
+
+
+class Lexer:
+    def __init__(self, input: str):
+        self.input: str = input
+        self._next_token = self._scan().__next__
+
+    def next_token(self) -> Token:
+        return self._next_token()
+
+    def _scan(self) -> Iterator[Token]:
+        texts = _TOKEN_PATTERN.findall(self.input)
+        tokens = {**STATIC_TOKENS, **KEYWORDS, "": EOF}
+        for text in set(texts).difference(tokens):
+            token = _classify(text)
+            if token is None:
+                yield from self._scan_chars()
+                return
+            tokens[text] = token
+        yield from map(tokens.__getitem__, texts)
+        yield from repeat(EOF)
+
+    def _scan_chars(self) -> Iterator[Token]:
+        lexer = CharLexer(self.input)
+        while True:
+            token = lexer.next_token()
+            if token.type is TokenType.ILLEGAL:
+                lexer.read_char()
+            yield token
+
+    def __iter__(self) -> Iterator[Token]:
+        return iter(self.next_token, EOF)
+
+
+def _classify(text: str) -> Optional[Token]:
+    first = text[0]
+    if first == '"':
+        if len(text) > 1 and text[-1] in ('"', "\x00"):
+            return Token(TokenType.STRING, text[1:-1])
+        return Token(TokenType.STRING, text[1:])
+    if not text.isascii():
+        return None
+    if is_letter(first):
+        return Token(TokenType.IDENT, text)
+    if is_number(first):
+        return Token(TokenType.INT, text)
+    return Token(TokenType.ILLEGAL, text)
+
+
+class TokenStream:
+    def __init__(self, source: str, types: array, starts: array, ends: array):
+        self.source = source
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+        self.position = 0
+        self.last = len(types) - 1
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def literal(self, index: int) -> str:
+        token_type = TOKEN_TYPES[self.types[index]]
+        start, end = self.starts[index], self.ends[index]
+        if token_type is TokenType.EOF:
+            return "\x00"
+        if token_type is TokenType.STRING:
+            if end - start > 1 and self.source[end - 1] in ('"', "\x00"):
+                end -= 1
+            start += 1
+        return self.source[start:end]
+
+    def token(self, index: int) -> Token:
+        token = _FIXED_TOKENS[self.types[index]]
+        if token is None:
+            token = Token(TOKEN_TYPES[self.types[index]], self.literal(index))
+        return token
+
+    def location(self, index: int) -> tuple[int, int]:
+        start = self.starts[index]
+        line = self.source.count("\n", 0, start) + 1
+        return line, start - self.source.rfind("\n", 0, start)
+
+    def next_token(self) -> Token:
+        position = self.position
+        if position < self.last:
+            self.position = position + 1
+        token = _FIXED_TOKENS[self.types[position]]
+        if token is None:
+            return self.token(position)
+        return token
+
+
+def tokenize(source: str) -> TokenStream:
+    types, starts, ends = array("B"), array("I"), array("I")
+    codes = {text: TOKEN_CODES[token.type] for text, token in _TOKENS_BY_TEXT.items()}
+    widths = {text: len(text) for text in _TOKENS_BY_TEXT}
+    position = 0
+    while pieces := _next_pieces(source, position):
+        for piece in set(pieces).difference(codes):
+            text = piece.lstrip(" \t\n\r")
+            token = _TOKENS_BY_TEXT.get(text) or _classify(text)
+            if token is None:
+                return _tokenize_chars(source)
+            codes[piece] = TOKEN_CODES[token.type]
+            widths[piece] = len(text)
+
+        piece_ends = list(accumulate(map(len, pieces), initial=position))
+        del piece_ends[0]
+        types.frombytes(bytes(map(codes.__getitem__, pieces)))
+        ends.fromlist(piece_ends)
+        starts.fromlist(list(map(sub, piece_ends, map(widths.__getitem__, pieces))))
+        position = piece_ends[-1]
+
+    types.append(TOKEN_CODES[TokenType.EOF])
+    starts.append(len(source))
+    ends.append(len(source))
+    return TokenStream(source, types, starts, ends)
+
+
+def _next_pieces(source: str, position: int) -> list[str]:
+    size = CHUNK_SIZE
+    while True:
+        pieces = _PIECE_PATTERN.findall(source, position, position + size)
+        if position + size >= len(source):
+            return pieces
+        if len(pieces) > 1:
+            pieces.pop()
+            return pieces
+        size *= 2
+
+
+def _tokenize_chars(source: str) -> TokenStream:
+    types, starts, ends = array("B"), array("I"), array("I")
+    lexer = CharLexer(source)
+    while True:
+        lexer.skip_whitespace()
+        start = min(lexer.position, len(source))
+        token = lexer.next_token()
+        if token.type is TokenType.ILLEGAL:
+            lexer.read_char()
+        types.append(TOKEN_CODES[token.type])
+        starts.append(start)
+        ends.append(min(lexer.position, len(source)))
+        if token.type is TokenType.EOF and start == len(source):
+            return TokenStream(source, types, starts, ends)
@@ -1,89 +1,177 @@
-from typing import Any, Callable
+import sys
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
-from monkey import ast
-from monkey.environment import Environment
+from monkey.environment import Cell, Environment
+from monkey.hamt import Map
+from monkey.vector import Vector
+
+if TYPE_CHECKING:
+    from monkey import ast
+
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+FLAT_STRING_MAX = 256
 
 
 class HashKey:
+    __slots__ = ("monkey_type", "value", "hash")
+
     def __init__(self, monkey_type: str, value: Any):
         self.monkey_type = monkey_type
         self.value = value
+        self.hash = hash((monkey_type, value))
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, HashKey):
             return False
-        return self.monkey_type == other.monkey_type and self.value == other.value
+        if self.hash != other.hash or self.monkey_type != other.monkey_type:
+            return False
+        value = self.value
+        if type(value) is tuple or type(value) is frozenset:
+            return _structural_keys_equal(self, other)
+        return value == other.value
 
     def __hash__(self) -> int:
-        return hash((self.monkey_type, self.value))
+        return self.hash
 
 
 class MonkeyObject:
+    __slots__ = ()
     monkey_type: str = "OBJECT"
-
-    def __init__(self, value: Any = None):
-        self.value = value
+    value: Any
 
     def __str__(self) -> str:
         return str(self.value)
 
 
 class Hashable:
+    __slots__ = ()
+
     def hash_key(self) -> HashKey:
         raise NotImplementedError()
 
 
 class Boolean(MonkeyObject, Hashable):
+    __slots__ = ("value", "key")
     monkey_type: str = "BOOLEAN"
+    key: Optional[HashKey]
 
     def hash_key(self) -> HashKey:
-        return HashKey(self.monkey_type, 0 if self.value else 1)
+        key = self.key
+        if key is None:
+            key = self.key = HashKey(self.monkey_type, self.value)
+        return key
 
     def __init__(self, value: bool):
-        super().__init__(value)
+        self.value = value
+        self.key = None
 
 
 class Null(MonkeyObject):
+    __slots__ = ()
     monkey_type: str = "NULL"
-
-    def __init__(self):
-        super().__init__(None)
+    value = None
 
 
 class Integer(MonkeyObject, Hashable):
+    __slots__ = ("value", "key")
     monkey_type: str = "INTEGER"
+    key: Optional[HashKey]
 
     def hash_key(self) -> HashKey:
-        return HashKey(self.monkey_type, self.value)
+        key = self.key
+        if key is None:
+            key = self.key = HashKey(self.monkey_type, self.value)
+        return key
 
     def __init__(self, value: int):
-        super().__init__(value)
+        self.value = value
+        self.key = None
 
 
 class String(MonkeyObject, Hashable):
+    __slots__ = ("flat", "parts", "view", "offset", "length", "key", "__weakref__")
     monkey_type: str = "STRING"
+    flat: Optional[str]
+    parts: Optional[tuple["String", "String"]]
+    view: Optional[str]
+    offset: int
+    key: Optional[HashKey]
 
     def hash_key(self) -> HashKey:
-        return HashKey(self.monkey_type, hash(self.value))
+        key = self.key
+        if key is None:
+            key = self.key = HashKey(self.monkey_type, self.value)
+        return key
 
     def __init__(self, value: str):
-        super().__init__(value)
-
-
-class Array(MonkeyObject):
+        self.flat = value
+        self.parts = None
+        self.view = None
+        self.offset = 0
+        self.length = len(value)
+        self.key = None
+
+    @property
+    def value(self) -> str:
+        flat = self.flat
+        if flat is None:
+            flat = self.flat = self._flatten()
+            self.parts = None
+            self.view = None
+        return flat
+
+    def _flatten(self) -> str:
+        fragments = []
+        stack = [self]
+        while stack:
+            string = stack.pop()
+            if string.flat is not None:
+                fragments.append(string.flat)
+            elif string.view is not None:
+                offset = string.offset
+                fragments.append(string.view[offset : offset + string.length])
+            else:
+                assert string.parts is not None
+                left, right = string.parts
+                stack.append(right)
+                stack.append(left)
+        return "".join(fragments)
+
+    def buffer(self) -> tuple[str, int]:
+        if self.flat is None and self.view is not None:
+            return self.view, self.offset
+        return self.value, 0
+
+
+class Array(MonkeyObject, Hashable):
+    __slots__ = ("elements", "key")
     monkey_type: str = "ARRAY"
+    key: Optional[HashKey]
+
+    def hash_key(self) -> HashKey:
+        key = self.key
+        if key is None:
+            key = _structural_key(self)
+        return key
 
-    def __init__(self, elements: list[MonkeyObject]):
-        super().__init__(elements)
-        self.elements = elements
+    def __init__(self, elements: Union[list[MonkeyObject], Vector]):
+        self.elements = (
+            elements if isinstance(elements, Vector) else Vector.from_list(elements)
+        )
+        self.key = None
 
     def __str__(self) -> str:
         return f"[{', '.join(str(e) for e in self.elements)}]"
 
 
 class HashPair(MonkeyObject):
+    __slots__ = ("key", "value")
+
     def __init__(self, key: MonkeyObject, value: MonkeyObject):
-        super().__init__()
         self.key = key
         self.value = value
 
@@ -92,11 +180,11 @@ class HashPair(MonkeyObject):
 
 
 class Hash(MonkeyObject):
+    __slots__ = ("pairs",)
     monkey_type: str = "HASH"
 
-    def __init__(self, pairs: dict[HashKey, HashPair]):
-        super().__init__(pairs)
-        self.pairs = pairs
+    def __init__(self, pairs: Union[dict[HashKey, HashPair], Map]):
+        self.pairs = pairs if isinstance(pairs, Map) else Map.from_dict(pairs)
 
     def __str__(self) -> str:
         pairs = []
@@ -106,43 +194,125 @@ class Hash(MonkeyObject):
 
 
 class ReturnValue(MonkeyObject):
+    __slots__ = ("value",)
     monkey_type: str = "RETURN_VALUE"
 
     def __init__(self, value: MonkeyObject):
-        super().__init__(value)
+        self.value = value
+
+
+class TailCall(MonkeyObject):
+    __slots__ = ("fn", "args")
+    monkey_type: str = "TAIL_CALL"
+
+    def __init__(self, fn: MonkeyObject, args: list[MonkeyObject]):
+        self.fn = fn
+        self.args = args
 
 
 class Error(MonkeyObject):
+    __slots__ = ("message",)
     monkey_type: str = "ERROR"
 
     def __init__(self, message: str):
-        super().__init__(message)
         self.message = message
 
     def __str__(self) -> str:
-        return f"Error: {self.value}"
+        return f"Error: {self.message}"
+
+
+class MonkeyError(Exception):
+    def __init__(self, error: Error):
+        super().__init__(error.message)
+        self.error = error
 
 
 class Function(MonkeyObject):
+    __slots__ = ("parameters", "body", "env", "literal", "free", "calls")
     monkey_type: str = "FUNCTION"
 
     def __init__(
         self,
-        parameters: list[ast.Identifier],
-        body: ast.BlockStatement,
+        parameters: list["ast.Identifier"],
+        body: "ast.BlockStatement",
         env: Environment,
+        literal: Optional["ast.FunctionLiteral"] = None,
+        free: Optional[list[Cell]] = None,
     ):
-        super().__init__()
         self.parameters = parameters
         self.body = body
         self.env = env
+        self.literal = literal
+        self.free = free if free is not None else []
+        self.calls = 0
+
+    def __str__(self) -> str:
+        return f"Function[{id(self):#x}]"
+
+
+class CompiledFunction(MonkeyObject):
+    __slots__ = (
+        "instructions",
+        "num_locals",
+        "num_parameters",
+        "local_names",
+        "free_names",
+        "cells",
+        "fallbacks",
+    )
+    monkey_type: str = "COMPILED_FUNCTION"
+
+    def __init__(
+        self,
+        instructions: list[int],
+        num_locals: int = 0,
+        num_parameters: int = 0,
+        local_names: Optional[list[str]] = None,
+        free_names: Optional[list[str]] = None,
+        cells: Optional[list[int]] = None,
+        fallbacks: Optional[dict[int, int]] = None,
+    ):
+        self.instructions = instructions
+        self.num_locals = num_locals
+        self.num_parameters = num_parameters
+        self.local_names = local_names or []
+        self.free_names = free_names or []
+        self.cells = cells or []
+        self.fallbacks = fallbacks or {}
+
+    def __str__(self) -> str:
+        return f"CompiledFunction[{id(self):#x}]"
+
+
+class Closure(MonkeyObject):
+    __slots__ = ("fn", "free")
+    monkey_type: str = "FUNCTION"
+
+    def __init__(self, fn: CompiledFunction, free: list[Cell]):
+        self.fn = fn
+        self.free = free
+
+    def __str__(self) -> str:
+        return f"Closure[{id(self):#x}]"
+
+
+class NativeFunction(MonkeyObject):
+    __slots__ = ("fn", "arity")
+    monkey_type: str = "FUNCTION"
+
+    def __init__(self, fn: Callable, arity: int):
+        self.fn = fn
+        self.arity = arity
+
+    def __str__(self) -> str:
+        return f"NativeFunction[{self.fn.__name__}]"
 
 
 class Builtin(MonkeyObject):
+    __slots__ = ("fn",)
     monkey_type: str = "BUILTIN"
 
     def __init__(self, fn: Callable):
-        super().__init__(fn)
         self.fn = fn
 
     def __call__(self, *args: MonkeyObject) -> MonkeyObject:
@@ -155,3 +325,172 @@ class Builtin(MonkeyObject):
 TRUE = Boolean(True)
 FALSE = Boolean(False)
 NULL = Null()
+SMALL_INTS = [Integer(i) for i in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+# Literals keep their interned strings alive; the table does not.
+INTERNED_STRINGS: "weakref.WeakValueDictionary[str, String]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def integer(value: int) -> Integer:
+    if SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return SMALL_INTS[value - SMALL_INT_MIN]
+    return Integer(value)
+
+
+def concat(left: String, right: String) -> String:
+    length = left.length + right.length
+    if length <= FLAT_STRING_MAX and left.flat is not None and right.flat is not None:
+        return String(left.flat + right.flat)
+    string = String.__new__(String)
+    string.flat = None
+    string.parts = (left, right)
+    string.view = None
+    string.offset = 0
+    string.length = length
+    string.key = None
+    return string
+
+
+def substring(string: String, start: int, end: int) -> String:
+    if start == 0 and end == string.length:
+        return string
+    buffer, offset = string.buffer()
+    if end - start <= FLAT_STRING_MAX:
+        return String(buffer[offset + start : offset + end])
+    view = String.__new__(String)
+    view.flat = None
+    view.parts = None
+    view.view = buffer
+    view.offset = offset + start
+    view.length = end - start
+    view.key = None
+    return view
+
+
+def equals(left: MonkeyObject, right: MonkeyObject) -> bool:
+    # Nested arrays and hashes are compared with an explicit work list so
+    # deeply nested values cannot exhaust the Python stack.
+    pending = [(left, right)]
+    while pending:
+        left, right = pending.pop()
+        if left is right:
+            continue
+        left_type = type(left)
+        if left_type is not type(right):
+            return False
+        if left_type is Integer or left_type is String or left_type is Boolean:
+            if left.value != right.value:
+                return False
+        elif isinstance(left, Array):
+            assert isinstance(right, Array)
+            if len(left.elements) != len(right.elements):
+                return False
+            if left.key is not None and right.key is not None:
+                if left.key != right.key:
+                    return False
+            else:
+                pending.extend(zip(left.elements, right.elements))
+        elif isinstance(left, Hash):
+            assert isinstance(right, Hash)
+            if len(left.pairs) != len(right.pairs):
+                return False
+            for key, pair in left.pairs.items():
+                other = right.pairs.get(key)
+                if other is None:
+                    return False
+                pending.append((pair.value, other.value))
+        else:
+            return False
+    return True
+
+
+def _structural_key(obj: MonkeyObject) -> Any:
+    if isinstance(obj, Hashable) and not isinstance(obj, Array):
+        return obj.hash_key()
+    if not isinstance(obj, (Array, Hash)):
+        return obj
+
+    # Keys are built children first from an explicit work list; array keys
+    # are cached on the arrays, hash keys only for the rest of this walk.
+    keys: dict[int, HashKey] = {}
+
+    def key_of(child: MonkeyObject) -> Any:
+        if type(child) is Array and child.key is not None:
+            return child.key
+        if id(child) in keys:
+            return keys[id(child)]
+        if isinstance(child, Hashable):
+            return child.hash_key()
+        return child
+
+    pending: list[Union[Array, Hash]] = [obj]
+    while pending:
+        node = pending[-1]
+        if id(node) in keys:
+            pending.pop()
+            continue
+        children = (
+            node.elements
+            if isinstance(node, Array)
+            else [pair.value for pair in node.pairs.values()]
+        )
+        missing = [
+            child
+            for child in children
+            if (type(child) is Array and child.key is None or type(child) is Hash)
+            and id(child) not in keys
+        ]
+        if missing:
+            pending.extend(missing)
+            continue
+
+        pending.pop()
+        if isinstance(node, Array):
+            key = node.key = HashKey(
+                node.monkey_type, tuple(map(key_of, node.elements))
+            )
+        else:
+            key = HashKey(
+                node.monkey_type,
+                frozenset(
+                    (hashed, key_of(pair.value)) for hashed, pair in node.pairs.items()
+                ),
+            )
+        keys[id(node)] = key
+    return keys[id(obj)]
+
+
+def _structural_keys_equal(left: HashKey, right: HashKey) -> bool:
+    pending: list[tuple[Any, Any]] = [(left, right)]
+    while pending:
+        a, b = pending.pop()
+        if a is b:
+            continue
+        if type(a) is not HashKey or type(b) is not HashKey:
+            return False
+        if a.hash != b.hash or a.monkey_type != b.monkey_type:
+            return False
+        a_value, b_value = a.value, b.value
+        if type(a_value) is tuple:
+            if type(b_value) is not tuple or len(a_value) != len(b_value):
+                return False
+            pending.extend(zip(a_value, b_value))
+        elif type(a_value) is frozenset:
+            if type(b_value) is not frozenset or len(a_value) != len(b_value):
+                return False
+            others = dict(b_value)
+            for hashed, child in a_value:
+                if hashed not in others:
+                    return False
+                pending.append((child, others[hashed]))
+        elif a_value != b_value:
+            return False
+    return True
+
+
+def intern_string(value: str) -> String:
+    string = INTERNED_STRINGS.get(value)
+    if string is None:
+        string = INTERNED_STRINGS[value] = String(sys.intern(value))
+    return string
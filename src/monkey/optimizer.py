@@ -0,0 +1,424 @@
+from typing import Optional
+
+from monkey import ast
+from monkey.builtins import BUILTINS
+from monkey.evaluator import (eval_infix_expression, eval_prefix_expression,
+                              is_truthy)
+from monkey.mobj import FALSE, TRUE, Integer, MonkeyObject, String
+from monkey.token import Token, TokenType
+
+INLINE_MAX_NODES = 16
+
+
+def optimize(program: ast.Program) -> ast.Program:
+    _inline_functions(program)
+    program.statements = _optimize_statements(program.statements)
+    while _prune_unused_lets(program):
+        pass
+    return program
+
+
+def _optimize_statements(statements: list[ast.Statement]) -> list[ast.Statement]:
+    optimized: list[ast.Statement] = []
+    for i, stmt in enumerate(statements):
+        stmt = _optimize_statement(stmt)
+        is_last = i == len(statements) - 1
+        if isinstance(stmt, ast.ExpressionStatement) and isinstance(
+            stmt.expression, ast.IfExpression
+        ):
+            branch = _constant_branch(stmt.expression)
+            if branch is not None and (branch.statements or not is_last):
+                optimized.extend(branch.statements)
+                continue
+        optimized.append(stmt)
+    return optimized
+
+
+def _optimize_statement(stmt: ast.Statement) -> ast.Statement:
+    if isinstance(stmt, ast.ExpressionStatement):
+        stmt.expression = _optimize_expression(stmt.expression)
+    elif isinstance(stmt, ast.LetStatement):
+        stmt.value = _optimize_expression(stmt.value)
+    elif isinstance(stmt, ast.ReturnStatement):
+        stmt.value = _optimize_expression(stmt.value)
+    elif isinstance(stmt, ast.BlockStatement):
+        _optimize_block(stmt)
+    return stmt
+
+
+def _optimize_block(block: ast.BlockStatement) -> None:
+    block.statements = _optimize_statements(block.statements)
+
+
+def _optimize_expression(node: ast.Expression) -> ast.Expression:
+    if isinstance(node, ast.InfixExpression):
+        node.left = _optimize_expression(node.left)
+        node.right = _optimize_expression(node.right)
+        return _fold_infix_expression(node)
+    elif isinstance(node, ast.PrefixExpression):
+        node.right = _optimize_expression(node.right)
+        return _fold_prefix_expression(node)
+    elif isinstance(node, ast.IfExpression):
+        node.condition = _optimize_expression(node.condition)
+        _optimize_block(node.consequence)
+        if node.alternative is not None:
+            _optimize_block(node.alternative)
+        branch = _constant_branch(node)
+        if branch is not None and len(branch.statements) == 1:
+            stmt = branch.statements[0]
+            if isinstance(stmt, ast.ExpressionStatement):
+                return stmt.expression
+        return node
+    elif isinstance(node, ast.FunctionLiteral):
+        _optimize_block(node.body)
+    elif isinstance(node, ast.CallExpression):
+        node.function = _optimize_expression(node.function)
+        node.arguments = [_optimize_expression(arg) for arg in node.arguments]
+    elif isinstance(node, ast.ArrayLiteral):
+        node.elements = [_optimize_expression(element) for element in node.elements]
+    elif isinstance(node, ast.HashLiteral):
+        node.pairs = {
+            _optimize_expression(key): _optimize_expression(value)
+            for key, value in node.pairs.items()
+        }
+    elif isinstance(node, ast.IndexExpression):
+        node.left = _optimize_expression(node.left)
+        node.index = _optimize_expression(node.index)
+    return node
+
+
+def _fold_infix_expression(node: ast.InfixExpression) -> ast.Expression:
+    left = _constant_value(node.left)
+    right = _constant_value(node.right)
+    if left is None or right is None:
+        return node
+    try:
+        value = eval_infix_expression(node.operator, left, right)
+    except ZeroDivisionError:
+        return node
+    return _literal(value, node)
+
+
+def _fold_prefix_expression(node: ast.PrefixExpression) -> ast.Expression:
+    right = _constant_value(node.right)
+    if right is None:
+        return node
+    return _literal(eval_prefix_expression(node.operator, right), node)
+
+
+def _constant_branch(node: ast.IfExpression) -> Optional[ast.BlockStatement]:
+    condition = _constant_value(node.condition)
+    if condition is None:
+        return None
+    if is_truthy(condition):
+        return node.consequence
+    if node.alternative is not None:
+        return node.alternative
+    return ast.BlockStatement(node.token, [])
+
+
+def _constant_value(node: ast.Expression) -> Optional[MonkeyObject]:
+    if isinstance(node, ast.IntegerLiteral):
+        return node.obj
+    if isinstance(node, ast.StringLiteral):
+        return node.obj
+    if isinstance(node, ast.Boolean):
+        return TRUE if node.value else FALSE
+    return None
+
+
+def _literal(value: MonkeyObject, node: ast.Expression) -> ast.Expression:
+    if type(value) is Integer:
+        return ast.IntegerLiteral(Token(TokenType.INT, str(value.value)), value.value)
+    if type(value) is String:
+        return ast.StringLiteral(Token(TokenType.STRING, value.value), value.value)
+    if value is TRUE:
+        return ast.Boolean(Token(TokenType.TRUE, "true"), True)
+    if value is FALSE:
+        return ast.Boolean(Token(TokenType.FALSE, "false"), False)
+    return node
+
+
+def _inline_functions(program: ast.Program) -> None:
+    bindings = _binding_counts(program)
+    inlinable: dict[str, ast.FunctionLiteral] = {}
+    for stmt in program.statements:
+        if inlinable:
+            _inline_statement(stmt, inlinable)
+        if (
+            isinstance(stmt, ast.LetStatement)
+            and isinstance(stmt.value, ast.FunctionLiteral)
+            and bindings[stmt.name.value] == 1
+            and _is_inlinable(stmt.value, bindings)
+        ):
+            inlinable[stmt.name.value] = stmt.value
+
+
+def _inline_statement(
+    stmt: ast.Statement, inlinable: dict[str, ast.FunctionLiteral]
+) -> None:
+    if isinstance(stmt, ast.ExpressionStatement):
+        stmt.expression = _inline_expression(stmt.expression, inlinable)
+    elif isinstance(stmt, ast.LetStatement):
+        stmt.value = _inline_expression(stmt.value, inlinable)
+    elif isinstance(stmt, ast.ReturnStatement):
+        stmt.value = _inline_expression(stmt.value, inlinable)
+    elif isinstance(stmt, ast.BlockStatement):
+        for child in stmt.statements:
+            _inline_statement(child, inlinable)
+
+
+def _inline_expression(
+    node: ast.Expression, inlinable: dict[str, ast.FunctionLiteral]
+) -> ast.Expression:
+    if isinstance(node, ast.CallExpression):
+        node.function = _inline_expression(node.function, inlinable)
+        node.arguments = [_inline_expression(arg, inlinable) for arg in node.arguments]
+        if isinstance(node.function, ast.Identifier):
+            literal = inlinable.get(node.function.value)
+            if literal is not None and len(node.arguments) == len(literal.parameters):
+                return _inline_call(literal, node.arguments)
+    elif isinstance(node, ast.InfixExpression):
+        node.left = _inline_expression(node.left, inlinable)
+        node.right = _inline_expression(node.right, inlinable)
+    elif isinstance(node, ast.PrefixExpression):
+        node.right = _inline_expression(node.right, inlinable)
+    elif isinstance(node, ast.IfExpression):
+        node.condition = _inline_expression(node.condition, inlinable)
+        _inline_statement(node.consequence, inlinable)
+        if node.alternative is not None:
+            _inline_statement(node.alternative, inlinable)
+    elif isinstance(node, ast.FunctionLiteral):
+        _inline_statement(node.body, inlinable)
+    elif isinstance(node, ast.ArrayLiteral):
+        node.elements = [
+            _inline_expression(element, inlinable) for element in node.elements
+        ]
+    elif isinstance(node, ast.HashLiteral):
+        node.pairs = {
+            _inline_expression(key, inlinable): _inline_expression(value, inlinable)
+            for key, value in node.pairs.items()
+        }
+    elif isinstance(node, ast.IndexExpression):
+        node.left = _inline_expression(node.left, inlinable)
+        node.index = _inline_expression(node.index, inlinable)
+    return node
+
+
+def _inline_call(
+    literal: ast.FunctionLiteral, arguments: list[ast.Expression]
+) -> ast.Expression:
+    stmt = literal.body.statements[0]
+    assert isinstance(stmt, ast.ExpressionStatement)
+    names = [param.value for param in literal.parameters]
+    return _substitute(stmt.expression, dict(zip(names, arguments)))
+
+
+def _substitute(
+    node: ast.Expression, arguments: dict[str, ast.Expression]
+) -> ast.Expression:
+    if isinstance(node, ast.Identifier):
+        argument = arguments.get(node.value)
+        if argument is not None:
+            return argument
+        return ast.Identifier(node.token, node.value)
+    elif isinstance(node, ast.PrefixExpression):
+        return ast.PrefixExpression(
+            node.token, node.operator, _substitute(node.right, arguments)
+        )
+    elif isinstance(node, ast.InfixExpression):
+        return ast.InfixExpression(
+            node.token,
+            _substitute(node.left, arguments),
+            node.operator,
+            _substitute(node.right, arguments),
+        )
+    elif isinstance(node, ast.CallExpression):
+        return ast.CallExpression(
+            node.token,
+            _substitute(node.function, arguments),
+            [_substitute(arg, arguments) for arg in node.arguments],
+        )
+    elif isinstance(node, ast.ArrayLiteral):
+        return ast.ArrayLiteral(
+            node.token, [_substitute(element, arguments) for element in node.elements]
+        )
+    elif isinstance(node, ast.IndexExpression):
+        return ast.IndexExpression(
+            node.token,
+            _substitute(node.left, arguments),
+            _substitute(node.index, arguments),
+        )
+    return node
+
+
+def _is_inlinable(literal: ast.FunctionLiteral, bindings: dict[str, int]) -> bool:
+    statements = literal.body.statements
+    if len(statements) != 1 or not isinstance(statements[0], ast.ExpressionStatement):
+        return False
+    names = [param.value for param in literal.parameters]
+    if len(set(names)) != len(names):
+        return False
+
+    steps: list[Optional[int]] = []
+    if not _evaluation_steps(statements[0].expression, names, bindings, steps):
+        return False
+    if len(steps) > INLINE_MAX_NODES:
+        return False
+    # Arguments must be used once each, in order, and before anything that
+    # could fail or have an effect, so substituting them keeps evaluation
+    # order and error behaviour.
+    params = [step for step in steps if step is not None]
+    if params != list(range(len(names))):
+        return False
+    last_param = max(
+        (i for i, step in enumerate(steps) if step is not None), default=-1
+    )
+    return None not in steps[:last_param]
+
+
+def _evaluation_steps(
+    node: ast.Expression,
+    names: list[str],
+    bindings: dict[str, int],
+    steps: list[Optional[int]],
+) -> bool:
+    if isinstance(node, ast.Identifier):
+        if node.value in names:
+            steps.append(names.index(node.value))
+            return True
+        return node.value in BUILTINS and node.value not in bindings
+    elif _constant_value(node) is not None:
+        return True
+    elif isinstance(node, ast.PrefixExpression):
+        ok = _evaluation_steps(node.right, names, bindings, steps)
+    elif isinstance(node, ast.InfixExpression):
+        ok = _evaluation_steps(node.left, names, bindings, steps) and _evaluation_steps(
+            node.right, names, bindings, steps
+        )
+    elif isinstance(node, ast.CallExpression):
+        ok = all(
+            _evaluation_steps(child, names, bindings, steps)
+            for child in [node.function, *node.arguments]
+        )
+    elif isinstance(node, ast.ArrayLiteral):
+        ok = all(
+            _evaluation_steps(element, names, bindings, steps)
+            for element in node.elements
+        )
+    elif isinstance(node, ast.IndexExpression):
+        ok = _evaluation_steps(node.left, names, bindings, steps) and _evaluation_steps(
+            node.index, names, bindings, steps
+        )
+    else:
+        return False
+    steps.append(None)
+    return ok
+
+
+def _binding_counts(program: ast.Program) -> dict[str, int]:
+    counts: dict[str, int] = {}
+
+    def visit(node: Optional[ast.Node]) -> None:
+        names = []
+        if isinstance(node, ast.LetStatement):
+            names.append(node.name.value)
+        elif isinstance(node, ast.FunctionLiteral):
+            names.extend(param.value for param in node.parameters)
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+        for child in _children(node):
+            visit(child)
+
+    for stmt in program.statements:
+        visit(stmt)
+    return counts
+
+
+def _prune_unused_lets(program: ast.Program) -> bool:
+    used = _referenced_names(program)
+    pruned = False
+
+    def prune(statements: list[ast.Statement]) -> list[ast.Statement]:
+        nonlocal pruned
+        kept = []
+        for i, stmt in enumerate(statements):
+            if (
+                isinstance(stmt, ast.LetStatement)
+                and i < len(statements) - 1
+                and stmt.name.value not in used
+                and _is_pure(stmt.value)
+            ):
+                pruned = True
+                continue
+            kept.append(stmt)
+        return kept
+
+    def visit(node: Optional[ast.Node]) -> None:
+        if isinstance(node, ast.BlockStatement):
+            node.statements = prune(node.statements)
+        for child in _children(node):
+            visit(child)
+
+    program.statements = prune(program.statements)
+    for stmt in program.statements:
+        visit(stmt)
+    return pruned
+
+
+def _referenced_names(program: ast.Program) -> set[str]:
+    names: set[str] = set()
+
+    def visit(node: Optional[ast.Node]) -> None:
+        if isinstance(node, ast.Identifier):
+            names.add(node.value)
+        for child in _children(node):
+            visit(child)
+
+    for stmt in program.statements:
+        visit(stmt)
+    return names
+
+
+def _children(node: Optional[ast.Node]) -> list[ast.Node]:
+    if isinstance(node, ast.LetStatement):
+        return [node.value]
+    elif isinstance(node, ast.ExpressionStatement):
+        return [node.expression]
+    elif isinstance(node, ast.ReturnStatement):
+        return [node.value]
+    elif isinstance(node, ast.BlockStatement):
+        return list(node.statements)
+    elif isinstance(node, ast.IfExpression):
+        children: list[ast.Node] = [node.condition, node.consequence]
+        if node.alternative is not None:
+            children.append(node.alternative)
+        return children
+    elif isinstance(node, ast.PrefixExpression):
+        return [node.right]
+    elif isinstance(node, ast.InfixExpression):
+        return [node.left, node.right]
+    elif isinstance(node, ast.FunctionLiteral):
+        return [node.body]
+    elif isinstance(node, ast.CallExpression):
+        return [node.function, *node.arguments]
+    elif isinstance(node, ast.ArrayLiteral):
+        return list(node.elements)
+    elif isinstance(node, ast.HashLiteral):
+        return [item for pair in node.pairs.items() for item in pair]
+    elif isinstance(node, ast.IndexExpression):
+        return [node.left, node.index]
+    return []
+
+
+def _is_pure(node: ast.Expression) -> bool:
+    if isinstance(node, ast.FunctionLiteral) or _constant_value(node) is not None:
+        return True
+    if isinstance(node, ast.ArrayLiteral):
+        return all(_is_pure(element) for element in node.elements)
+    if isinstance(node, ast.HashLiteral):
+        return all(
+            _constant_value(key) is not None and _is_pure(value)
+            for key, value in node.pairs.items()
+        )
+    return False
@@ -1,8 +1,8 @@
 from enum import IntEnum
-from typing import Callable
+from typing import Callable, Union
 
 from monkey import ast
-from monkey.lexer import Lexer
+from monkey.lexer import Lexer, TokenStream
 from monkey.token import Token, TokenType
 
 
@@ -32,8 +32,8 @@ PRECEDENCES: dict[TokenType, int] = {
 
 
 class Parser:
-    def __init__(self, lexer: Lexer):
-        self.lexer: Lexer = lexer
+    def __init__(self, lexer: Union[Lexer, TokenStream]):
+        self.lexer: Union[Lexer, TokenStream] = lexer
 
         self.cur_token: Token = self.lexer.next_token()
         self.peek_token: Token = self.lexer.next_token()
@@ -0,0 +1,147 @@
+from typing import Optional
+
+from monkey import ast
+from monkey.environment import Environment
+from monkey.evaluator import (INTEGER_ARITHMETIC, INTEGER_COMPARISONS,
+                              eval_index_expression, eval_infix_expression,
+                              eval_prefix_expression, extend_function_env,
+                              is_truthy, lookup_global, make_function)
+from monkey.mobj import (FALSE, NULL, TRUE, Array, Builtin, Error, Function,
+                         Hash, Hashable, HashKey, HashPair, Integer,
+                         MonkeyError, MonkeyObject, ReturnValue, TailCall,
+                         integer)
+from monkey.resolver import resolve
+from monkey.symbol_table import SymbolScope
+
+
+class FunctionReturn(Exception):
+    def __init__(self, value: MonkeyObject):
+        self.value = value
+
+
+def raising_eval(node: ast.Node, env: Environment) -> MonkeyObject:
+    if isinstance(node, ast.Program):
+        resolve(node)
+    try:
+        return _eval(node, env)
+    except MonkeyError as e:
+        return e.error
+    except FunctionReturn as r:
+        if isinstance(node, ast.Program):
+            return r.value
+        return ReturnValue(r.value)
+
+
+def _eval(node: ast.Node, env: Environment) -> MonkeyObject:
+    if isinstance(node, ast.ExpressionStatement):
+        return _eval(node.expression, env)
+    elif isinstance(node, ast.Identifier):
+        return _lookup(node, env)
+    elif isinstance(node, ast.IntegerLiteral):
+        return node.obj
+    elif isinstance(node, ast.InfixExpression):
+        return _eval_infix(node.operator, _eval(node.left, env), _eval(node.right, env))
+    elif isinstance(node, ast.CallExpression):
+        function = _eval(node.function, env)
+        args = [_eval(arg, env) for arg in node.arguments]
+        if node.tail:
+            return TailCall(function, args)
+        return _apply_function(function, args)
+    elif isinstance(node, ast.IfExpression):
+        if is_truthy(_eval(node.condition, env)):
+            return _eval(node.consequence, env)
+        if node.alternative is not None:
+            return _eval(node.alternative, env)
+        return NULL
+    elif isinstance(node, ast.BlockStatement) or isinstance(node, ast.Program):
+        result: MonkeyObject = NULL
+        for stmt in node.statements:
+            result = _eval(stmt, env)
+        return result
+    elif isinstance(node, ast.ReturnStatement):
+        raise FunctionReturn(_eval(node.value, env))
+    elif isinstance(node, ast.LetStatement):
+        value = _eval(node.value, env)
+        name = node.name
+        if name.scope is SymbolScope.LOCAL:
+            env.slots[name.index] = value
+        elif name.scope is SymbolScope.CELL:
+            env.slots[name.index].value = value
+        else:
+            env.put(name.value, value)
+        return value
+    elif isinstance(node, ast.StringLiteral):
+        return node.obj
+    elif isinstance(node, ast.Boolean):
+        return TRUE if node.value else FALSE
+    elif isinstance(node, ast.PrefixExpression):
+        return _raise(eval_prefix_expression(node.operator, _eval(node.right, env)))
+    elif isinstance(node, ast.FunctionLiteral):
+        return make_function(node, env)
+    elif isinstance(node, ast.ArrayLiteral):
+        return Array([_eval(element, env) for element in node.elements])
+    elif isinstance(node, ast.HashLiteral):
+        return _eval_hash_literal(node, env)
+    elif isinstance(node, ast.IndexExpression):
+        left = _eval(node.left, env)
+        return _raise(eval_index_expression(left, _eval(node.index, env)))
+    return NULL
+
+
+def _lookup(node: ast.Identifier, env: Environment) -> MonkeyObject:
+    value: Optional[MonkeyObject]
+    if node.scope is SymbolScope.LOCAL:
+        value = env.slots[node.index]
+    elif node.scope is SymbolScope.CELL:
+        value = env.slots[node.index].value
+    elif node.scope is SymbolScope.FREE:
+        value = env.free[node.index].value
+    else:
+        return _raise(lookup_global(node, env.globals))
+    if value is not None:
+        return value
+    if node.fallback is not None:
+        return _lookup(node.fallback, env)
+    raise MonkeyError(Error(f"identifier not found: {node.value}"))
+
+
+def _eval_infix(operator: str, left: MonkeyObject, right: MonkeyObject) -> MonkeyObject:
+    if type(left) is Integer and type(right) is Integer:
+        arithmetic = INTEGER_ARITHMETIC.get(operator)
+        if arithmetic is not None:
+            return integer(arithmetic(left.value, right.value))
+        comparison = INTEGER_COMPARISONS.get(operator)
+        if comparison is not None:
+            return TRUE if comparison(left.value, right.value) else FALSE
+    return _raise(eval_infix_expression(operator, left, right))
+
+
+def _eval_hash_literal(node: ast.HashLiteral, env: Environment) -> MonkeyObject:
+    pairs: dict[HashKey, HashPair] = {}
+    for key_node, value_node in node.pairs.items():
+        key = _eval(key_node, env)
+        if not isinstance(key, Hashable):
+            raise MonkeyError(Error(f"unusable as hash key: {key.monkey_type}"))
+        pairs[key.hash_key()] = HashPair(key, _eval(value_node, env))
+    return Hash(pairs)
+
+
+def _apply_function(fn: MonkeyObject, args: list[MonkeyObject]) -> MonkeyObject:
+    while type(fn) is Function:
+        try:
+            result = _eval(fn.body, extend_function_env(fn, args))
+        except FunctionReturn as r:
+            result = r.value
+        if type(result) is not TailCall:
+            return result
+        fn, args = result.fn, result.args
+
+    if type(fn) is Builtin:
+        return _raise(fn.fn(*args))
+    raise MonkeyError(Error(f"not a function: {fn.monkey_type}"))
+
+
+def _raise(obj: MonkeyObject) -> MonkeyObject:
+    if type(obj) is Error:
+        raise MonkeyError(obj)
+    return obj
@@ -0,0 +1,230 @@
+from typing import Optional
+
+from monkey import ast
+from monkey.builtins import BUILTINS
+from monkey.symbol_table import Symbol, SymbolScope
+
+
+class Scope:
+    def __init__(self, literal: ast.FunctionLiteral, outer: Optional["Scope"]):
+        self.literal = literal
+        self.outer = outer
+        self.slots: dict[str, int] = {}
+        self.declared: set[str] = set()
+        self.free: dict[tuple[str, int], int] = {}
+        self.captured: set[int] = set()
+        self.references: list[ast.Identifier] = []
+
+        for param in literal.parameters:
+            self.declare(param.value)
+        for name in sorted(collect_let_names(literal.body.statements)):
+            self.slot(name)
+
+    def slot(self, name: str) -> int:
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def declare(self, name: str) -> int:
+        self.declared.add(name)
+        return self.slot(name)
+
+    def capture(self, name: str, skip: int = 0) -> Optional[int]:
+        # ``skip`` passes over that many of the nearest enclosing functions
+        # that bind ``name``, for reads that fall through an unbound slot.
+        key = (name, skip)
+        if key in self.free:
+            return self.free[key]
+        outer = self.outer
+        if outer is None:
+            return None
+
+        if name in outer.slots and skip == 0:
+            index = outer.slots[name]
+            outer.captured.add(index)
+            symbol = Symbol(name, SymbolScope.LOCAL, index)
+        else:
+            free = outer.capture(name, skip - 1 if name in outer.slots else skip)
+            if free is None:
+                return None
+            symbol = Symbol(name, SymbolScope.FREE, free)
+
+        self.literal.free.append(symbol)
+        self.free[key] = len(self.literal.free) - 1
+        return self.free[key]
+
+
+class Resolver:
+    def __init__(self) -> None:
+        self.scope: Optional[Scope] = None
+
+    def resolve(self, node: Optional[ast.Node]) -> None:
+        if isinstance(node, ast.Program):
+            for stmt in node.statements:
+                self.resolve(stmt)
+        elif isinstance(node, ast.Identifier):
+            self._resolve_identifier(node)
+        elif isinstance(node, ast.LetStatement):
+            self.resolve(node.value)
+            self._resolve_binding(node.name)
+        elif isinstance(node, ast.FunctionLiteral):
+            self._resolve_function_literal(node)
+        elif isinstance(node, ast.ExpressionStatement):
+            self.resolve(node.expression)
+        elif isinstance(node, ast.ReturnStatement):
+            self.resolve(node.value)
+            if self.scope is not None:
+                _mark_tail_calls(node.value)
+        elif isinstance(node, ast.BlockStatement):
+            for stmt in node.statements:
+                self.resolve(stmt)
+        elif isinstance(node, ast.IfExpression):
+            self.resolve(node.condition)
+            self.resolve(node.consequence)
+            self.resolve(node.alternative)
+        elif isinstance(node, ast.PrefixExpression):
+            self.resolve(node.right)
+        elif isinstance(node, ast.InfixExpression):
+            self.resolve(node.left)
+            self.resolve(node.right)
+        elif isinstance(node, ast.CallExpression):
+            self.resolve(node.function)
+            for arg in node.arguments:
+                self.resolve(arg)
+        elif isinstance(node, ast.ArrayLiteral):
+            for element in node.elements:
+                self.resolve(element)
+        elif isinstance(node, ast.HashLiteral):
+            for key, value in node.pairs.items():
+                self.resolve(key)
+                self.resolve(value)
+        elif isinstance(node, ast.IndexExpression):
+            self.resolve(node.left)
+            self.resolve(node.index)
+
+    def _resolve_function_literal(self, node: ast.FunctionLiteral) -> None:
+        node.free = []
+        scope = self.scope = Scope(node, self.scope)
+        for param in node.parameters:
+            self._resolve_binding(param)
+        self.resolve(node.body)
+        _mark_tail_calls(node.body)
+
+        for reference in scope.references:
+            if reference.index in scope.captured:
+                reference.scope = SymbolScope.CELL
+        node.num_locals = len(scope.slots)
+        node.cells = sorted(scope.captured)
+        self.scope = scope.outer
+
+    def _resolve_binding(self, name: ast.Identifier) -> None:
+        if self.scope is None:
+            _set(name, SymbolScope.GLOBAL)
+        else:
+            self._local(name, self.scope.declare(name.value))
+
+    def _resolve_identifier(self, node: ast.Identifier) -> None:
+        name = node.value
+        scope = self.scope
+        if scope is not None:
+            if name in scope.declared:
+                self._local(node, scope.slots[name])
+                node.fallback = self._fallback(node, 0)
+                return
+            free = scope.capture(name)
+            if free is not None:
+                _set(node, SymbolScope.FREE, free)
+                node.fallback = self._fallback(node, 1)
+                return
+
+        _set_global(node)
+
+    def _fallback(self, node: ast.Identifier, skip: int) -> ast.Identifier:
+        # A slot can be read before its let has run (or after a let in a
+        # branch that was not taken); such a read falls through to the next
+        # enclosing binding and finally to the globals, like Environment.get.
+        assert self.scope is not None
+        fallback = ast.Identifier(node.token, node.value)
+        free = self.scope.capture(node.value, skip)
+        if free is None:
+            _set_global(fallback)
+        else:
+            _set(fallback, SymbolScope.FREE, free)
+            fallback.fallback = self._fallback(node, skip + 1)
+        return fallback
+
+    def _local(self, node: ast.Identifier, index: int) -> None:
+        assert self.scope is not None
+        _set(node, SymbolScope.LOCAL, index)
+        self.scope.references.append(node)
+
+
+def _set(node: ast.Identifier, scope: SymbolScope, index: int = 0) -> None:
+    node.scope = scope
+    node.index = index
+
+
+def _set_global(node: ast.Identifier) -> None:
+    if node.value in BUILTINS:
+        _set(node, SymbolScope.BUILTIN)
+    else:
+        _set(node, SymbolScope.GLOBAL)
+
+
+def _mark_tail_calls(node: Optional[ast.Node]) -> None:
+    if isinstance(node, ast.CallExpression):
+        node.tail = True
+    elif isinstance(node, ast.IfExpression):
+        _mark_tail_calls(node.consequence)
+        _mark_tail_calls(node.alternative)
+    elif isinstance(node, ast.BlockStatement) and node.statements:
+        last = node.statements[-1]
+        if isinstance(last, ast.ExpressionStatement):
+            _mark_tail_calls(last.expression)
+
+
+def resolve(node: ast.Node) -> None:
+    Resolver().resolve(node)
+
+
+def collect_let_names(statements: list[ast.Statement]) -> set[str]:
+    names: set[str] = set()
+
+    def visit(node: Optional[ast.Node]) -> None:
+        if isinstance(node, ast.LetStatement):
+            names.add(node.name.value)
+            visit(node.value)
+        elif isinstance(node, ast.ExpressionStatement):
+            visit(node.expression)
+        elif isinstance(node, ast.ReturnStatement):
+            visit(node.value)
+        elif isinstance(node, ast.BlockStatement):
+            for stmt in node.statements:
+                visit(stmt)
+        elif isinstance(node, ast.IfExpression):
+            visit(node.condition)
+            visit(node.consequence)
+            visit(node.alternative)
+        elif isinstance(node, ast.PrefixExpression):
+            visit(node.right)
+        elif isinstance(node, ast.InfixExpression):
+            visit(node.left)
+            visit(node.right)
+        elif isinstance(node, ast.CallExpression):
+            visit(node.function)
+            for arg in node.arguments:
+                visit(arg)
+        elif isinstance(node, ast.ArrayLiteral):
+            for element in node.elements:
+                visit(element)
+        elif isinstance(node, ast.HashLiteral):
+            for key, value in node.pairs.items():
+                visit(key)
+                visit(value)
+        elif isinstance(node, ast.IndexExpression):
+            visit(node.left)
+            visit(node.index)
+
+    for stmt in statements:
+        visit(stmt)
+    return names
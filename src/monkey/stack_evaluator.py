@@ -0,0 +1,237 @@
+from typing import Any, Optional
+
+from monkey import ast
+from monkey.environment import Environment
+from monkey.evaluator import (eval_identifier, eval_index_expression,
+                              eval_infix_expression, eval_prefix_expression,
+                              extend_function_env, is_truthy, make_function)
+from monkey.mobj import (FALSE, NULL, TRUE, Array, Builtin, Error, Function,
+                         Hash, Hashable, HashKey, HashPair, Integer,
+                         MonkeyObject, integer)
+from monkey.resolver import resolve
+from monkey.symbol_table import SymbolScope
+
+MAX_DEPTH = 100_000
+
+EVAL = 0
+POP = 1
+LET = 2
+RETURN = 3
+IF = 4
+PREFIX = 5
+INFIX = 6
+INDEX = 7
+ARRAY = 8
+HASH_KEY = 9
+HASH = 10
+CALL = 11
+FRAME = 12
+
+
+def stack_eval(
+    node: ast.Node, env: Environment, max_depth: int = MAX_DEPTH
+) -> MonkeyObject:
+    if isinstance(node, ast.Program):
+        resolve(node)
+
+    values: list[MonkeyObject] = []
+    push = values.append
+    pop = values.pop
+    tasks: list[tuple[int, Any, Any]] = [(EVAL, node, env)]
+    schedule = tasks.append
+    depth = 0
+
+    while tasks:
+        kind, payload, env = tasks.pop()
+
+        if kind == EVAL:
+            node_type = type(payload)
+            if node_type is ast.ExpressionStatement:
+                schedule((EVAL, payload.expression, env))
+            elif node_type is ast.Identifier:
+                value = eval_identifier(payload, env)
+                if type(value) is Error:
+                    return value
+                push(value)
+            elif node_type is ast.IntegerLiteral:
+                push(payload.obj)
+            elif node_type is ast.InfixExpression:
+                schedule((INFIX, payload.operator, None))
+                schedule((EVAL, payload.right, env))
+                schedule((EVAL, payload.left, env))
+            elif node_type is ast.CallExpression:
+                schedule((CALL, len(payload.arguments), None))
+                for arg in reversed(payload.arguments):
+                    schedule((EVAL, arg, env))
+                schedule((EVAL, payload.function, env))
+            elif node_type is ast.IfExpression:
+                schedule((IF, payload, env))
+                schedule((EVAL, payload.condition, env))
+            elif node_type is ast.BlockStatement or node_type is ast.Program:
+                _schedule_statements(payload.statements, env, tasks)
+            elif node_type is ast.LetStatement:
+                schedule((LET, payload.name, env))
+                schedule((EVAL, payload.value, env))
+            elif node_type is ast.ReturnStatement:
+                schedule((RETURN, None, None))
+                schedule((EVAL, payload.value, env))
+            elif node_type is ast.StringLiteral:
+                push(payload.obj)
+            elif node_type is ast.Boolean:
+                push(TRUE if payload.value else FALSE)
+            elif node_type is ast.PrefixExpression:
+                schedule((PREFIX, payload.operator, None))
+                schedule((EVAL, payload.right, env))
+            elif node_type is ast.FunctionLiteral:
+                push(make_function(payload, env))
+            elif node_type is ast.ArrayLiteral:
+                schedule((ARRAY, len(payload.elements), None))
+                for element in reversed(payload.elements):
+                    schedule((EVAL, element, env))
+            elif node_type is ast.HashLiteral:
+                schedule((HASH, len(payload.pairs), None))
+                for key, value in reversed(list(payload.pairs.items())):
+                    schedule((EVAL, value, env))
+                    schedule((HASH_KEY, None, None))
+                    schedule((EVAL, key, env))
+            elif node_type is ast.IndexExpression:
+                schedule((INDEX, None, None))
+                schedule((EVAL, payload.index, env))
+                schedule((EVAL, payload.left, env))
+            else:
+                push(NULL)
+
+        elif kind == POP:
+            pop()
+
+        elif kind == INFIX:
+            right = pop()
+            left = pop()
+            if type(left) is Integer and type(right) is Integer:
+                if payload == "+":
+                    push(integer(left.value + right.value))
+                    continue
+                if payload == "-":
+                    push(integer(left.value - right.value))
+                    continue
+                if payload == "<":
+                    push(TRUE if left.value < right.value else FALSE)
+                    continue
+            value = eval_infix_expression(payload, left, right)
+            if type(value) is Error:
+                return value
+            push(value)
+
+        elif kind == CALL:
+            args = values[len(values) - payload :]
+            del values[len(values) - payload :]
+            fn = pop()
+            if type(fn) is Function:
+                if tasks and tasks[-1][0] == RETURN:
+                    # ``return f(x)`` discards everything up to the caller's
+                    # frame anyway, so the call can reuse that frame.
+                    frame = _enclosing_frame(tasks)
+                    if frame is not None:
+                        del values[tasks[frame][1] :]
+                        del tasks[frame + 1 :]
+                if not tasks or tasks[-1][0] != FRAME:
+                    if depth >= max_depth:
+                        return Error(f"maximum recursion depth exceeded: {max_depth}")
+                    depth += 1
+                    schedule((FRAME, len(values), None))
+                schedule((EVAL, fn.body, extend_function_env(fn, args)))
+            elif type(fn) is Builtin:
+                value = fn.fn(*args)
+                if type(value) is Error:
+                    return value
+                push(value)
+            else:
+                return Error(f"not a function: {fn.monkey_type}")
+
+        elif kind == FRAME:
+            depth -= 1
+
+        elif kind == IF:
+            if is_truthy(pop()):
+                schedule((EVAL, payload.consequence, env))
+            elif payload.alternative is not None:
+                schedule((EVAL, payload.alternative, env))
+            else:
+                push(NULL)
+
+        elif kind == LET:
+            value = values[-1]
+            if payload.scope is SymbolScope.LOCAL:
+                env.slots[payload.index] = value
+            elif payload.scope is SymbolScope.CELL:
+                env.slots[payload.index].value = value
+            else:
+                env.put(payload.value, value)
+
+        elif kind == RETURN:
+            value = pop()
+            while tasks:
+                kind, height, _ = tasks.pop()
+                if kind == FRAME:
+                    del values[height:]
+                    depth -= 1
+                    break
+            else:
+                return value
+            push(value)
+
+        elif kind == PREFIX:
+            value = eval_prefix_expression(payload, pop())
+            if type(value) is Error:
+                return value
+            push(value)
+
+        elif kind == INDEX:
+            index = pop()
+            value = eval_index_expression(pop(), index)
+            if type(value) is Error:
+                return value
+            push(value)
+
+        elif kind == ARRAY:
+            elements = values[len(values) - payload :]
+            del values[len(values) - payload :]
+            push(Array(elements))
+
+        elif kind == HASH_KEY:
+            key = values[-1]
+            if not isinstance(key, Hashable):
+                return Error(f"unusable as hash key: {key.monkey_type}")
+
+        elif kind == HASH:
+            items = values[len(values) - 2 * payload :]
+            del values[len(values) - 2 * payload :]
+            pairs: dict[HashKey, HashPair] = {}
+            for i in range(0, len(items), 2):
+                key = items[i]
+                assert isinstance(key, Hashable)
+                pairs[key.hash_key()] = HashPair(key, items[i + 1])
+            push(Hash(pairs))
+
+    return values[-1]
+
+
+def _enclosing_frame(tasks: list[tuple[int, Any, Any]]) -> Optional[int]:
+    for i in range(len(tasks) - 1, -1, -1):
+        if tasks[i][0] == FRAME:
+            return i
+    return None
+
+
+def _schedule_statements(
+    statements: list[ast.Statement],
+    env: Environment,
+    tasks: list[tuple[int, Any, Any]],
+) -> None:
+    if not statements:
+        tasks.append((EVAL, None, env))
+        return
+    tasks.append((EVAL, statements[-1], env))
+    for stmt in reversed(statements[:-1]):
+        tasks.append((POP, None, None))
+        tasks.append((EVAL, stmt, env))
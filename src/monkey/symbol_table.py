@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from enum import Enum
+
+
+class SymbolScope(Enum):
+    GLOBAL = "GLOBAL"
+    LOCAL = "LOCAL"
+    BUILTIN = "BUILTIN"
+    FREE = "FREE"
+    CELL = "CELL"
+
+
+@dataclass(frozen=True)
+class Symbol:
+    name: str
+    scope: SymbolScope
+    index: int
+
+
+class SymbolTable:
+    def __init__(self) -> None:
+        self.store: dict[str, Symbol] = {}
+        self.num_definitions: int = 0
+
+    def define(self, name: str) -> Symbol:
+        existing = self.store.get(name)
+        if existing is not None and existing.scope == SymbolScope.GLOBAL:
+            return existing
+        symbol = Symbol(name, SymbolScope.GLOBAL, self.num_definitions)
+        self.store[name] = symbol
+        self.num_definitions += 1
+        return symbol
+
+    def define_builtin(self, index: int, name: str) -> Symbol:
+        symbol = Symbol(name, SymbolScope.BUILTIN, index)
+        self.store[name] = symbol
+        return symbol
+
+    def names(self) -> list[str]:
+        names = [""] * self.num_definitions
+        for symbol in self.store.values():
+            if symbol.scope == SymbolScope.GLOBAL:
+                names[symbol.index] = symbol.name
+        return names
@@ -0,0 +1,480 @@
+import re
+from functools import partial
+from typing import Any, Callable, Optional
+
+from monkey import ast
+from monkey.builtins import BUILTINS
+from monkey.evaluator import (eval_index_expression, eval_infix_expression,
+                              eval_minus_prefix_operator_expression)
+from monkey.mobj import (FALSE, NULL, TRUE, Array, Boolean, Builtin, Error,
+                         Hash, Hashable, HashKey, HashPair, Integer,
+                         MonkeyError, MonkeyObject, NativeFunction, Null,
+                         String, integer)
+from monkey.resolver import collect_let_names, resolve
+from monkey.symbol_table import SymbolScope
+
+NAME_PREFIX = "m_"
+NAME_PATTERN = re.compile(r"'m\d*_(\w+)'")
+PROGRAM_NAME = "_program"
+MODULE_NAME = "_module"
+
+Namespace = dict[str, Any]
+
+
+class _Unbound:
+    pass
+
+
+UNBOUND = _Unbound()
+
+
+def _box(value: Any) -> MonkeyObject:
+    value_type = type(value)
+    if value_type is int:
+        return integer(value)
+    if value_type is bool:
+        return TRUE if value else FALSE
+    if value_type is str:
+        return String(value)
+    if value is None:
+        return NULL
+    return value
+
+
+def _unbox(obj: MonkeyObject) -> Any:
+    obj_type = type(obj)
+    if obj_type is Integer or obj_type is Boolean or obj_type is String:
+        return obj.value
+    if obj_type is Null:
+        return None
+    if type(obj) is Error:
+        raise MonkeyError(obj)
+    return obj
+
+
+def _infix(operator: str, left: Any, right: Any) -> Any:
+    return _unbox(eval_infix_expression(operator, _box(left), _box(right)))
+
+
+def _add(left: Any, right: Any) -> Any:
+    if type(left) is int and type(right) is int:
+        return left + right
+    return _infix("+", left, right)
+
+
+def _sub(left: Any, right: Any) -> Any:
+    if type(left) is int and type(right) is int:
+        return left - right
+    return _infix("-", left, right)
+
+
+def _mul(left: Any, right: Any) -> Any:
+    if type(left) is int and type(right) is int:
+        return left * right
+    return _infix("*", left, right)
+
+
+def _div(left: Any, right: Any) -> Any:
+    if type(left) is int and type(right) is int:
+        return left // right
+    return _infix("/", left, right)
+
+
+def _lt(left: Any, right: Any) -> bool:
+    if type(left) is int and type(right) is int:
+        return left < right
+    return _infix("<", left, right)
+
+
+def _gt(left: Any, right: Any) -> bool:
+    if type(left) is int and type(right) is int:
+        return left > right
+    return _infix(">", left, right)
+
+
+def _eq(left: Any, right: Any) -> bool:
+    if type(left) is int and type(right) is int:
+        return left == right
+    return _infix("==", left, right)
+
+
+def _ne(left: Any, right: Any) -> bool:
+    if type(left) is int and type(right) is int:
+        return left != right
+    return _infix("!=", left, right)
+
+
+def _bang(right: Any) -> bool:
+    return right is False or right is None
+
+
+def _minus(right: Any) -> Any:
+    if type(right) is int:
+        return -right
+    return _unbox(eval_minus_prefix_operator_expression(_box(right)))
+
+
+def _truthy(value: Any) -> bool:
+    return value is not False and value is not None
+
+
+def _index(left: Any, index: Any) -> Any:
+    return _unbox(eval_index_expression(_box(left), _box(index)))
+
+
+def _hash_key(key: Any) -> MonkeyObject:
+    boxed = _box(key)
+    if not isinstance(boxed, Hashable):
+        raise MonkeyError(Error(f"unusable as hash key: {boxed.monkey_type}"))
+    return boxed
+
+
+def _hash(*items: Any) -> MonkeyObject:
+    pairs: dict[HashKey, HashPair] = {}
+    for i in range(0, len(items), 2):
+        pairs[items[i].hash_key()] = HashPair(items[i], _box(items[i + 1]))
+    return Hash(pairs)
+
+
+def _array(*elements: Any) -> MonkeyObject:
+    return Array([_box(element) for element in elements])
+
+
+def _global(namespace: Namespace, name: str) -> Any:
+    if name in namespace:
+        return namespace[name]
+    return namespace["__builtins__"].get(name, UNBOUND)
+
+
+def _call(fn: Any, *args: Any) -> Any:
+    if type(fn) is NativeFunction:
+        if len(args) == fn.arity:
+            return fn.fn(*args)
+        if len(args) > fn.arity:
+            return fn.fn(*args[: fn.arity])
+        return fn.fn(*args, *[UNBOUND] * (fn.arity - len(args)))
+    if type(fn) is Builtin:
+        return _unbox(fn.fn(*[_box(arg) for arg in args]))
+    raise MonkeyError(Error(f"not a function: {_box(fn).monkey_type}"))
+
+
+RUNTIME: dict[str, Any] = {
+    "_UNBOUND": UNBOUND,
+    "_NativeFunction": NativeFunction,
+    "_add": _add,
+    "_sub": _sub,
+    "_mul": _mul,
+    "_div": _div,
+    "_lt": _lt,
+    "_gt": _gt,
+    "_eq": _eq,
+    "_ne": _ne,
+    "_bang": _bang,
+    "_minus": _minus,
+    "_truthy": _truthy,
+    "_index": _index,
+    "_hash_key": _hash_key,
+    "_hash": _hash,
+    "_array": _array,
+    "_call": _call,
+    "_NameError": NameError,
+}
+
+ARITHMETIC_HELPERS: dict[str, str] = {
+    "+": "_add",
+    "-": "_sub",
+    "*": "_mul",
+    "/": "_div",
+}
+
+COMPARISON_HELPERS: dict[str, str] = {
+    "<": "_lt",
+    ">": "_gt",
+    "==": "_eq",
+    "!=": "_ne",
+}
+
+
+def new_namespace() -> Namespace:
+    namespace = dict(RUNTIME)
+    namespace["__builtins__"] = {
+        NAME_PREFIX + name: builtin for name, builtin in BUILTINS.items()
+    }
+    namespace["_global"] = partial(_global, namespace)
+    return namespace
+
+
+def mangle(name: str) -> str:
+    return NAME_PREFIX + name
+
+
+class Transpiler:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.indent: int = 0
+        self.counter: int = 0
+        self.scopes: list[dict[str, str]] = []
+
+    def transpile(self, node: ast.Node) -> str:
+        statements: list[ast.Statement]
+        if isinstance(node, ast.Program):
+            statements = node.statements
+        elif isinstance(node, ast.Expression):
+            statements = [ast.ExpressionStatement(node.token, node)]
+        else:
+            assert isinstance(node, ast.Statement)
+            statements = [node]
+        resolve(node)
+
+        self.indent = 1
+        self._emit(f"def {PROGRAM_NAME}():")
+        self.indent += 1
+        global_names = sorted(collect_let_names(statements))
+        if global_names:
+            self._emit(f"global {', '.join(mangle(name) for name in global_names)}")
+        self._statements(statements, "return")
+        self.indent -= 1
+        self._emit(f"return {PROGRAM_NAME}")
+        return "\n".join([f"def {MODULE_NAME}():", *self.lines]) + "\n"
+
+    def _emit(self, line: str) -> None:
+        self.lines.append("    " * self.indent + line)
+
+    def _temp(self, prefix: str = "_t") -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _statements(
+        self, statements: list[ast.Statement], target: Optional[str]
+    ) -> None:
+        if not statements:
+            self._assign(target, "None")
+            return
+        *init, last = statements
+        for stmt in init:
+            self._statement(stmt, None)
+        self._statement(last, target)
+
+    def _assign(self, target: Optional[str], expression: str) -> None:
+        if target is None:
+            self._emit(expression)
+        elif target == "return":
+            self._emit(f"return {expression}")
+        else:
+            self._emit(f"{target} = {expression}")
+
+    def _statement(self, stmt: ast.Statement, target: Optional[str]) -> None:
+        if isinstance(stmt, ast.ExpressionStatement):
+            if isinstance(stmt.expression, ast.IfExpression):
+                self._if(stmt.expression, target)
+            else:
+                self._assign(target, self._expression(stmt.expression))
+        elif isinstance(stmt, ast.LetStatement):
+            name = self._name(stmt.name)
+            self._emit(f"{name} = {self._expression(stmt.value)}")
+            if target is not None:
+                self._assign(target, name)
+        elif isinstance(stmt, ast.ReturnStatement):
+            self._emit(f"return {self._expression(stmt.value)}")
+        elif isinstance(stmt, ast.BlockStatement):
+            self._statements(stmt.statements, target)
+        else:
+            self._assign(target, "None")
+
+    def _if(self, node: ast.IfExpression, target: Optional[str]) -> None:
+        self._emit(f"if {self._condition(node.condition)}:")
+        self.indent += 1
+        self._statements(node.consequence.statements, target)
+        self.indent -= 1
+        if node.alternative is not None or target is not None:
+            self._emit("else:")
+            self.indent += 1
+            if node.alternative is None:
+                self._assign(target, "None")
+            else:
+                self._statements(node.alternative.statements, target)
+            self.indent -= 1
+
+    def _condition(self, node: ast.Expression) -> str:
+        if isinstance(node, ast.Boolean):
+            return "True" if node.value else "False"
+        if (
+            isinstance(node, ast.InfixExpression)
+            and node.operator in COMPARISON_HELPERS
+        ):
+            left, right = self._operands([node.left, node.right])
+            return f"{COMPARISON_HELPERS[node.operator]}({left}, {right})"
+        return f"_truthy({self._expression(node)})"
+
+    def _operands(self, nodes: list[ast.Expression]) -> list[str]:
+        # Sub-expressions that need statements (if-expressions, function
+        # literals) emit them in place; earlier operands are spilled into
+        # temporaries first so evaluation order stays left to right.
+        expressions: list[str] = []
+        for node in nodes:
+            position = len(self.lines)
+            expression = self._expression(node)
+            if len(self.lines) > position:
+                spills = []
+                for i, previous in enumerate(expressions):
+                    if not _is_atomic(previous):
+                        temp = self._temp()
+                        spills.append("    " * self.indent + f"{temp} = {previous}")
+                        expressions[i] = temp
+                self.lines[position:position] = spills
+            expressions.append(expression)
+        return expressions
+
+    def _expression(self, node: ast.Expression) -> str:
+        if isinstance(node, ast.IntegerLiteral):
+            return str(node.value)
+        elif isinstance(node, ast.StringLiteral):
+            return repr(node.value)
+        elif isinstance(node, ast.Boolean):
+            return "True" if node.value else "False"
+        elif isinstance(node, ast.Identifier):
+            return self._name(node)
+        elif isinstance(node, ast.PrefixExpression):
+            (right,) = self._operands([node.right])
+            if node.operator == "!":
+                return f"_bang({right})"
+            if node.operator == "-":
+                return f"_minus({right})"
+            raise ValueError(f"unknown operator {node.operator}")
+        elif isinstance(node, ast.InfixExpression):
+            left, right = self._operands([node.left, node.right])
+            if node.operator in ARITHMETIC_HELPERS:
+                return f"{ARITHMETIC_HELPERS[node.operator]}({left}, {right})"
+            if node.operator in COMPARISON_HELPERS:
+                return f"{COMPARISON_HELPERS[node.operator]}({left}, {right})"
+            raise ValueError(f"unknown operator {node.operator}")
+        elif isinstance(node, ast.IfExpression):
+            temp = self._temp()
+            self._if(node, temp)
+            return temp
+        elif isinstance(node, ast.ArrayLiteral):
+            elements = self._operands(node.elements)
+            return f"_array({', '.join(elements)})"
+        elif isinstance(node, ast.HashLiteral):
+            operands = self._operands(
+                [item for pair in node.pairs.items() for item in pair]
+            )
+            items = [
+                f"_hash_key({operand})" if i % 2 == 0 else operand
+                for i, operand in enumerate(operands)
+            ]
+            return f"_hash({', '.join(items)})"
+        elif isinstance(node, ast.IndexExpression):
+            left, index = self._operands([node.left, node.index])
+            return f"_index({left}, {index})"
+        elif isinstance(node, ast.FunctionLiteral):
+            return self._function_literal(node)
+        elif isinstance(node, ast.CallExpression):
+            operands = self._operands([node.function, *node.arguments])
+            return f"_call({', '.join(operands)})"
+        raise ValueError(f"unsupported node {type(node).__name__}")
+
+    def _function_literal(self, node: ast.FunctionLiteral) -> str:
+        name = self._temp("_f")
+        parameters = [mangle(param.value) for param in node.parameters]
+        # Each let gets a Python name of its own: a Monkey function can read
+        # an outer ``x`` before its own ``let x`` runs, which Python would
+        # reject if both were spelled the same.
+        names = {param.value: mangle(param.value) for param in node.parameters}
+        lets: dict[str, str] = {}
+        for let in sorted(collect_let_names(node.body.statements)):
+            if let not in names:
+                names[let] = lets[let] = f"m{self._temp('')}_{let}"
+        self.scopes.append(names)
+
+        # An unbound slot reads the enclosing binding instead. Nothing can
+        # rebind that while this call runs, so it is looked up once on entry.
+        fallbacks = [
+            self._fallback(param.value, parameter)
+            for param, parameter in zip(node.parameters, parameters)
+        ]
+        self._emit(f"def {name}({', '.join(parameters)}):")
+        self.indent += 1
+        for param, parameter, fallback in zip(node.parameters, parameters, fallbacks):
+            self._emit(f"if {parameter} is _UNBOUND:")
+            self.indent += 1
+            self._emit(f"del {parameter}")
+            self._bind(parameter, param.value, fallback)
+            self.indent -= 1
+        for let, target in lets.items():
+            self._bind(target, let, self._fallback(let, target))
+        self._statements(node.body.statements, "return")
+        self.indent -= 1
+        self.scopes.pop()
+        return f"_NativeFunction({name}, {len(parameters)})"
+
+    def _fallback(self, name: str, target: str) -> Optional[str]:
+        for names in reversed(self.scopes[:-1]):
+            if name in names:
+                source = names[name]
+                break
+        else:
+            return None
+        if source != target:
+            return source
+        # A parameter shadowing an enclosing parameter of the same name needs
+        # a helper defined outside the function to reach the outer one.
+        helper = self._temp("_u")
+        self._emit(f"def {helper}():")
+        self._emit(f"    return {source}")
+        return f"{helper}()"
+
+    def _bind(self, target: str, name: str, source: Optional[str]) -> None:
+        if source is None:
+            self._emit(f"{target} = _global({mangle(name)!r})")
+            self._emit(f"if {target} is _UNBOUND:")
+            self._emit(f"    del {target}")
+        else:
+            self._emit("try:")
+            self._emit(f"    {target} = {source}")
+            self._emit("except _NameError:")
+            self._emit("    pass")
+
+    def _name(self, node: ast.Identifier) -> str:
+        if node.scope in (SymbolScope.LOCAL, SymbolScope.CELL):
+            return self.scopes[-1][node.value]
+        if node.scope == SymbolScope.FREE:
+            for names in reversed(self.scopes[:-1]):
+                if node.value in names:
+                    return names[node.value]
+        return mangle(node.value)
+
+
+def _is_atomic(expression: str) -> bool:
+    return re.fullmatch(r"_t\d+|\d+|True|False|None", expression) is not None
+
+
+def transpile(node: ast.Node) -> str:
+    return Transpiler().transpile(node)
+
+
+def compile_program(node: ast.Node) -> Callable[[Namespace], MonkeyObject]:
+    code = compile(transpile(node), "<monkey>", "exec")
+
+    def run(namespace: Namespace) -> MonkeyObject:
+        exec(code, namespace)
+        program = namespace.pop(MODULE_NAME)()
+        try:
+            return _box(program())
+        except MonkeyError as e:
+            return e.error
+        except NameError as e:
+            match = NAME_PATTERN.search(str(e))
+            if match is None:
+                raise
+            return Error(f"identifier not found: {match.group(1)}")
+
+    return run
+
+
+def transpile_eval(
+    node: ast.Node, namespace: Optional[Namespace] = None
+) -> MonkeyObject:
+    if namespace is None:
+        namespace = new_namespace()
+    return compile_program(node)(namespace)
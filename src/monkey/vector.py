@@ -0,0 +1,111 @@
+from typing import Any, Iterator, Sequence
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+
+class Vector:
+    __slots__ = ("count", "shift", "root", "tail", "offset")
+
+    def __init__(
+        self,
+        count: int = 0,
+        shift: int = BITS,
+        root: Sequence[Any] = (),
+        tail: Sequence[Any] = (),
+        offset: int = 0,
+    ):
+        self.count = count
+        self.shift = shift
+        self.root = root
+        self.tail = tail
+        self.offset = offset
+
+    @classmethod
+    def from_list(cls, items: Sequence[Any]) -> "Vector":
+        count = len(items)
+        if count <= WIDTH:
+            return cls(count, BITS, (), list(items))
+
+        tail_offset = _tail_offset(count)
+        nodes: list[Any] = [items[i : i + WIDTH] for i in range(0, tail_offset, WIDTH)]
+        shift = BITS
+        while len(nodes) > WIDTH:
+            nodes = [nodes[i : i + WIDTH] for i in range(0, len(nodes), WIDTH)]
+            shift += BITS
+        return cls(count, shift, nodes, items[tail_offset:])
+
+    def __len__(self) -> int:
+        return self.count - self.offset
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self.count - self.offset
+        if not 0 <= index < self.count - self.offset:
+            raise IndexError("vector index out of range")
+        index += self.offset
+        return self._leaf(index)[index & MASK]
+
+    def __iter__(self) -> Iterator[Any]:
+        start = self.offset
+        for base in range(start & ~MASK, self.count, WIDTH):
+            leaf = self._leaf(base)
+            yield from leaf[start - base :] if start > base else leaf
+
+    def append(self, value: Any) -> "Vector":
+        count = self.count
+        if count - _tail_offset(count) < WIDTH:
+            return Vector(
+                count + 1, self.shift, self.root, [*self.tail, value], self.offset
+            )
+
+        shift = self.shift
+        if (count >> BITS) > (1 << shift):
+            root: Sequence[Any] = [self.root, _new_path(shift, self.tail)]
+            shift += BITS
+        else:
+            root = _push_tail(count, shift, self.root, self.tail)
+        return Vector(count + 1, shift, root, [value], self.offset)
+
+    def rest(self) -> "Vector":
+        return Vector(self.count, self.shift, self.root, self.tail, self.offset + 1)
+
+    def _leaf(self, index: int) -> Sequence[Any]:
+        if index >= _tail_offset(self.count):
+            return self.tail
+        node = self.root
+        for level in range(self.shift, 0, -BITS):
+            node = node[(index >> level) & MASK]
+        return node
+
+
+def _tail_offset(count: int) -> int:
+    if count < WIDTH:
+        return 0
+    return ((count - 1) >> BITS) << BITS
+
+
+def _new_path(level: int, node: Sequence[Any]) -> Sequence[Any]:
+    if level == 0:
+        return node
+    return [_new_path(level - BITS, node)]
+
+
+def _push_tail(
+    count: int, level: int, parent: Sequence[Any], tail: Sequence[Any]
+) -> Sequence[Any]:
+    index = ((count - 1) >> level) & MASK
+    node = list(parent)
+    if level == BITS:
+        child = tail
+    elif index < len(parent):
+        child = _push_tail(count, level - BITS, parent[index], tail)
+    else:
+        child = _new_path(level - BITS, tail)
+
+    if index < len(node):
+        node[index] = child
+    else:
+        node.append(child)
+    return node
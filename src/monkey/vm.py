@@ -0,0 +1,319 @@
+from typing import Any, Optional
+
+from monkey.builtins import BUILTINS
+from monkey.code import (OP_ADD, OP_ARRAY, OP_BANG, OP_CALL, OP_CLOSURE,
+                         OP_CONSTANT, OP_DIV, OP_EQUAL, OP_FALSE,
+                         OP_GET_BUILTIN, OP_GET_CELL, OP_GET_FREE,
+                         OP_GET_FREE_CELL, OP_GET_GLOBAL, OP_GET_LOCAL,
+                         OP_GREATER_THAN, OP_HASH, OP_INDEX, OP_JUMP,
+                         OP_JUMP_NOT_TRUTHY, OP_LESS_THAN, OP_MINUS, OP_MUL,
+                         OP_NOT_EQUAL, OP_NULL, OP_POP, OP_RETURN_VALUE,
+                         OP_SET_CELL, OP_SET_GLOBAL, OP_SET_LOCAL, OP_SUB,
+                         OP_TRUE)
+from monkey.compiler import Bytecode
+from monkey.environment import Cell
+from monkey.evaluator import (eval_index_expression, eval_infix_expression,
+                              eval_prefix_expression)
+from monkey.mobj import (FALSE, NULL, TRUE, Array, Builtin, Closure,
+                         CompiledFunction, Error, Hash, Hashable, HashKey,
+                         HashPair, Integer, MonkeyObject, integer)
+
+BUILTIN_FUNCTIONS: list[Builtin] = list(BUILTINS.values())
+
+
+class VM:
+    def __init__(
+        self,
+        bytecode: Bytecode,
+        globals: Optional[list[Optional[MonkeyObject]]] = None,
+    ):
+        self.constants = bytecode.constants
+        self.global_names = bytecode.global_names
+        self.globals: list[Optional[MonkeyObject]] = (
+            globals if globals is not None else []
+        )
+        main_fn = CompiledFunction(bytecode.instructions)
+        self.main_closure = Closure(main_fn, [])
+
+    def run(self) -> MonkeyObject:
+        constants: list[Any] = self.constants
+        globals_ = self.globals
+        if len(globals_) < len(self.global_names):
+            globals_.extend([None] * (len(self.global_names) - len(globals_)))
+
+        # A global that shadows a builtin takes precedence over it, just like
+        # in the tree walker, even in code compiled before the ``let``.
+        global_index = {name: i for i, name in enumerate(self.global_names)}
+        shadowed = [global_index.get(name) for name in BUILTINS]
+
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+        frames: list[tuple] = []
+
+        closure = self.main_closure
+        ins = closure.fn.instructions
+        free = closure.free
+        local: list[Any] = []
+        ip = 0
+        last: MonkeyObject = NULL
+
+        while ip < len(ins):
+            op = ins[ip]
+
+            if op == OP_GET_LOCAL:
+                value = local[ins[ip + 1]]
+                if value is not None:
+                    push(value)
+                    ip += 2
+                elif ip in closure.fn.fallbacks:
+                    ip = closure.fn.fallbacks[ip]
+                else:
+                    name = closure.fn.local_names[ins[ip + 1]]
+                    return Error(f"identifier not found: {name}")
+            elif op == OP_CONSTANT:
+                push(constants[ins[ip + 1]])
+                ip += 2
+            elif op == OP_JUMP_NOT_TRUTHY:
+                condition = pop()
+                if condition is FALSE or condition is NULL:
+                    ip = ins[ip + 1]
+                else:
+                    ip += 2
+            elif op == OP_LESS_THAN:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(TRUE if left.value < right.value else FALSE)
+                else:
+                    result = eval_infix_expression("<", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_ADD:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(integer(left.value + right.value))
+                else:
+                    result = eval_infix_expression("+", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_SUB:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(integer(left.value - right.value))
+                else:
+                    result = eval_infix_expression("-", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_EQUAL:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(TRUE if left.value == right.value else FALSE)
+                else:
+                    result = eval_infix_expression("==", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_CALL:
+                num_args = ins[ip + 1]
+                ip += 2
+                callee = stack[-1 - num_args]
+                if type(callee) is Closure:
+                    fn = callee.fn
+                    args = stack[len(stack) - num_args :]
+                    del stack[-1 - num_args :]
+                    if num_args > fn.num_parameters:
+                        del args[fn.num_parameters :]
+                    args.extend([None] * (fn.num_locals - len(args)))
+                    for i in fn.cells:
+                        args[i] = Cell(args[i])
+                    frames.append((closure, ins, free, local, ip))
+                    closure = callee
+                    ins = fn.instructions
+                    free = callee.free
+                    local = args
+                    ip = 0
+                elif type(callee) is Builtin:
+                    args = stack[len(stack) - num_args :]
+                    del stack[-1 - num_args :]
+                    result = callee.fn(*args)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                else:
+                    return Error(f"not a function: {callee.monkey_type}")
+            elif op == OP_RETURN_VALUE:
+                if not frames:
+                    return pop()
+                closure, ins, free, local, ip = frames.pop()
+            elif op == OP_GET_GLOBAL:
+                value = globals_[ins[ip + 1]]
+                if value is None:
+                    name = self.global_names[ins[ip + 1]]
+                    return Error(f"identifier not found: {name}")
+                push(value)
+                ip += 2
+            elif op == OP_GET_FREE:
+                value = free[ins[ip + 1]].value
+                if value is not None:
+                    push(value)
+                    ip += 2
+                elif ip in closure.fn.fallbacks:
+                    ip = closure.fn.fallbacks[ip]
+                else:
+                    name = closure.fn.free_names[ins[ip + 1]]
+                    return Error(f"identifier not found: {name}")
+            elif op == OP_GET_CELL:
+                value = local[ins[ip + 1]].value
+                if value is not None:
+                    push(value)
+                    ip += 2
+                elif ip in closure.fn.fallbacks:
+                    ip = closure.fn.fallbacks[ip]
+                else:
+                    name = closure.fn.local_names[ins[ip + 1]]
+                    return Error(f"identifier not found: {name}")
+            elif op == OP_SET_CELL:
+                local[ins[ip + 1]].value = pop()
+                ip += 2
+            elif op == OP_GET_FREE_CELL:
+                push(free[ins[ip + 1]])
+                ip += 2
+            elif op == OP_GET_BUILTIN:
+                index = shadowed[ins[ip + 1]]
+                value = None if index is None else globals_[index]
+                push(BUILTIN_FUNCTIONS[ins[ip + 1]] if value is None else value)
+                ip += 2
+            elif op == OP_POP:
+                last = pop()
+                ip += 1
+            elif op == OP_JUMP:
+                ip = ins[ip + 1]
+            elif op == OP_SET_LOCAL:
+                local[ins[ip + 1]] = pop()
+                ip += 2
+            elif op == OP_SET_GLOBAL:
+                last = pop()
+                globals_[ins[ip + 1]] = last
+                ip += 2
+            elif op == OP_TRUE:
+                push(TRUE)
+                ip += 1
+            elif op == OP_FALSE:
+                push(FALSE)
+                ip += 1
+            elif op == OP_NULL:
+                push(NULL)
+                ip += 1
+            elif op == OP_GREATER_THAN:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(TRUE if left.value > right.value else FALSE)
+                else:
+                    result = eval_infix_expression(">", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_NOT_EQUAL:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(TRUE if left.value != right.value else FALSE)
+                else:
+                    result = eval_infix_expression("!=", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_MUL:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(integer(left.value * right.value))
+                else:
+                    result = eval_infix_expression("*", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_DIV:
+                right = pop()
+                left = pop()
+                if type(left) is Integer and type(right) is Integer:
+                    push(integer(left.value // right.value))
+                else:
+                    result = eval_infix_expression("/", left, right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_MINUS:
+                right = pop()
+                if type(right) is Integer:
+                    push(integer(-right.value))
+                else:
+                    result = eval_prefix_expression("-", right)
+                    if type(result) is Error:
+                        return result
+                    push(result)
+                ip += 1
+            elif op == OP_BANG:
+                right = pop()
+                push(TRUE if right is FALSE or right is NULL else FALSE)
+                ip += 1
+            elif op == OP_INDEX:
+                index = pop()
+                left = pop()
+                result = eval_index_expression(left, index)
+                if type(result) is Error:
+                    return result
+                push(result)
+                ip += 1
+            elif op == OP_ARRAY:
+                num_elements = ins[ip + 1]
+                elements = stack[len(stack) - num_elements :]
+                del stack[len(stack) - num_elements :]
+                push(Array(elements))
+                ip += 2
+            elif op == OP_HASH:
+                num_items = ins[ip + 1]
+                items = stack[len(stack) - num_items :]
+                del stack[len(stack) - num_items :]
+                result = _build_hash(items)
+                if type(result) is Error:
+                    return result
+                push(result)
+                ip += 2
+            elif op == OP_CLOSURE:
+                fn = constants[ins[ip + 1]]
+                num_free = ins[ip + 2]
+                captured = stack[len(stack) - num_free :]
+                del stack[len(stack) - num_free :]
+                push(Closure(fn, captured))
+                ip += 3
+            else:
+                raise RuntimeError(f"unknown opcode {op}")
+
+        return last
+
+
+def _build_hash(items: list[MonkeyObject]) -> MonkeyObject:
+    pairs: dict[HashKey, HashPair] = {}
+    for i in range(0, len(items), 2):
+        key, value = items[i], items[i + 1]
+        if not isinstance(key, Hashable):
+            return Error(f"unusable as hash key: {key.monkey_type}")
+        pairs[key.hash_key()] = HashPair(key, value)
+    return Hash(pairs)
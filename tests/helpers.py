@@ -0,0 +1,13 @@
+from monkey import ast
+from monkey.lexer import Lexer
+from monkey.mobj import Integer, MonkeyObject
+from monkey.parser import Parser
+
+
+def parse(input: str) -> ast.Program:
+    return Parser(Lexer(input)).parse_program()
+
+
+def check_integer_object(obj: MonkeyObject, expected: int) -> None:
+    assert isinstance(obj, Integer)
+    assert obj.value == expected
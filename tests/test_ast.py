@@ -1,4 +1,6 @@
 from monkey import ast
+from monkey.lexer import Lexer
+from monkey.parser import Parser
 from monkey.token import Token, TokenType
 
 
@@ -20,3 +22,24 @@ def test_string() -> None:
     )
 
     assert str(program) == "let myVar = anotherVar;"
+
+
+def test_nodes_have_no_instance_dict() -> None:
+    program = Parser(
+        Lexer('let f = fn(x) { if (x < 1) { return [x, "a", {1: true}][0] } -x }; f(1)')
+    ).parse_program()
+    nodes: list[object] = [program]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, ast.Node):
+            assert not hasattr(node, "__dict__")
+            for cls in type(node).__mro__:
+                nodes.extend(
+                    getattr(node, name)
+                    for name in getattr(cls, "__slots__", ())
+                    if hasattr(node, name)
+                )
+        elif isinstance(node, list):
+            nodes.extend(node)
+        elif isinstance(node, dict):
+            nodes.extend([*node.keys(), *node.values()])
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import pytest
+from monkey.cli import cli, run_file
+
+
+def test_run_file(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    script = tmp_path / "script.mk"
+    script.write_text("let day = 60 * 60 * 24; puts(day * 2);")
+
+    assert run_file(str(script)) == 0
+    assert capsys.readouterr().out == "172800\n"
+
+
+def test_run_file_reports_errors(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    script = tmp_path / "script.mk"
+    script.write_text("let x = 1 + true; puts(x);")
+
+    with pytest.raises(SystemExit) as exit:
+        cli([str(script), "--no-optimize"])
+
+    assert exit.value.code == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == "Error: type mismatch: INTEGER + BOOLEAN\n"
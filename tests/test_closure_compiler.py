@@ -0,0 +1,28 @@
+from monkey.closure_compiler import closure_eval, compile_node
+from monkey.environment import Environment
+from monkey.mobj import Error, Function
+
+from tests.helpers import check_integer_object, parse
+
+
+def test_compiled_program_can_run_many_times() -> None:
+    compiled = compile_node(parse("let a = 2; a * 3"))
+
+    check_integer_object(compiled(Environment()), 6)
+    check_integer_object(compiled(Environment()), 6)
+
+
+def test_function_carries_compiled_body() -> None:
+    function = closure_eval(parse("fn(x) { x + 2; };"), Environment())
+
+    assert isinstance(function, Function)
+    assert function.literal is not None
+    assert function.literal.compiled is not None
+    assert str(function.body) == "(x + 2)"
+
+
+def test_unknown_operator_on_integers() -> None:
+    evaluated = closure_eval(parse("-true"), Environment())
+
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "unknown operator: -BOOLEAN"
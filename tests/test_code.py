@@ -0,0 +1,40 @@
+import pytest
+from monkey.code import (OP_ADD, OP_CLOSURE, OP_CONSTANT, OP_GET_LOCAL,
+                         instructions_to_string, make)
+
+
+@pytest.mark.parametrize(
+    "op, operands, expected",
+    [
+        (OP_CONSTANT, [65534], [OP_CONSTANT, 65534]),
+        (OP_ADD, [], [OP_ADD]),
+        (OP_GET_LOCAL, [255], [OP_GET_LOCAL, 255]),
+        (OP_CLOSURE, [65534, 255], [OP_CLOSURE, 65534, 255]),
+    ],
+)
+def test_make(op: int, operands: list[int], expected: list[int]) -> None:
+    assert make(op, *operands) == expected
+
+
+def test_make_wrong_operand_count() -> None:
+    with pytest.raises(ValueError):
+        make(OP_CONSTANT)
+
+
+def test_instructions_string() -> None:
+    instructions = [
+        *make(OP_ADD),
+        *make(OP_GET_LOCAL, 1),
+        *make(OP_CONSTANT, 2),
+        *make(OP_CONSTANT, 65535),
+        *make(OP_CLOSURE, 65535, 255),
+    ]
+
+    expected = """0000 OpAdd
+0001 OpGetLocal 1
+0003 OpConstant 2
+0005 OpConstant 65535
+0007 OpClosure 65535 255
+"""
+
+    assert instructions_to_string(instructions) == expected
@@ -0,0 +1,170 @@
+from typing import Any
+
+import pytest
+from monkey.code import (OP_ADD, OP_ARRAY, OP_CALL, OP_CLOSURE, OP_CONSTANT,
+                         OP_GET_BUILTIN, OP_GET_FREE, OP_GET_GLOBAL,
+                         OP_GET_LOCAL, OP_JUMP, OP_JUMP_NOT_TRUTHY,
+                         OP_LESS_THAN, OP_NULL, OP_POP, OP_RETURN_VALUE,
+                         OP_SET_GLOBAL, OP_SUB, OP_TRUE,
+                         instructions_to_string, make)
+from monkey.compiler import Compiler
+from monkey.lexer import Lexer
+from monkey.mobj import CompiledFunction, Integer, MonkeyObject, String
+from monkey.parser import Parser
+
+
+def _compile(input: str) -> Compiler:
+    program = Parser(Lexer(input)).parse_program()
+    compiler = Compiler()
+    compiler.compile(program)
+    return compiler
+
+
+def _concat(*instructions: list[int]) -> list[int]:
+    return [op for ins in instructions for op in ins]
+
+
+def _test_constants(actual: list[MonkeyObject], expected: list[Any]) -> None:
+    assert len(actual) == len(expected)
+    for obj, value in zip(actual, expected):
+        if isinstance(value, list):
+            assert isinstance(obj, CompiledFunction)
+            assert instructions_to_string(obj.instructions) == (
+                instructions_to_string(_concat(*value))
+            )
+        elif isinstance(value, str):
+            assert isinstance(obj, String)
+            assert obj.value == value
+        else:
+            assert isinstance(obj, Integer)
+            assert obj.value == value
+
+
+@pytest.mark.parametrize(
+    "input, expected_constants, expected_instructions",
+    [
+        (
+            "1 + 2",
+            [1, 2],
+            [
+                make(OP_CONSTANT, 0),
+                make(OP_CONSTANT, 1),
+                make(OP_ADD),
+                make(OP_POP),
+            ],
+        ),
+        (
+            "2 < 1",
+            [2, 1],
+            [
+                make(OP_CONSTANT, 0),
+                make(OP_CONSTANT, 1),
+                make(OP_LESS_THAN),
+                make(OP_POP),
+            ],
+        ),
+        (
+            "if (true) { 10 }; 3333;",
+            [10, 3333],
+            [
+                make(OP_TRUE),
+                make(OP_JUMP_NOT_TRUTHY, 7),
+                make(OP_CONSTANT, 0),
+                make(OP_JUMP, 8),
+                make(OP_NULL),
+                make(OP_POP),
+                make(OP_CONSTANT, 1),
+                make(OP_POP),
+            ],
+        ),
+        (
+            'let one = 1; let two = "two"; one;',
+            [1, "two"],
+            [
+                make(OP_CONSTANT, 0),
+                make(OP_SET_GLOBAL, 0),
+                make(OP_CONSTANT, 1),
+                make(OP_SET_GLOBAL, 1),
+                make(OP_GET_GLOBAL, 0),
+                make(OP_POP),
+            ],
+        ),
+        (
+            "len([])",
+            [],
+            [
+                make(OP_GET_BUILTIN, 0),
+                make(OP_ARRAY, 0),
+                make(OP_CALL, 1),
+                make(OP_POP),
+            ],
+        ),
+    ],
+)
+def test_compile(
+    input: str, expected_constants: list[Any], expected_instructions: list[list[int]]
+) -> None:
+    compiler = _compile(input)
+    bytecode = compiler.bytecode()
+    assert instructions_to_string(bytecode.instructions) == instructions_to_string(
+        _concat(*expected_instructions)
+    )
+    _test_constants(bytecode.constants, expected_constants)
+
+
+def test_closures() -> None:
+    compiler = _compile("fn(a) { fn(b) { a + b } }")
+    bytecode = compiler.bytecode()
+
+    _test_constants(
+        bytecode.constants,
+        [
+            [
+                make(OP_GET_FREE, 0),
+                make(OP_GET_LOCAL, 0),
+                make(OP_ADD),
+                make(OP_RETURN_VALUE),
+                make(OP_GET_GLOBAL, 0),
+                make(OP_JUMP, 2),
+                make(OP_GET_GLOBAL, 1),
+                make(OP_JUMP, 4),
+            ],
+            [
+                make(OP_GET_LOCAL, 0),
+                make(OP_CLOSURE, 0, 1),
+                make(OP_RETURN_VALUE),
+            ],
+        ],
+    )
+    assert bytecode.instructions == _concat(make(OP_CLOSURE, 1, 0), make(OP_POP))
+    assert bytecode.global_names == ["a", "b"]
+
+
+def test_recursive_function() -> None:
+    compiler = _compile("let countDown = fn(x) { countDown(x - 1); };")
+    bytecode = compiler.bytecode()
+
+    _test_constants(
+        bytecode.constants,
+        [
+            1,
+            [
+                make(OP_GET_GLOBAL, 0),
+                make(OP_GET_LOCAL, 0),
+                make(OP_CONSTANT, 0),
+                make(OP_SUB),
+                make(OP_CALL, 1),
+                make(OP_RETURN_VALUE),
+                make(OP_GET_GLOBAL, 1),
+                make(OP_JUMP, 4),
+            ],
+        ],
+    )
+
+
+def test_unknown_identifier_becomes_global() -> None:
+    compiler = _compile("foobar")
+    bytecode = compiler.bytecode()
+
+    assert bytecode.instructions == _concat(make(OP_GET_GLOBAL, 0), make(OP_POP))
+    assert bytecode.global_names == ["foobar"]
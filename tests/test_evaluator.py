@@ -1,25 +1,100 @@
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import pytest
+from monkey import ast, evaluator
+from monkey.closure_compiler import closure_eval
+from monkey.compiler import Compiler
 from monkey.environment import Environment
 from monkey.evaluator import monkey_eval
 from monkey.lexer import Lexer
 from monkey.mobj import (FALSE, NULL, TRUE, Array, Error, Function, Hash,
                          HashPair, Integer, MonkeyObject, String)
+from monkey.optimizer import optimize
 from monkey.parser import Parser
+from monkey.raising_evaluator import raising_eval
+from monkey.stack_evaluator import stack_eval
+from monkey.transpiler import transpile_eval
+from monkey.vm import VM
 
+from tests.helpers import check_integer_object, parse
 
-def _test_eval(input: str) -> MonkeyObject:
+
+def _run_tree_walker(program: ast.Program) -> MonkeyObject:
+    return monkey_eval(program, Environment())
+
+
+def _run_optimized(program: ast.Program) -> MonkeyObject:
+    return monkey_eval(optimize(program), Environment())
+
+
+def _run_closure_compiler(program: ast.Program) -> MonkeyObject:
+    return closure_eval(program, Environment())
+
+
+def _run_stack_evaluator(program: ast.Program) -> MonkeyObject:
+    return stack_eval(program, Environment())
+
+
+def _run_raising_evaluator(program: ast.Program) -> MonkeyObject:
+    return raising_eval(program, Environment())
+
+
+def _run_transpiler(program: ast.Program) -> MonkeyObject:
+    return transpile_eval(program)
+
+
+def _run_vm(program: ast.Program) -> MonkeyObject:
+    compiler = Compiler()
+    compiler.compile(program)
+    return VM(compiler.bytecode()).run()
+
+
+Engine = Callable[[ast.Program], MonkeyObject]
+
+ENGINES: dict[str, Engine] = {
+    "eval": _run_tree_walker,
+    "optimized": _run_optimized,
+    "closure": _run_closure_compiler,
+    "stack": _run_stack_evaluator,
+    "raising": _run_raising_evaluator,
+    "transpiler": _run_transpiler,
+    "vm": _run_vm,
+}
+
+
+@pytest.fixture(params=list(ENGINES))
+def engine(request: pytest.FixtureRequest) -> Engine:
+    return ENGINES[request.param]
+
+
+SharedEnvEngine = Callable[[ast.Program, Environment], MonkeyObject]
+
+
+@pytest.mark.parametrize(
+    "shared_eval",
+    [closure_eval, stack_eval, raising_eval],
+    ids=["closure", "stack", "raising"],
+)
+def test_functions_are_shared_with_tree_walker(
+    shared_eval: SharedEnvEngine,
+) -> None:
+    env = Environment()
+    monkey_eval(parse("let double = fn(x) { return x * 2; };"), env)
+    shared_eval(parse("let quadruple = fn(x) { double(double(x)) };"), env)
+
+    check_integer_object(monkey_eval(parse("quadruple(3)"), env), 12)
+    check_integer_object(shared_eval(parse("quadruple(4)"), env), 16)
+
+
+def _test_eval(input: str, engine: Engine = _run_tree_walker) -> MonkeyObject:
     lexer = Lexer(input)
     parser = Parser(lexer)
     program = parser.parse_program()
-    env = Environment()
-    return monkey_eval(program, env)
+    return engine(program)
 
 
-def _test_integer_object(obj: MonkeyObject, expected: int) -> None:
-    assert isinstance(obj, Integer)
-    assert obj.value == expected
+def _test_eval_in(env: Environment, input: str) -> MonkeyObject:
+    return monkey_eval(Parser(Lexer(input)).parse_program(), env)
 
 
 def _test_boolean_object(obj: MonkeyObject, expected: bool) -> None:
@@ -54,9 +129,9 @@ def _test_null_object(obj: MonkeyObject) -> None:
         ("5 / 2", 2),
     ],
 )
-def test_eval_integer_expression(input: str, expected: int) -> None:
-    evaluated = _test_eval(input)
-    _test_integer_object(evaluated, expected)
+def test_eval_integer_expression(input: str, expected: int, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
+    check_integer_object(evaluated, expected)
 
 
 @pytest.mark.parametrize(
@@ -81,10 +156,28 @@ def test_eval_integer_expression(input: str, expected: int) -> None:
         ("(1 < 2) == false", False),
         ("(1 > 2) == true", False),
         ("(1 > 2) == false", True),
+        ('"a" == "a"', True),
+        ('"a" != "a"', False),
+        ('"a" == "b"', False),
+        ('"a" != "b"', True),
+        ('"a" + "b" == "ab"', True),
+        ('let s = "x"; s == s', True),
+        ("[1, [2, 3]] == [1, [2, 3]]", True),
+        ("[1, [2, 3]] != [1, [2, 3]]", False),
+        ("[1, 2] == [1, 2, 3]", False),
+        ("[1, true] == [1, 1]", False),
+        ("let a = [1, 2]; a == a", True),
+        ("push([1], 2) == [1, 2]", True),
+        ("rest([0, 1, 2]) == [1, 2]", True),
+        ('{"a": [1], 2: "b"} == {2: "b", "a": [1]}', True),
+        ('{"a": 1} == {"a": 2}', False),
+        ('{"a": 1} != {"b": 1}', True),
+        ("let f = fn() { 1 }; [f] == [f]", True),
+        ("[fn() { 1 }] == [fn() { 1 }]", False),
     ],
 )
-def test_eval_boolean_expression(input: str, expected: bool) -> None:
-    evaluated = _test_eval(input)
+def test_eval_boolean_expression(input: str, expected: bool, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
     _test_boolean_object(evaluated, expected)
 
 
@@ -99,8 +192,8 @@ def test_eval_boolean_expression(input: str, expected: bool) -> None:
         ("!!5", True),
     ],
 )
-def test_bang_operator(input: str, expected: bool) -> None:
-    evaluated = _test_eval(input)
+def test_bang_operator(input: str, expected: bool, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
     _test_boolean_object(evaluated, expected)
 
 
@@ -116,10 +209,12 @@ def test_bang_operator(input: str, expected: bool) -> None:
         ("if (1 < 2) { 10 } else { 20 }", 10),
     ],
 )
-def test_if_else_expressions(input: str, expected: Optional[int]) -> None:
-    evaluated = _test_eval(input)
+def test_if_else_expressions(
+    input: str, expected: Optional[int], engine: Engine
+) -> None:
+    evaluated = _test_eval(input, engine)
     if isinstance(expected, int):
-        _test_integer_object(evaluated, expected)
+        check_integer_object(evaluated, expected)
     else:
         _test_null_object(evaluated)
 
@@ -137,9 +232,9 @@ def test_if_else_expressions(input: str, expected: Optional[int]) -> None:
         ),
     ],
 )
-def test_return_statements(input: str, expected: int) -> None:
-    evaluated = _test_eval(input)
-    _test_integer_object(evaluated, expected)
+def test_return_statements(input: str, expected: int, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
+    check_integer_object(evaluated, expected)
 
 
 @pytest.mark.parametrize(
@@ -187,8 +282,8 @@ def test_return_statements(input: str, expected: int) -> None:
         ),
     ],
 )
-def test_error_handling(input: str, expected_message: str) -> None:
-    evaluated = _test_eval(input)
+def test_error_handling(input: str, expected_message: str, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
     assert isinstance(evaluated, Error)
     assert evaluated.message == expected_message
 
@@ -202,8 +297,8 @@ def test_error_handling(input: str, expected_message: str) -> None:
         ("let a = 5; let b = a; let c = a + b + 5; c;", 15),
     ],
 )
-def test_let_statements(input: str, expected: int) -> None:
-    _test_integer_object(_test_eval(input), expected)
+def test_let_statements(input: str, expected: int, engine: Engine) -> None:
+    check_integer_object(_test_eval(input, engine), expected)
 
 
 def test_function_object() -> None:
@@ -228,11 +323,11 @@ def test_function_object() -> None:
         ("fn(x) { x; }(5)", 5),
     ],
 )
-def test_function_application(input: str, expected: int) -> None:
-    _test_integer_object(_test_eval(input), expected)
+def test_function_application(input: str, expected: int, engine: Engine) -> None:
+    check_integer_object(_test_eval(input, engine), expected)
 
 
-def test_closures() -> None:
+def test_closures(engine: Engine) -> None:
     input = """
     let newAdder = fn(x) {
         fn(y) { x + y };
@@ -242,20 +337,117 @@ def test_closures() -> None:
     addTwo(2);
     """
 
-    _test_integer_object(_test_eval(input), 4)
+    check_integer_object(_test_eval(input, engine), 4)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let f = fn() { g() }; let g = fn() { 3 }; f();", 3),
+        ("let f = fn(n) { let a = n; fn(b) { fn(c) { a + b + c } } }; f(1)(2)(3);", 6),
+        ("fn() { let x = 1; let g = fn() { x }; let x = 2; g() }();", 2),
+        (
+            "fn() {"
+            "  let ev = fn(n) { if (n == 0) { true } else { od(n - 1) } };"
+            "  let od = fn(n) { if (n == 0) { false } else { ev(n - 1) } };"
+            "  if (ev(10)) { 1 } else { 0 }"
+            "}();",
+            1,
+        ),
+        ('let f = fn(x) { len(x) }; let len = fn(x) { 42 }; f("abc");', 42),
+    ],
+)
+def test_lexical_scoping(input: str, expected: int, engine: Engine) -> None:
+    check_integer_object(_test_eval(input, engine), expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let x = 1; let f = fn() { let x = x + 1; x }; f() + x;", 3),
+        ("let f = fn(x) { fn() { let x = x * 2; x } }; f(5)();", 10),
+        ("let f = fn(x) { let g = fn() { h() }; let h = fn() { x }; g() }; f(7);", 7),
+        ("let f = fn() { let x = 1; let g = fn() { x }; let x = 2; g() }; f();", 2),
+        ("let x = 1; let f = fn() { let x = x + 1; x }; f();", 2),
+        ("let y = 10; let f = fn(c) { if (c) { let y = 5; } y }; f(false);", 10),
+        ("let x = 10; fn() { let g = fn() { x }; let r = g(); let x = 2; r }();", 10),
+    ],
+)
+def test_resolved_scoping(input: str, expected: int, engine: Engine) -> None:
+    check_integer_object(_test_eval(input, engine), expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        (
+            "let loop = fn(n, acc) { if (n == 0) { acc } else { loop(n - 1, acc + 1) } };"
+            "loop(10000, 0);",
+            10000,
+        ),
+        (
+            "let loop = fn(n) { if (n == 0) { return 0; } let m = n - 1; return loop(m); };"
+            "loop(10000);",
+            0,
+        ),
+        (
+            "let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } };"
+            "let odd = fn(n) { if (n == 0) { false } else { even(n - 1) } };"
+            "if (even(10001)) { 1 } else { 2 };",
+            2,
+        ),
+        (
+            "let last = fn(n) { if (n == 0) { len } else { last(n - 1) } }; last(1)([1]);",
+            1,
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "engine",
+    [
+        _run_tree_walker,
+        _run_closure_compiler,
+        _run_stack_evaluator,
+        _run_raising_evaluator,
+    ],
+)
+def test_tail_calls_run_in_constant_stack(
+    input: str, expected: int, engine: Engine
+) -> None:
+    check_integer_object(_test_eval(input, engine), expected)
+
+
+def test_closures_capture_only_free_variables() -> None:
+    input = """
+    let make = fn(n) {
+        let big = [n, n, n];
+        let small = n + 1;
+        fn() { small };
+    };
+    make(1);
+    """
+    env = Environment()
+    function = _test_eval_in(env, input)
+
+    assert isinstance(function, Function)
+    assert function.env is env
+    assert len(function.free) == 1
+    small = function.free[0].value
+    assert small is not None
+    check_integer_object(small, 2)
 
 
-def test_string_literal() -> None:
+def test_string_literal(engine: Engine) -> None:
     input = '"Hello, World!"'
-    string = _test_eval(input)
+    string = _test_eval(input, engine)
     assert isinstance(string, String)
     assert string.value == "Hello, World!"
 
 
-def test_string_concatenation() -> None:
+def test_string_concatenation(engine: Engine) -> None:
     input = '"Hello" + " " + "World!"'
 
-    evaluated = _test_eval(input)
+    evaluated = _test_eval(input, engine)
     assert isinstance(evaluated, String)
     assert evaluated.value == "Hello World!"
 
@@ -268,26 +460,83 @@ def test_string_concatenation() -> None:
         ('len("hello world")', 11),
         ("len(1)", "argument to `len` not supported, got INTEGER"),
         ('len("one", "two")', "wrong number of arguments. got=2, want=1"),
+        ("let a = [1, 2]; let b = push(a, 3); len(a)", 2),
+        ("let a = [1, 2]; let b = push(a, 3); let c = push(a, 4); b[2] + c[2]", 7),
+        ("let r = rest(rest([1, 2, 3])); first(r) + last(r) + len(r)", 7),
+        ("let r = rest([1, 2, 3]); let p = push(r, 4); len(r) + p[2]", 6),
+        (
+            """
+            let build = fn(n, acc) { if (n == 0) { acc } else { build(n - 1, push(acc, n)) } };
+            let sum = fn(arr, acc) {
+                if (len(arr) == 0) { acc } else { sum(rest(arr), acc + first(arr)) }
+            };
+            sum(build(100, []), 0)
+            """,
+            5050,
+        ),
+        ('let h = set({"a": 1}, "b", 2); h["a"] + h["b"]', 3),
+        ('let h = {"a": 1}; let g = set(h, "a", 5); h["a"] + g["a"]', 6),
+        ('len(keys(delete({"a": 1, "b": 2}, "a")))', 1),
+        ('values(delete({"a": 1, "b": 2}, "a"))[0]', 2),
+        (
+            'let m = merge({"a": 1, "b": 2}, {"b": 20, "c": 30}); m["a"] + m["b"] + m["c"]',
+            51,
+        ),
+        ('merge({"b": 2}, {"b": 20, "c": 30})["b"]', 20),
+        ("set(1, 2, 3)", "argument to `set` must be HASH, got INTEGER"),
+        ("set({}, fn(x) { x }, 1)", "unusable as hash key: FUNCTION"),
+        ("merge({}, [])", "argument to `merge` must be HASH, got ARRAY"),
+        ("keys({}, {})", "wrong number of arguments. got=2, want=1"),
+        ('index_of("hello", "l")', 2),
+        ('index_of("hello", "z")', -1),
+        ('len(substr("hello world", 6))', 5),
+        ('len(split("a,b,c", ","))', 3),
+        ('join([1], ",")', "elements of `join` must be STRING, got INTEGER"),
+        ('split(1, ",")', "argument to `split` must be STRING, got INTEGER"),
+        ('substr("abc", "1")', "argument to `substr` must be INTEGER, got STRING"),
+        ('format("{} {}", 1)', "wrong number of arguments to `format`. got=1, want=2"),
     ],
 )
-def test_builtin_functions(input: str, expected: Any) -> None:
-    evaluated = _test_eval(input)
+def test_builtin_functions(input: str, expected: Any, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
     if isinstance(expected, int):
-        _test_integer_object(evaluated, expected)
+        check_integer_object(evaluated, expected)
     else:
         assert isinstance(evaluated, Error)
         assert evaluated.message == expected
 
 
-def test_array_literals() -> None:
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ('join(split("a,b,,c", ","), "|")', "a|b||c"),
+        ('join(split("abc", ""), "-")', "a-b-c"),
+        ('split("a b", " ")[1]', "b"),
+        ('join([], ",")', ""),
+        ('substr("hello world", 6)', "world"),
+        ('substr("hello world", 0, 5)', "hello"),
+        ('substr("hello", 3, 10)', "lo"),
+        ('substr("hello", 9)', ""),
+        ('replace("a-b-c", "-", "+")', "a+b+c"),
+        ('format("{} + {} = {}", 1, 2, 1 + 2)', "1 + 2 = 3"),
+        ('format("{}: {}", "key", [1, "b"])', "key: [1, b]"),
+    ],
+)
+def test_string_builtins(input: str, expected: str, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
+    assert isinstance(evaluated, String)
+    assert evaluated.value == expected
+
+
+def test_array_literals(engine: Engine) -> None:
     input = "[1, 2 * 2, 3 + 3]"
 
-    evaluated = _test_eval(input)
+    evaluated = _test_eval(input, engine)
     assert isinstance(evaluated, Array)
     assert len(evaluated.elements) == 3
-    _test_integer_object(evaluated.elements[0], 1)
-    _test_integer_object(evaluated.elements[1], 4)
-    _test_integer_object(evaluated.elements[2], 6)
+    check_integer_object(evaluated.elements[0], 1)
+    check_integer_object(evaluated.elements[1], 4)
+    check_integer_object(evaluated.elements[2], 6)
 
 
 @pytest.mark.parametrize(
@@ -335,15 +584,15 @@ def test_array_literals() -> None:
         ),
     ],
 )
-def test_array_index_expressions(input: str, expected: Any) -> None:
-    evaluated = _test_eval(input)
+def test_array_index_expressions(input: str, expected: Any, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
     if isinstance(expected, int):
-        _test_integer_object(evaluated, expected)
+        check_integer_object(evaluated, expected)
     else:
         _test_null_object(evaluated)
 
 
-def test_hash_literals() -> None:
+def test_hash_literals(engine: Engine) -> None:
     input = """
     let two = "two";
     {
@@ -356,7 +605,7 @@ def test_hash_literals() -> None:
     }
     """
 
-    evaluated = _test_eval(input)
+    evaluated = _test_eval(input, engine)
     assert isinstance(evaluated, Hash)
     expected = {
         String("one").hash_key(): 1,
@@ -370,7 +619,7 @@ def test_hash_literals() -> None:
     for expected_key, expected_value in expected.items():
         pair = evaluated.pairs[expected_key]
         assert isinstance(pair, HashPair)
-        _test_integer_object(pair.value, expected_value)
+        check_integer_object(pair.value, expected_value)
 
 
 @pytest.mark.parametrize(
@@ -404,11 +653,182 @@ def test_hash_literals() -> None:
             "{false: 5}[false]",
             5,
         ),
+        (
+            "{[1, [2]]: 5}[[1, [2]]]",
+            5,
+        ),
+        (
+            "{[1, 2]: 5}[[2, 1]]",
+            None,
+        ),
+        (
+            '{[{"a": 1}]: 5}[[{"a": 1}]]',
+            5,
+        ),
+        (
+            "let seen = {}; let seen = set(seen, [1, 2], 5); seen[push([1], 2)]",
+            5,
+        ),
     ],
 )
-def test_hash_index_expressions(input: str, expected: Any) -> None:
-    evaluated = _test_eval(input)
+def test_hash_index_expressions(input: str, expected: Any, engine: Engine) -> None:
+    evaluated = _test_eval(input, engine)
     if isinstance(expected, int):
-        _test_integer_object(evaluated, expected)
+        check_integer_object(evaluated, expected)
     else:
         _test_null_object(evaluated)
+
+
+def test_hot_function_is_promoted(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(evaluator, "TIER_UP_THRESHOLD", 3)
+    program = Parser(
+        Lexer("let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };")
+    ).parse_program()
+    env = Environment()
+    monkey_eval(program, env)
+    fib = env.get("fib")
+    assert isinstance(fib, Function)
+    assert fib.literal is not None
+
+    check_integer_object(_test_eval_in(env, "fib(1)"), 1)
+    assert fib.literal.compiled is None
+
+    check_integer_object(_test_eval_in(env, "fib(10)"), 55)
+    assert fib.literal.compiled is not None
+    assert fib.calls == 4
+
+
+def test_tiering_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(evaluator, "TIER_UP_THRESHOLD", None)
+    env = Environment()
+    check_integer_object(
+        _test_eval_in(
+            env, "let f = fn(n) { if (n == 0) { 0 } else { f(n - 1) } }; f(50)"
+        ),
+        0,
+    )
+    f = env.get("f")
+    assert isinstance(f, Function)
+    assert f.literal is not None
+    assert f.literal.compiled is None
+    assert f.calls == 51
+
+
+def test_registered_operators(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(evaluator, "INFIX_OPERATORS", dict(evaluator.INFIX_OPERATORS))
+    monkeypatch.setattr(evaluator, "PREFIX_OPERATORS", dict(evaluator.PREFIX_OPERATORS))
+    evaluator.register_infix_operator(
+        "*", String, Integer, lambda left, right: String(left.value * right.value)
+    )
+    evaluator.register_prefix_operator("-", String, lambda right: right)
+
+    evaluated = _test_eval('-"ab" * 3')
+    assert isinstance(evaluated, String)
+    assert evaluated.value == "ababab"
+
+    evaluated = _test_eval('3 * "ab"')
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "type mismatch: INTEGER * STRING"
+
+
+def test_infix_type_feedback() -> None:
+    program = Parser(Lexer("let add = fn(a, b) { a + b };")).parse_program()
+    env = Environment()
+    monkey_eval(program, env)
+    let = program.statements[0]
+    assert isinstance(let, ast.LetStatement)
+    assert isinstance(let.value, ast.FunctionLiteral)
+    body = let.value.body.statements[0]
+    assert isinstance(body, ast.ExpressionStatement)
+    node = body.expression
+    assert isinstance(node, ast.InfixExpression)
+
+    check_integer_object(_test_eval_in(env, "add(1, 2)"), 3)
+    assert node.feedback is not None
+    assert node.feedback[:2] == (Integer, Integer)
+
+    evaluated = _test_eval_in(env, 'add("a", "b")')
+    assert isinstance(evaluated, String)
+    assert evaluated.value == "ab"
+    assert node.feedback is None
+    assert node.polymorphic
+
+    check_integer_object(_test_eval_in(env, "add(2, 2)"), 4)
+    evaluated = _test_eval_in(env, "add(1, true)")
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "type mismatch: INTEGER + BOOLEAN"
+
+
+@pytest.mark.parametrize("run", [monkey_eval, closure_eval, raising_eval])
+def test_global_inline_caches(
+    run: Callable[[ast.Node, Environment], MonkeyObject]
+) -> None:
+    env = Environment()
+    program = Parser(
+        Lexer("let size = fn(x) { len(x) }; size([1, 2]);")
+    ).parse_program()
+    check_integer_object(run(program, env), 2)
+    let = program.statements[0]
+    assert isinstance(let, ast.LetStatement)
+    assert isinstance(let.value, ast.FunctionLiteral)
+    body = let.value.body.statements[0]
+    assert isinstance(body, ast.ExpressionStatement)
+    call = body.expression
+    assert isinstance(call, ast.CallExpression)
+    assert isinstance(call.function, ast.Identifier)
+    assert call.function.cache == (env.version, evaluator.BUILTINS["len"])
+
+    call_size = Parser(Lexer("size([1, 2, 3])")).parse_program()
+    check_integer_object(run(call_size, env), 3)
+    run(Parser(Lexer("let len = fn(x) { 0 };")).parse_program(), env)
+    check_integer_object(run(call_size, env), 0)
+    assert isinstance(call.function.cache[1], Function)
+    check_integer_object(run(program, Environment()), 2)
+
+
+@pytest.mark.parametrize(
+    "engine",
+    [
+        _run_tree_walker,
+        _run_closure_compiler,
+        _run_stack_evaluator,
+        _run_raising_evaluator,
+        _run_vm,
+    ],
+)
+def test_literals_are_not_reallocated(engine: Engine) -> None:
+    program = Parser(Lexer('let f = fn() { [1000, "s"] }; [f(), f()]')).parse_program()
+    evaluated = engine(program)
+    assert isinstance(evaluated, Array)
+    first, second = evaluated.elements
+    assert isinstance(first, Array) and isinstance(second, Array)
+    assert first.elements[0].value == 1000
+    assert first.elements[0] is second.elements[0]
+    assert first.elements[1] is second.elements[1]
+
+
+def test_long_string_concatenation(engine: Engine) -> None:
+    input = """
+    let build = fn(n, acc) { if (n == 0) { acc } else { build(n - 1, acc + "0123456789") } };
+    let a = build(50, "");
+    let b = build(49, "") + "0123456789";
+    let h = {a: len(b)};
+    if (a == b) { h[b] } else { 0 }
+    """
+    check_integer_object(_test_eval(input, engine), 500)
+
+
+def test_deeply_nested_values_compare_without_recursion() -> None:
+    input = """
+    let build = fn(n, acc) { if (n == 0) { acc } else { build(n - 1, [acc]) } };
+    let x = build(5000, []);
+    let y = build(5000, []);
+    [x == y, {x: 1}[y], x != build(5000, [1]), [{"a": x}] == [{"a": y}]]
+    """
+    evaluated = _test_eval(input, _run_stack_evaluator)
+    assert isinstance(evaluated, Array)
+    same, found, different, nested = evaluated.elements
+    _test_boolean_object(same, True)
+    check_integer_object(found, 1)
+    _test_boolean_object(different, True)
+    _test_boolean_object(nested, True)
@@ -0,0 +1,71 @@
+import random
+
+from monkey.hamt import Map
+
+
+class Collider:
+    def __init__(self, name: str, hash: int):
+        self.name = name
+        self.hash = hash
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Collider) and self.name == other.name
+
+
+def test_set_get_delete_match_dict() -> None:
+    rng = random.Random(0)
+    expected: dict[int, int] = {}
+    result = Map()
+    for _ in range(5000):
+        key = rng.randrange(2000)
+        if rng.random() < 0.3:
+            expected.pop(key, None)
+            result = result.delete(key)
+        else:
+            expected[key] = key * 2
+            result = result.set(key, key * 2)
+        assert len(result) == len(expected)
+
+    assert dict(result.items()) == expected
+    assert set(result) == set(expected)
+    for key in range(2000):
+        assert result.get(key) == expected.get(key)
+        assert (key in result) == (key in expected)
+
+
+def test_updates_are_persistent() -> None:
+    versions = [Map()]
+    for i in range(200):
+        versions.append(versions[-1].set(i, i))
+    smaller = versions[-1].delete(7)
+
+    for size, version in enumerate(versions):
+        assert dict(version.items()) == {i: i for i in range(size)}
+    assert 7 not in smaller
+    assert 7 in versions[-1]
+
+
+def test_unchanged_updates_return_same_map() -> None:
+    value = object()
+    result = Map().set("a", value)
+
+    assert result.set("a", value) is result
+    assert result.delete("b") is result
+
+
+def test_full_hash_collisions() -> None:
+    a, b, c = Collider("a", 42), Collider("b", 42), Collider("c", 42 + (1 << 40))
+    result = Map().set(a, 1).set(b, 2).set(c, 3)
+
+    assert [result.get(key) for key in (a, b, c)] == [1, 2, 3]
+    assert result.get(Collider("d", 42)) is None
+    assert len(result) == 3
+
+    result = result.delete(a)
+    assert [result.get(key) for key in (a, b, c)] == [None, 2, 3]
+    result = result.delete(b).delete(c)
+    assert len(result) == 0
+    assert list(result) == []
@@ -1,5 +1,10 @@
-from monkey.lexer import Lexer
-from monkey.token import Token, TokenType
+import random
+from typing import Callable, Iterator, Union
+
+import pytest
+from monkey import lexer
+from monkey.lexer import CharLexer, Lexer, TokenStream, tokenize
+from monkey.token import EOF, Token, TokenType
 
 
 def test_next_token() -> None:
@@ -125,3 +130,74 @@ def test_next_token() -> None:
         token = lexer.next_token()
 
         assert token == expected_token, f"Token number {i}"
+
+
+def _random_inputs() -> Iterator[str]:
+    alphabet = list('ab_xz09=!+-*/<>,;:(){}[]" \t\n\r@#\x00') + [
+        "let ",
+        "fn",
+        "return",
+        "é",
+        "٣",
+        "²",
+        "\u00a0",
+        "→",
+    ]
+    rng = random.Random(0)
+    for _ in range(500):
+        yield "".join(rng.choice(alphabet) for _ in range(rng.randrange(40)))
+
+
+@pytest.mark.parametrize("scanner", [Lexer, tokenize])
+def test_scanners_match_char_lexer(
+    scanner: Callable[[str], Union[Lexer, TokenStream]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lexer, "CHUNK_SIZE", 4)
+    for input in _random_inputs():
+        expected, actual = CharLexer(input), scanner(input)
+        for _ in range(100):
+            token = expected.next_token()
+            assert actual.next_token() == token, repr(input)
+            if token.type is TokenType.ILLEGAL:
+                break
+            if token.type is TokenType.EOF and expected.position >= len(input):
+                assert actual.next_token() == token
+                break
+
+
+def test_lexer_skips_illegal_characters() -> None:
+    assert list(Lexer("a @ b \n")) == [
+        Token(TokenType.IDENT, "a"),
+        Token(TokenType.ILLEGAL, "@"),
+        Token(TokenType.IDENT, "b"),
+    ]
+
+
+def test_token_stream_offsets() -> None:
+    source = 'let name = "monkey";\n  puts(name, 10)'
+    stream = tokenize(source)
+
+    assert stream.types.itemsize == 1
+    assert [stream.type(i) for i in range(4)] == [
+        TokenType.LET,
+        TokenType.IDENT,
+        TokenType.ASSIGN,
+        TokenType.STRING,
+    ]
+    assert (stream.starts[3], stream.ends[3]) == (11, 19)
+    assert stream.literal(3) == "monkey"
+    assert stream.token(9) == Token(TokenType.INT, "10")
+    assert stream.location(5) == (2, 3)
+    assert stream.type(len(stream) - 1) is TokenType.EOF
+    assert stream.starts[len(stream) - 1] == len(source)
+
+
+def test_token_stream_spans_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lexer, "CHUNK_SIZE", 8)
+    source = 'let long_identifier = "a string longer than a chunk" == 12345;'
+    stream = tokenize(source)
+    tokens = list(iter(stream.next_token, EOF))
+
+    assert tokens == list(Lexer(source))
+    assert tokens[3] == Token(TokenType.STRING, "a string longer than a chunk")
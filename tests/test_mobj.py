@@ -1,4 +1,8 @@
-from monkey.mobj import String
+import gc
+
+from monkey.mobj import (INTERNED_STRINGS, NULL, TRUE, Array, Error, Hash,
+                         HashPair, Integer, String, concat, equals, integer,
+                         intern_string, substring)
 
 
 def test_string_hash_key() -> None:
@@ -10,3 +14,104 @@ def test_string_hash_key() -> None:
     assert hello1.hash_key() == hello2.hash_key()
     assert diff1.hash_key() == diff2.hash_key()
     assert hello1.hash_key() != diff1.hash_key()
+
+
+def test_hash_keys_are_cached() -> None:
+    hello = String("Hello World")
+    assert hello.hash_key() is hello.hash_key()
+    assert integer(7).hash_key() is integer(7).hash_key()
+    assert TRUE.hash_key() != Integer(1).hash_key()
+
+
+def test_string_hash_keys_survive_hash_collisions() -> None:
+    class Colliding(str):
+        def __hash__(self) -> int:
+            return 1
+
+    first = String(Colliding("first"))
+    second = String(Colliding("second"))
+
+    assert hash(first.hash_key()) == hash(second.hash_key())
+    assert first.hash_key() != second.hash_key()
+    assert first.hash_key() == String(Colliding("first")).hash_key()
+
+
+def test_small_integers_are_cached() -> None:
+    assert integer(-5) is integer(-5)
+    assert integer(256) is integer(256)
+    assert integer(257) is not integer(257)
+    assert integer(257).value == 257
+    assert type(integer(0)) is Integer
+
+
+def test_interned_strings() -> None:
+    assert intern_string("monkey") is intern_string("mon" + "key".lower())
+    assert intern_string("monkey") is not String("monkey")
+
+
+def test_interned_strings_are_released() -> None:
+    string = intern_string("transient")
+    assert INTERNED_STRINGS["transient"] is string
+    del string
+    gc.collect()
+    assert "transient" not in INTERNED_STRINGS
+
+
+def test_objects_have_no_instance_dict() -> None:
+    objects = [
+        TRUE,
+        NULL,
+        Integer(1000),
+        String("a"),
+        Array([]),
+        HashPair(String("a"), NULL),
+        Hash({}),
+        Error("message"),
+    ]
+    for obj in objects:
+        assert not hasattr(obj, "__dict__")
+
+
+def test_concat_builds_lazy_ropes() -> None:
+    short = concat(String("ab"), String("cd"))
+    assert short.flat == "abcd"
+
+    piece = String("0123456789")
+    rope = String("")
+    for _ in range(100_000):
+        rope = concat(rope, piece)
+
+    assert rope.flat is None
+    assert rope.length == 1_000_000
+    assert rope.value == "0123456789" * 100_000
+    assert rope.flat is not None and rope.parts is None
+    assert rope.hash_key() == String("0123456789" * 100_000).hash_key()
+
+
+def test_long_substrings_share_the_parent_buffer() -> None:
+    text = "x" * 300 + "needle" + "y" * 300
+    parent = String(text)
+
+    short = substring(parent, 300, 306)
+    assert short.flat == "needle"
+
+    view = substring(parent, 1, 601)
+    assert view.flat is None and view.parts is None
+    assert view.buffer() == (text, 1)
+    assert substring(view, 299, 305).value == "needle"
+    assert concat(view, view).value == text[1:601] * 2
+    assert view.value == text[1:601]
+    assert view.view is None
+    assert substring(parent, 0, len(text)) is parent
+
+
+def test_array_hash_keys_are_structural_and_cached() -> None:
+    array = Array([integer(1), Array([String("a")])])
+    same = Array([integer(1), Array([String("a")])])
+
+    assert array.hash_key() is array.hash_key()
+    assert array.hash_key() == same.hash_key()
+    assert array.hash_key() != Array([integer(1), Array([String("b")])]).hash_key()
+    assert Array([TRUE]).hash_key() != Array([integer(1)]).hash_key()
+    assert equals(array, same)
+    assert not equals(array, Array([integer(1)]))
@@ -0,0 +1,178 @@
+import pytest
+from monkey.environment import Environment
+from monkey.evaluator import monkey_eval
+from monkey.mobj import Error, Integer
+from monkey.optimizer import optimize
+
+from tests.helpers import parse
+
+
+def _optimize(input: str) -> str:
+    return str(optimize(parse(input)))
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("60 * 60 * 24", "86400"),
+        ("1 + 2 * 3 - -4", "11"),
+        ("10 / 3", "3"),
+        ("1 < 2", "true"),
+        ("1 == 2", "false"),
+        ("!true", "false"),
+        ("!5", "false"),
+        ("true == true", "true"),
+        ('"foo" + "bar"', "foobar"),
+        ("x + 2 * 3", "(x + 6)"),
+        ("fn(x) { x * (2 + 3) }", "fn(x)(x * 5)"),
+        ("[1 + 1, 2 * 2]", "[2, 4]"),
+    ],
+)
+def test_constant_folding(input: str, expected: str) -> None:
+    assert _optimize(input) == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("1 / 0", "(1 / 0)"),
+        ("1 + true", "(1 + true)"),
+        ("-true", "(-true)"),
+        ('"a" - "b"', "(a - b)"),
+    ],
+)
+def test_errors_are_not_folded(input: str, expected: str) -> None:
+    assert _optimize(input) == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("if (true) { 1 } else { 2 }", "1"),
+        ("if (1 > 2) { 1 } else { 2 }", "2"),
+        ("if (0) { x }", "x"),
+        ("if (false) { x }; y", "y"),
+        ("if (false) { x }", "if (false) { x }"),
+        ("if (true) { let a = 1; a }; a", "let a = 1; a; a"),
+        (
+            "let f = fn() { if (true) { return 1; } 2 }; f()",
+            "let f = fn() { return 1; 2 }; f()",
+        ),
+        (
+            "let x = if (true) { puts(1); 2 } else { 3 }; x",
+            "let x = if (true) { puts(1); 2 } else { 3 }; x",
+        ),
+    ],
+)
+def test_constant_conditions(input: str, expected: str) -> None:
+    assert _optimize(input) == str(parse(expected))
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let a = 1; let b = 2; b", "let b = 2; b"),
+        ("let f = fn() { g() }; let g = fn() { 1 }; 2", "2"),
+        ("let a = [1, {2: 3}]; 4", "4"),
+        ("let a = x; 4", "let a = x; 4"),
+        ("let a = 1 / 0; 4", "let a = 1 / 0; 4"),
+        ("let a = {[]: 1}; 4", "let a = {[]: 1}; 4"),
+        ("let a = 1;", "let a = 1;"),
+        ("fn() { let a = 1; let b = 2; a }", "fn() { let a = 1; a }"),
+    ],
+)
+def test_unused_lets_are_pruned(input: str, expected: str) -> None:
+    assert _optimize(input) == str(parse(expected))
+
+
+def test_optimized_program_evaluates_the_same() -> None:
+    input = """
+    let day = 60 * 60 * 24;
+    let unused = fn(x) { x };
+    let scale = fn(x) { if (true) { x * day } else { 0 } };
+    scale(2) + if (1 < 2) { 1 } else { 2 };
+    """
+    expected = monkey_eval(parse(input), Environment())
+    evaluated = monkey_eval(optimize(parse(input)), Environment())
+
+    assert isinstance(expected, Integer)
+    assert isinstance(evaluated, Integer)
+    assert evaluated.value == expected.value == 172801
+
+
+def test_optimized_errors_are_unchanged() -> None:
+    input = 'let a = 5 + "x"; a'
+    evaluated = monkey_eval(optimize(parse(input)), Environment())
+
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "type mismatch: INTEGER + STRING"
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let inc = fn(x) { x + 1 }; inc(y)", "(y + 1)"),
+        ("let inc = fn(x) { x + 1 }; inc(2)", "3"),
+        ("let add = fn(a, b) { a + b }; add(f(), g())", "(f() + g())"),
+        ("let size = fn(a) { len(a) * 2 }; size([1])", "(len([1]) * 2)"),
+        (
+            "let inc = fn(x) { x + 1 }; let twice = fn(x) { inc(inc(x)) }; twice(y)",
+            "((y + 1) + 1)",
+        ),
+        (
+            "let inc = fn(x) { x + 1 }; let apply = fn(f) { f(1) }; apply(inc)",
+            "let inc = fn(x) { x + 1 }; inc(1)",
+        ),
+        (
+            "let inc = fn(x) { x + 1 }; fn(inc) { inc(1) }",
+            "let inc = fn(x) { x + 1 }; fn(inc) { inc(1) }",
+        ),
+        (
+            "let f = fn(x) { x + 1 }; let f = fn(x) { x }; f(1)",
+            "let f = fn(x) { x + 1 }; let f = fn(x) { x }; f(1)",
+        ),
+        (
+            "let f = fn(n) { if (n < 1) { 0 } else { f(n - 1) } }; f(y)",
+            "let f = fn(n) { if (n < 1) { 0 } else { f(n - 1) } }; f(y)",
+        ),
+        (
+            "inc(1); let inc = fn(x) { x + 1 }; 2",
+            "inc(1); let inc = fn(x) { x + 1 }; 2",
+        ),
+        (
+            "let k = 1; let f = fn(x) { x + k }; f(y)",
+            "let k = 1; let f = fn(x) { x + k }; f(y)",
+        ),
+        ("let f = fn(x) { [x, x] }; f(y)", "let f = fn(x) { [x, x] }; f(y)"),
+        ("let f = fn(x, y) { y - x }; f(a, b)", "let f = fn(x, y) { y - x }; f(a, b)"),
+        (
+            "let f = fn(x) { len([]) + x }; f(a)",
+            "let f = fn(x) { len([]) + x }; f(a)",
+        ),
+        ("let f = fn(x) { 1 + x }; f(a)", "(1 + a)"),
+        ("let f = fn(x) { x }; f(a, b)", "let f = fn(x) { x }; f(a, b)"),
+    ],
+)
+def test_small_functions_are_inlined(input: str, expected: str) -> None:
+    assert _optimize(input) == str(parse(expected))
+
+
+def test_inlined_program_evaluates_the_same() -> None:
+    input = """
+    let inc = fn(x) { x + 1 };
+    let double = fn(x) { x * 2 };
+    let map = fn(arr, f) {
+        let iter = fn(arr, acc) {
+            if (len(arr) == 0) { acc } else { iter(rest(arr), push(acc, f(first(arr)))) }
+        };
+        iter(arr, [])
+    };
+    let total = fn(arr) { if (len(arr) == 0) { 0 } else { first(arr) + total(rest(arr)) } };
+    total(map([1, 2, 3], fn(x) { double(inc(x)) })) + inc(double(10))
+    """
+    program = optimize(parse(input))
+
+    assert "inc" not in str(program)
+    evaluated = monkey_eval(program, Environment())
+    assert isinstance(evaluated, Integer)
+    assert evaluated.value == 18 + 21
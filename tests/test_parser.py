@@ -2,7 +2,7 @@ from typing import Any
 
 import pytest
 from monkey import ast
-from monkey.lexer import Lexer
+from monkey.lexer import Lexer, tokenize
 from monkey.parser import Parser
 
 
@@ -412,6 +412,8 @@ def test_parsing_hash_literals_string_keys() -> None:
     for key, value in stmt.expression.pairs.items():
         assert isinstance(value, ast.IntegerLiteral)
         assert value.value == expected[str(key)]
+        assert isinstance(key, ast.StringLiteral)
+        assert key.obj.key is not None
 
 
 def test_parsing_empty_hash_literal() -> None:
@@ -450,3 +452,15 @@ def test_parsing_hash_literals_with_expressions() -> None:
     for key, value in stmt.expression.pairs.items():
         assert isinstance(key, ast.StringLiteral)
         tests[str(key)](value)
+
+
+def test_parse_token_stream() -> None:
+    input = """
+    let add = fn(a, b) { a + b; };
+    let result = if (add(1, 2) > 2) { "big" } else { [1, {"k": true}][0] };
+    return !result == -3 * 4;
+    """
+    from_stream = Parser(tokenize(input))
+    from_lexer = Parser(Lexer(input))
+
+    assert str(from_stream.parse_program()) == str(from_lexer.parse_program())
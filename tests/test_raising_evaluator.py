@@ -0,0 +1,26 @@
+from monkey import ast
+from monkey.environment import Environment
+from monkey.mobj import Error, ReturnValue
+from monkey.raising_evaluator import raising_eval
+
+from tests.helpers import check_integer_object, parse
+
+
+def test_errors_are_returned_at_the_boundary() -> None:
+    evaluated = raising_eval(parse("let f = fn() { 1 + true }; f(); 5"), Environment())
+
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "type mismatch: INTEGER + BOOLEAN"
+
+
+def test_return_from_block_is_wrapped() -> None:
+    program = parse("if (true) { return 3; 4 }")
+    statement = program.statements[0]
+    assert isinstance(statement, ast.ExpressionStatement)
+    assert isinstance(statement.expression, ast.IfExpression)
+
+    evaluated = raising_eval(statement.expression.consequence, Environment())
+
+    assert isinstance(evaluated, ReturnValue)
+    check_integer_object(evaluated.value, 3)
+    check_integer_object(raising_eval(program, Environment()), 3)
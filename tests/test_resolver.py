@@ -0,0 +1,194 @@
+from typing import TypeVar
+
+import pytest
+from monkey import ast
+from monkey.lexer import Lexer
+from monkey.parser import Parser
+from monkey.resolver import collect_let_names, resolve
+from monkey.symbol_table import Symbol, SymbolScope
+
+
+def _resolve(input: str) -> ast.Program:
+    program = Parser(Lexer(input)).parse_program()
+    resolve(program)
+    return program
+
+
+T = TypeVar("T", bound=ast.Node)
+
+
+def _nodes(node: ast.Node, cls: type[T]) -> list[T]:
+    found = []
+
+    def visit(node: object) -> None:
+        if isinstance(node, cls):
+            found.append(node)
+        if isinstance(node, ast.Node):
+            for klass in type(node).__mro__:
+                for name in getattr(klass, "__slots__", ()):
+                    if name != "fallback":
+                        visit(getattr(node, name, None))
+        elif isinstance(node, list):
+            for item in node:
+                visit(item)
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                visit(key)
+                visit(value)
+
+    visit(node)
+    return found
+
+
+def _references(node: ast.Node, name: str) -> list[tuple[SymbolScope, int]]:
+    return [
+        (ident.scope, ident.index)
+        for ident in _nodes(node, ast.Identifier)
+        if ident.value == name
+    ]
+
+
+def _function(program: ast.Program) -> ast.FunctionLiteral:
+    stmt = program.statements[0]
+    assert isinstance(stmt, ast.ExpressionStatement)
+    assert isinstance(stmt.expression, ast.FunctionLiteral)
+    return stmt.expression
+
+
+def test_globals_and_builtins() -> None:
+    program = _resolve("let a = 1; len(a); b;")
+
+    assert _references(program, "a") == [
+        (SymbolScope.GLOBAL, 0),
+        (SymbolScope.GLOBAL, 0),
+    ]
+    assert _references(program, "len") == [(SymbolScope.BUILTIN, 0)]
+    assert _references(program, "b") == [(SymbolScope.GLOBAL, 0)]
+
+
+def test_parameters_and_lets_get_slots() -> None:
+    program = _resolve("fn(a, b) { let c = a + b; let d = c; d }")
+    function = _function(program)
+
+    assert function.num_locals == 4
+    assert function.cells == []
+    assert function.free == []
+    assert _references(program, "a") == [(SymbolScope.LOCAL, 0)] * 2
+    assert _references(program, "b") == [(SymbolScope.LOCAL, 1)] * 2
+    assert _references(program, "c") == [(SymbolScope.LOCAL, 2)] * 2
+    assert _references(program, "d") == [(SymbolScope.LOCAL, 3)] * 2
+
+
+def test_captured_locals_become_cells() -> None:
+    program = _resolve("fn(a, b) { let c = fn() { b }; b + c() }")
+    function = _function(program)
+
+    assert function.cells == [1]
+    assert _references(program, "a") == [(SymbolScope.LOCAL, 0)]
+    assert _references(program, "b") == [
+        (SymbolScope.CELL, 1),
+        (SymbolScope.FREE, 0),
+        (SymbolScope.CELL, 1),
+    ]
+
+
+def test_free_variables_are_threaded_through_enclosing_functions() -> None:
+    program = _resolve("fn(a) { fn(b) { fn(c) { a + b + c } } }")
+    outer = _function(program)
+    middle = outer.body.statements[0]
+    assert isinstance(middle, ast.ExpressionStatement)
+    assert isinstance(middle.expression, ast.FunctionLiteral)
+    inner = middle.expression.body.statements[0]
+    assert isinstance(inner, ast.ExpressionStatement)
+    assert isinstance(inner.expression, ast.FunctionLiteral)
+
+    assert outer.free == []
+    assert middle.expression.free == [Symbol("a", SymbolScope.LOCAL, 0)]
+    assert inner.expression.free == [
+        Symbol("a", SymbolScope.FREE, 0),
+        Symbol("b", SymbolScope.LOCAL, 0),
+    ]
+    assert _references(program, "a")[-1] == (SymbolScope.FREE, 0)
+    assert _references(program, "b")[-1] == (SymbolScope.FREE, 1)
+    assert _references(program, "c")[-1] == (SymbolScope.LOCAL, 0)
+
+
+def test_let_value_sees_enclosing_binding() -> None:
+    program = _resolve("fn(x) { fn() { let x = x + 1; x } }")
+
+    assert _references(program, "x") == [
+        (SymbolScope.CELL, 0),
+        (SymbolScope.LOCAL, 0),
+        (SymbolScope.FREE, 0),
+        (SymbolScope.LOCAL, 0),
+    ]
+
+
+def test_unbound_slots_fall_back_to_enclosing_bindings() -> None:
+    program = _resolve("fn(x) { fn(x) { fn() { let y = x; x } } }")
+    x = [ident for ident in _nodes(program, ast.Identifier) if ident.value == "x"]
+
+    assert (x[-1].scope, x[-1].index) == (SymbolScope.FREE, 0)
+    fallback = x[-1].fallback
+    assert fallback is not None
+    assert (fallback.scope, fallback.index) == (SymbolScope.FREE, 1)
+    assert fallback.fallback is not None
+    assert fallback.fallback.scope == SymbolScope.GLOBAL
+    assert fallback.fallback.fallback is None
+
+
+def test_enclosing_lets_are_visible_before_declaration() -> None:
+    program = _resolve("fn() { let f = fn() { g() }; let g = fn() { 1 }; f() }")
+
+    assert _function(program).cells == [1]
+    assert _references(program, "g")[0] == (SymbolScope.FREE, 0)
+
+
+def test_tail_calls() -> None:
+    program = _resolve(
+        """
+        f(1);
+        fn() {
+            if (g(2)) { return h(3); }
+            let x = i(4);
+            if (true) { j(5) } else { k(6) + l(7) }
+        }
+        """
+    )
+    calls = {
+        str(call.function): call.tail for call in _nodes(program, ast.CallExpression)
+    }
+
+    assert calls == {
+        "f": False,
+        "g": False,
+        "h": True,
+        "i": False,
+        "j": True,
+        "k": False,
+        "l": False,
+    }
+
+
+def test_resolving_twice_is_stable() -> None:
+    program = _resolve("fn(a) { fn() { a } }")
+    resolve(program)
+
+    inner = _function(program).body.statements[0]
+    assert isinstance(inner, ast.ExpressionStatement)
+    assert isinstance(inner.expression, ast.FunctionLiteral)
+    assert inner.expression.free == [Symbol("a", SymbolScope.LOCAL, 0)]
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let a = 1; let b = 2;", {"a", "b"}),
+        ("if (true) { let a = 1 } else { let b = 2 }", {"a", "b"}),
+        ("let f = fn() { let a = 1 };", {"f"}),
+        ("[let_free]", set()),
+    ],
+)
+def test_collect_let_names(input: str, expected: set[str]) -> None:
+    program = Parser(Lexer(input)).parse_program()
+    assert collect_let_names(program.statements) == expected
@@ -0,0 +1,48 @@
+from monkey.environment import Environment
+from monkey.mobj import Error
+from monkey.stack_evaluator import stack_eval
+
+from tests.helpers import check_integer_object, parse
+
+SUM = "let sum = fn(n) { if (n == 0) { 0 } else { n + sum(n - 1) } };"
+
+
+def test_deep_recursion_does_not_use_python_stack() -> None:
+    evaluated = stack_eval(parse(SUM + "sum(50000)"), Environment())
+
+    check_integer_object(evaluated, 50000 * 50001 // 2)
+
+
+def test_recursion_depth_limit() -> None:
+    evaluated = stack_eval(parse(SUM + "sum(100)"), Environment(), max_depth=50)
+
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "maximum recursion depth exceeded: 50"
+
+
+def test_tail_calls_do_not_count_towards_depth() -> None:
+    input = "let loop = fn(n) { if (n == 0) { return 0; } loop(n - 1) }; loop(1000)"
+    evaluated = stack_eval(parse(input), Environment(), max_depth=10)
+
+    check_integer_object(evaluated, 0)
+
+
+def test_returned_tail_calls_do_not_count_towards_depth() -> None:
+    input = """
+    let loop = fn(n) { if (n == 0) { return 7; } return loop(n - 1); };
+    let nested = fn(n) { if (n == 0) { return 7; } [if (true) { return nested(n - 1); }] };
+    loop(1000) + nested(1000)
+    """
+    evaluated = stack_eval(parse(input), Environment(), max_depth=10)
+
+    check_integer_object(evaluated, 14)
+
+
+def test_return_unwinds_to_caller() -> None:
+    input = """
+    let f = fn(x) { [1, if (x) { return 2; }, 3] };
+    let g = fn() { 10 + f(true) };
+    g() + len(f(false))
+    """
+
+    check_integer_object(stack_eval(parse(input), Environment()), 15)
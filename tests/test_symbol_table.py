@@ -0,0 +1,26 @@
+from monkey.symbol_table import Symbol, SymbolScope, SymbolTable
+
+
+def test_define() -> None:
+    global_table = SymbolTable()
+    assert global_table.define("a") == Symbol("a", SymbolScope.GLOBAL, 0)
+    assert global_table.define("b") == Symbol("b", SymbolScope.GLOBAL, 1)
+    assert global_table.names() == ["a", "b"]
+
+
+def test_redefine_reuses_index() -> None:
+    global_table = SymbolTable()
+    global_table.define("a")
+    global_table.define("b")
+
+    assert global_table.define("a") == Symbol("a", SymbolScope.GLOBAL, 0)
+    assert global_table.num_definitions == 2
+
+
+def test_global_shadows_builtin() -> None:
+    global_table = SymbolTable()
+    global_table.define_builtin(0, "len")
+    assert global_table.store["len"] == Symbol("len", SymbolScope.BUILTIN, 0)
+
+    assert global_table.define("len") == Symbol("len", SymbolScope.GLOBAL, 0)
+    assert global_table.names() == ["len"]
@@ -0,0 +1,83 @@
+from monkey.mobj import Array, Boolean, Error, Integer, NativeFunction, integer
+from monkey.transpiler import new_namespace, transpile, transpile_eval
+
+from tests.helpers import check_integer_object, parse
+
+
+def test_transpile_source() -> None:
+    source = transpile(parse("let add = fn(x, y) { x + y }; add(1, 2)"))
+
+    assert "def _f1(m_x, m_y):" in source
+    assert "return _add(m_x, m_y)" in source
+    assert "m_add = _NativeFunction(_f1, 2)" in source
+    assert "return _call(m_add, 1, 2)" in source
+    compile(source, "<test>", "exec")
+
+
+def test_transpile_function_literal() -> None:
+    function = transpile_eval(parse("fn(x) { x * 2 }").statements[0])
+
+    assert isinstance(function, NativeFunction)
+    assert function.arity == 1
+
+
+def test_namespace_persists_between_programs() -> None:
+    namespace = new_namespace()
+    transpile_eval(parse("let a = 2; let double = fn(x) { x * a };"), namespace)
+    transpile_eval(parse("let b = 100;"), namespace)
+
+    check_integer_object(transpile_eval(parse("double(b)"), namespace), 200)
+
+
+def test_if_expression_keeps_evaluation_order() -> None:
+    input = """
+    let calls = fn(a) { a };
+    calls(1) + if (calls(true)) { let x = 10; x } else { 20 } + calls(100);
+    """
+    check_integer_object(transpile_eval(parse(input)), 111)
+
+
+def test_missing_argument_is_unbound() -> None:
+    check_integer_object(transpile_eval(parse("fn(a, b) { a }(1)")), 1)
+
+    evaluated = transpile_eval(parse("fn(a, b) { b }(1)"))
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "identifier not found: b"
+
+
+def test_values_are_unboxed_inside_programs() -> None:
+    namespace = new_namespace()
+    input = 'let a = 2; let b = a < 3; let c = "x"; let d = if (false) { 1 };'
+    transpile_eval(parse(input), namespace)
+
+    assert [namespace[name] for name in ["m_a", "m_b", "m_c", "m_d"]] == [
+        2,
+        True,
+        "x",
+        None,
+    ]
+    assert type(namespace["m_b"]) is bool
+    evaluated = transpile_eval(parse("[a, len(c), b]"), namespace)
+    assert isinstance(evaluated, Array)
+    assert [type(element) for element in evaluated.elements] == [
+        Integer,
+        Integer,
+        Boolean,
+    ]
+    assert [element.value for element in evaluated.elements] == [2, 1, True]
+
+
+def test_boxed_small_integers_are_cached() -> None:
+    evaluated = transpile_eval(parse("let f = fn(x) { x + 1 }; [f(1), 2, f(999)]"))
+
+    assert isinstance(evaluated, Array)
+    first, second, third = evaluated.elements
+    assert first is second is integer(2)
+    check_integer_object(third, 1000)
+
+
+def test_builtin_errors_propagate() -> None:
+    evaluated = transpile_eval(parse("let f = fn() { len(1) }; [f(), 2]"))
+
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "argument to `len` not supported, got INTEGER"
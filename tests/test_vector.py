@@ -0,0 +1,49 @@
+import pytest
+from monkey.vector import WIDTH, Vector
+
+
+@pytest.mark.parametrize(
+    "size", [0, 1, WIDTH, WIDTH + 1, WIDTH * WIDTH + WIDTH + 1, 40_000]
+)
+def test_append_matches_from_list(size: int) -> None:
+    vector = Vector()
+    for i in range(size):
+        vector = vector.append(i)
+    built = Vector.from_list(list(range(size)))
+
+    assert len(vector) == len(built) == size
+    assert list(vector) == list(built) == list(range(size))
+    assert [vector[i] for i in range(size)] == list(range(size))
+    assert vector.append(-1)[size] == built.append(-1)[size] == -1
+
+
+def test_append_is_persistent() -> None:
+    versions = [Vector()]
+    for i in range(WIDTH * WIDTH + 2 * WIDTH):
+        versions.append(versions[-1].append(i))
+
+    for size, version in enumerate(versions):
+        assert list(version) == list(range(size))
+
+
+def test_rest_is_an_offset_view() -> None:
+    vector = Vector.from_list(list(range(100)))
+    rest = vector
+    for _ in range(40):
+        rest = rest.rest()
+
+    assert rest.root is vector.root
+    assert len(rest) == 60
+    assert list(rest) == list(range(40, 100))
+    assert rest[0] == 40
+    assert rest[-1] == 99
+    assert list(rest.append(100)) == list(range(40, 101))
+    assert list(vector) == list(range(100))
+
+
+def test_index_out_of_range() -> None:
+    vector = Vector.from_list([1, 2, 3]).rest()
+    with pytest.raises(IndexError):
+        vector[2]
+    with pytest.raises(IndexError):
+        vector[-3]
@@ -0,0 +1,78 @@
+from typing import Optional
+
+from monkey.compiler import Compiler, new_symbol_table
+from monkey.lexer import Lexer
+from monkey.mobj import Error, MonkeyObject
+from monkey.parser import Parser
+from monkey.vm import VM
+
+from tests.helpers import check_integer_object
+
+
+def _run(input: str) -> MonkeyObject:
+    program = Parser(Lexer(input)).parse_program()
+    compiler = Compiler()
+    compiler.compile(program)
+    return VM(compiler.bytecode()).run()
+
+
+def test_recursive_fibonacci() -> None:
+    input = """
+    let fibonacci = fn(x) {
+        if (x < 2) { return x; }
+        fibonacci(x - 1) + fibonacci(x - 2);
+    };
+    fibonacci(15);
+    """
+    check_integer_object(_run(input), 610)
+
+
+def test_recursion_is_not_limited_by_python_stack() -> None:
+    input = """
+    let countDown = fn(x) { if (x == 0) { 0 } else { 1 + countDown(x - 1) } };
+    countDown(5000);
+    """
+    check_integer_object(_run(input), 5000)
+
+
+def test_recursive_local_closure() -> None:
+    input = """
+    let wrapper = fn() {
+        let countDown = fn(x) { if (x == 0) { return 0; } countDown(x - 1); };
+        countDown(1);
+    };
+    wrapper();
+    """
+    check_integer_object(_run(input), 0)
+
+
+def test_forward_reference_to_global() -> None:
+    input = """
+    let isEven = fn(n) { if (n == 0) { true } else { isOdd(n - 1) } };
+    let isOdd = fn(n) { if (n == 0) { false } else { isEven(n - 1) } };
+    if (isEven(10)) { 1 } else { 0 }
+    """
+    check_integer_object(_run(input), 1)
+
+
+def test_missing_argument_is_unbound() -> None:
+    evaluated = _run("fn(a, b) { b }(1)")
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "identifier not found: b"
+
+
+def test_not_a_function() -> None:
+    evaluated = _run("let a = 1; a(2)")
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "not a function: INTEGER"
+
+
+def test_globals_persist_between_runs() -> None:
+    symbol_table = new_symbol_table()
+    constants: list[MonkeyObject] = []
+    globals: list[Optional[MonkeyObject]] = []
+
+    for line, expected in [("let a = 5;", 5), ("let b = a * 2;", 10), ("a + b", 15)]:
+        compiler = Compiler(symbol_table, constants)
+        compiler.compile(Parser(Lexer(line)).parse_program())
+        check_integer_object(VM(compiler.bytecode(), globals).run(), expected)